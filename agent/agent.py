@@ -1,22 +1,155 @@
 from __future__ import annotations
-from typing import AsyncGenerator
+import asyncio
+import logging
+import uuid
+from pathlib import Path
+from typing import Any, AsyncGenerator
 from agent.events import AgentEvent, AgentEventType
 from client.llm_client import LLMClient
-from client.response import StreamEventType
+from client.rate_limiter import Priority
+from client.response import StreamEventType, TokenUsage, ToolCall, ToolCallDelta
+from client.usage import UsageTotals, get_usage_ledger
+from common.constants.agent_constants import AgentConstants
+from common.constants.environment_constants import EnvironmentConstants
 from common.constants.error_constants import ErrorConstants
+from common.helpers.environment_helper import EnvironmentHelper as Env
 from context.manager import ContextManager
-from tools.registry import create_default_registry
+from tools.base import ToolKind, ToolResult
+from tools.executor import ToolExecutor
+from tools.registry import ToolRegistry, ToolSchemaPayload, create_default_registry
+
+logger = logging.getLogger(__name__)
+
+
+class _ToolDispatcher:
+    # Starts read-only calls while the model is still streaming the rest of its
+    # reply. Calls after the first mutating one wait for the stream to end so the
+    # executor can keep its read/write ordering.
+    def __init__(
+        self,
+        registry: ToolRegistry,
+        executor: ToolExecutor,
+        required_params: dict[str, frozenset[str]],
+        cwd: Path | None = None,
+    ) -> None:
+        self._registry = registry
+        self._executor = executor
+        self._required_params = required_params
+        self._cwd = cwd
+        self.calls: list[ToolCall] = []
+        self._started: dict[int, asyncio.Task[ToolResult]] = {}
+        self._speculative: dict[str, tuple[dict[str, Any], asyncio.Task[ToolResult]]] = {}
+        self._barrier = False
+
+    def on_arguments(self, delta: ToolCallDelta) -> None:
+        if self._barrier or not delta.call_id or not delta.arguments:
+            return
+        if delta.call_id in self._speculative:
+            return
+
+        tool = self._registry.get(delta.name or "")
+        if tool is None or tool.kind != ToolKind.READ:
+            return
+
+        required = self._required_params.get(tool.name)
+        if not required or not required.issubset(delta.arguments):
+            return
+
+        arguments = dict(delta.arguments)
+        task = self._start(ToolCall(call_id=delta.call_id, name=delta.name, arguments=arguments))
+        self._speculative[delta.call_id] = (arguments, task)
+
+    def on_complete(self, call: ToolCall) -> None:
+        index = len(self.calls)
+        self.calls.append(call)
+
+        speculative = self._speculative.pop(call.call_id, None)
+        if speculative is not None:
+            arguments, task = speculative
+            if arguments == (call.arguments or {}):
+                self._started[index] = task
+                return
+            task.cancel()
+            logger.debug(f"Discarded speculative '{call.name}' call; arguments changed")
+
+        if self._barrier:
+            return
+
+        tool = self._registry.get(call.name or "")
+        if tool is not None and tool.is_mutating(call.arguments or {}):
+            self._barrier = True
+            return
+
+        self._started[index] = self._start(call)
+
+    async def results(self) -> list[ToolResult]:
+        for _, task in self._speculative.values():
+            task.cancel()
+        self._speculative.clear()
+
+        results: list[ToolResult | None] = [None] * len(self.calls)
+        # Everything already started precedes the first mutating call, so it must
+        # finish before the remaining calls go through the executor's barrier.
+        started = list(self._started.items())
+        outcomes = await asyncio.gather(*(task for _, task in started))
+        for (index, _), result in zip(started, outcomes):
+            results[index] = result
+
+        remaining = [index for index in range(len(self.calls)) if results[index] is None]
+        if remaining:
+            batch = await self._executor.execute_batch(
+                [self.calls[index] for index in remaining], self._cwd
+            )
+            for index, result in zip(remaining, batch):
+                results[index] = result
+
+        # The whole turn shares one output budget, however its calls were started.
+        return await self._registry.compact_results(
+            [result for result in results if result is not None]
+        )
+
+    def cancel(self) -> None:
+        for task in self._started.values():
+            task.cancel()
+        for _, task in self._speculative.values():
+            task.cancel()
+        self._started.clear()
+        self._speculative.clear()
+
+    def _start(self, call: ToolCall) -> asyncio.Task[ToolResult]:
+        return asyncio.create_task(self._executor.execute(call, self._cwd))
 
 
 class Agent:
-    def __init__(self):
-        self.client = LLMClient()
+    def __init__(
+        self,
+        cwd: Path | None = None,
+        client: LLMClient | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ):
+        self.cwd = cwd
+        # Rate-limiter class for this agent's requests; batch work queues behind interactive.
+        self._priority = priority
+        # A client passed in is shared (e.g. by a batch pool) and outlives this agent.
+        self._owns_client = client is None
+        self.client = client or LLMClient()
         self.context_manager = ContextManager()
         self.tool_registry = create_default_registry()
+        self.tool_executor = ToolExecutor(self.tool_registry)
+        self._compaction_task: asyncio.Task | None = None
+        self._warm_up_task: asyncio.Task | None = None
+        self._max_turns = Env.get_env_variable(
+            EnvironmentConstants.AGENT_MAX_TURNS, AgentConstants.MAX_TURNS
+        )
+        self._required_params: tuple[int, dict[str, frozenset[str]]] | None = None
+        self._usage: TokenUsage | None = None
+        self.session_id = uuid.uuid4().hex[:12]
+        self.session_usage = UsageTotals()
 
     async def run(self, message: str):
         yield AgentEvent.agent_start(message)
         self.context_manager.add_user_message(message)
+        self._usage = None
 
         final_response: str | None = None
 
@@ -24,39 +157,167 @@ class Agent:
             yield event
 
             if event.type == AgentEventType.TEXT_COMPLETE:
-                final_response = event.data.get("content")
+                final_response = event.content
 
-        yield AgentEvent.agent_end(final_response)
+        self._schedule_compaction()
+        yield AgentEvent.agent_end(final_response, self._usage)
+
+    def reset(self) -> None:
+        # Drops the conversation but keeps the client, tools and read cache warm.
+        self._cancel_compaction()
+        self.context_manager = ContextManager()
+        # Output handles belong to the conversation that saw them.
+        self.tool_registry.output_store.clear()
+        self.session_id = uuid.uuid4().hex[:12]
+        self.session_usage = UsageTotals()
+
+    def _schedule_compaction(self) -> None:
+        # Summarize in the background so the next request never waits on it.
+        if not self.client or not self.context_manager.needs_compaction():
+            return
+        if self._compaction_task and not self._compaction_task.done():
+            return
+
+        self._compaction_task = asyncio.create_task(self._compact())
+        self._compaction_task.add_done_callback(self._on_compaction_done)
+
+    async def _compact(self) -> None:
+        _, usage = await self.context_manager.compact(self.client)
+        if usage is not None:
+            # The summary request is billed like any other; count it in the session.
+            await get_usage_ledger().record(
+                usage,
+                self.session_usage,
+                self.session_id,
+                Env.get_env_variable(EnvironmentConstants.DEFAULT_MODEL_NAME),
+            )
+
+    @staticmethod
+    def _on_compaction_done(task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logger.warning(f"Background context compaction failed: {task.exception()}")
 
     async def _agentic_loop(self) -> AsyncGenerator[AgentEvent, None]:
-        response_text = ""
+        for _ in range(self._max_turns):
+            tool_payload = self.tool_registry.get_payload()
+            self.context_manager.set_tool_schema_tokens(tool_payload.token_count)
+            dispatcher = _ToolDispatcher(
+                self.tool_registry,
+                self.tool_executor,
+                self._required_params_for(tool_payload),
+                self.cwd,
+            )
 
-        tool_schemas = self.tool_registry.get_schemas()
+            try:
+                # Collected and joined once; += on a growing str copies it on every delta.
+                response_parts: list[str] = []
+                failed = False
 
-        if self.client:
-            async for event in self.client.chat_completion(
-                self.context_manager.get_messages(), tools=tool_schemas if tool_schemas else None ,stream=True
-            ):
-                if (
-                    event.type == StreamEventType.TEXT_DELTA
-                    and event.text_delta is not None
-                ):
-                    content = event.text_delta.content
-                    response_text += content
-                    yield AgentEvent.text_delta(content)
-                elif event.type == StreamEventType.ERROR:
-                    yield AgentEvent.agent_error(
-                        event.error or ErrorConstants.UNKNOWN_ERROR_MESSAGE
-                    )
-
-        self.context_manager.add_assistant_message(response_text or "")
-        if response_text:
-            AgentEvent.text_complete(response_text)
+                if self.client:
+                    text_delta_type = StreamEventType.TEXT_DELTA
+                    async for event in self.client.chat_completion(
+                        self.context_manager.get_messages(),
+                        tools=tool_payload.tools or None,
+                        stream=True,
+                        estimated_tokens=self.context_manager.prompt_tokens,
+                        priority=self._priority,
+                    ):
+                        if event.type is text_delta_type and event.text_delta is not None:
+                            content = event.text_delta.content
+                            response_parts.append(content)
+                            yield AgentEvent(AgentEventType.TEXT_DELTA, content=content)
+                        elif (
+                            event.type == StreamEventType.TOOL_CALL_DELTA
+                            and event.tool_call_delta is not None
+                        ):
+                            dispatcher.on_arguments(event.tool_call_delta)
+                        elif (
+                            event.type == StreamEventType.TOOL_CALL_COMPLETE
+                            and event.tool_call is not None
+                        ):
+                            dispatcher.on_complete(event.tool_call)
+                            yield AgentEvent.tool_call_start(event.tool_call)
+                        elif (
+                            event.type == StreamEventType.MESSAGE_COMPLETE
+                            and event.usage is not None
+                        ):
+                            self._usage = (
+                                event.usage if self._usage is None else self._usage + event.usage
+                            )
+                            session, process = await get_usage_ledger().record(
+                                event.usage,
+                                self.session_usage,
+                                self.session_id,
+                                Env.get_env_variable(EnvironmentConstants.DEFAULT_MODEL_NAME),
+                            )
+                            yield AgentEvent.usage_update(event.usage, session, process)
+                        elif event.type == StreamEventType.ERROR:
+                            failed = True
+                            yield AgentEvent.agent_error(
+                                event.error or ErrorConstants.UNKNOWN_ERROR_MESSAGE
+                            )
+
+                # A failed stream's tool calls never get results, so they are not
+                # recorded; an assistant tool_calls message without them is invalid.
+                tool_calls = [] if failed else dispatcher.calls
+                response_text = "".join(response_parts)
+                self.context_manager.add_assistant_message(response_text, tool_calls)
+                if response_text:
+                    yield AgentEvent.text_complete(response_text)
+
+                if not tool_calls:
+                    return
+
+                results = await dispatcher.results()
+                self.context_manager.add_tool_results(
+                    [(call.call_id, result.to_model_output()) for call, result in zip(tool_calls, results)]
+                )
+                for call, result in zip(tool_calls, results):
+                    yield AgentEvent.tool_call_complete(call, result)
+            finally:
+                dispatcher.cancel()
+
+        yield AgentEvent.agent_error(
+            ErrorConstants.MAX_TURNS_REACHED_MESSAGE.format(max_turns=self._max_turns)
+        )
+
+    def _required_params_for(self, payload: ToolSchemaPayload) -> dict[str, frozenset[str]]:
+        if self._required_params is None or self._required_params[0] != payload.version:
+            self._required_params = (
+                payload.version,
+                {
+                    schema["name"]: frozenset(schema.get("parameters", {}).get("required", []))
+                    for schema in payload.schemas
+                },
+            )
+        return self._required_params[1]
 
     async def __aenter__(self) -> Agent:
+        if self.client:
+            # Open the pooled connection while the first request is still being built.
+            self._warm_up_task = asyncio.create_task(self.client.warm_up())
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        if self.client:
+        if self._warm_up_task and not self._warm_up_task.done():
+            self._warm_up_task.cancel()
+        self._warm_up_task = None
+
+        if self._compaction_task and not self._compaction_task.done():
+            self._compaction_task.cancel()
+            try:
+                await self._compaction_task
+            except asyncio.CancelledError:
+                pass
+        self._compaction_task = None
+
+        if self.client and self._owns_client:
             await self.client.close()
-            self.client = None
+        self.client = None
+
+    def _cancel_compaction(self) -> None:
+        if self._compaction_task and not self._compaction_task.done():
+            self._compaction_task.cancel()
+        self._compaction_task = None
@@ -0,0 +1,181 @@
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, TextIO
+from agent.agent import Agent
+from agent.events import AgentEventType
+from client.llm_client import LLMClient
+from client.rate_limiter import Priority
+from client.response import TokenUsage
+from common.constants.batch_constants import BatchConstants
+from common.constants.environment_constants import EnvironmentConstants
+from common.constants.error_constants import ErrorConstants
+from common.helpers.environment_helper import EnvironmentHelper as Env
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class BatchItem:
+    index: int
+    prompt: str | None
+    id: Any = None
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class BatchResult:
+    index: int
+    id: Any
+    response: str | None = None
+    error: str | None = None
+    latency_ms: float = 0.0
+    usage: TokenUsage | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "id": self.id,
+            "response": self.response,
+            "error": self.error,
+            "latency_ms": round(self.latency_ms, 2),
+            "usage": asdict(self.usage) if self.usage else None,
+        }
+
+
+@dataclass
+class BatchSummary:
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed_seconds: float = 0.0
+    usage: TokenUsage = field(default_factory=TokenUsage)
+
+
+def parse_batch_line(index: int, line: str) -> BatchItem:
+    # A line is either a JSON string or an object holding the prompt plus an optional id.
+    try:
+        value = json.loads(line)
+    except json.JSONDecodeError as e:
+        return BatchItem(index=index, prompt=None, id=index, error=f"Invalid JSON: {e}")
+
+    if isinstance(value, str):
+        return BatchItem(index=index, prompt=value, id=index)
+
+    if isinstance(value, dict):
+        item_id = value.get("id", index)
+        for key in BatchConstants.PROMPT_KEYS:
+            prompt = value.get(key)
+            if isinstance(prompt, str) and prompt:
+                return BatchItem(index=index, prompt=prompt, id=item_id)
+        return BatchItem(
+            index=index,
+            prompt=None,
+            id=item_id,
+            error=f"Missing prompt; expected one of {', '.join(BatchConstants.PROMPT_KEYS)}",
+        )
+
+    return BatchItem(
+        index=index, prompt=None, id=index, error="Batch item must be a string or an object"
+    )
+
+
+class BatchRunner:
+    def __init__(self, concurrency: int | None = None) -> None:
+        self.concurrency = max(
+            1,
+            concurrency
+            or Env.get_env_variable(
+                EnvironmentConstants.BATCH_CONCURRENCY, BatchConstants.CONCURRENCY
+            ),
+        )
+
+    async def run(
+        self,
+        source: TextIO,
+        sink: TextIO,
+        resume_from: int = 0,
+        on_result: Callable[[BatchResult], None] | None = None,
+    ) -> BatchSummary:
+        summary = BatchSummary()
+        queue: asyncio.Queue[BatchItem | None] = asyncio.Queue(
+            maxsize=self.concurrency * BatchConstants.QUEUE_DEPTH_PER_WORKER
+        )
+        # One client for the pool: every agent streams over the same pooled transport.
+        client = LLMClient()
+        started = time.perf_counter()
+
+        def emit(result: BatchResult) -> None:
+            # Written as each item finishes, so output order is completion order;
+            # `index` ties a line back to its input offset for --resume-from.
+            sink.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+            sink.flush()
+            if result.error:
+                summary.failed += 1
+            else:
+                summary.completed += 1
+            if result.usage is not None:
+                summary.usage += result.usage
+            if on_result is not None:
+                on_result(result)
+
+        async def produce() -> None:
+            index = 0
+            try:
+                while True:
+                    # Reads block (stdin in particular), so they stay off the loop.
+                    line = await asyncio.to_thread(source.readline)
+                    if not line:
+                        break
+                    if not line.strip():
+                        continue
+                    if index < resume_from:
+                        summary.skipped += 1
+                    else:
+                        await queue.put(parse_batch_line(index, line))
+                    index += 1
+            finally:
+                for _ in range(self.concurrency):
+                    await queue.put(None)
+
+        async def work() -> None:
+            async with Agent(client=client, priority=Priority.BATCH) as agent:
+                while (item := await queue.get()) is not None:
+                    if item.error is not None:
+                        emit(BatchResult(index=item.index, id=item.id, error=item.error))
+                        continue
+                    agent.reset()
+                    emit(await self._run_item(agent, item))
+
+        try:
+            await asyncio.gather(produce(), *(work() for _ in range(self.concurrency)))
+        finally:
+            await client.close()
+
+        summary.elapsed_seconds = time.perf_counter() - started
+        return summary
+
+    @staticmethod
+    async def _run_item(agent: Agent, item: BatchItem) -> BatchResult:
+        result = BatchResult(index=item.index, id=item.id)
+        errors: list[str] = []
+        started = time.perf_counter()
+
+        try:
+            async for event in agent.run(item.prompt or ""):
+                if event.type == AgentEventType.AGENT_ERROR:
+                    errors.append(event.error or ErrorConstants.UNKNOWN_ERROR_MESSAGE)
+                elif event.type == AgentEventType.AGENT_END:
+                    result.response = event.content
+                    result.usage = event.usage
+        except Exception as e:
+            logger.exception(f"Batch item {item.index} failed")
+            errors.append(str(e) or type(e).__name__)
+
+        result.latency_ms = (time.perf_counter() - started) * 1000
+        if errors:
+            result.error = "; ".join(errors)
+        return result
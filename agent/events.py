@@ -1,9 +1,13 @@
 from __future__ import annotations
 from enum import Enum
-from dataclasses import dataclass, field
-from typing import Any
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any
 
-from client.response import TokenUsage
+from client.response import TokenUsage, ToolCall
+
+if TYPE_CHECKING:
+    from client.usage import UsageTotals
+    from tools.base import ToolResult
 
 
 class AgentEventType(str, Enum):
@@ -16,47 +20,97 @@ class AgentEventType(str, Enum):
     TEXT_DELTA = "text_delta"
     TEXT_COMPLETE = "text_complete"
 
+    # Tool Calls
+    TOOL_CALL_START = "tool_call_start"
+    TOOL_CALL_COMPLETE = "tool_call_complete"
+
+    # Accounting
+    USAGE = "usage"
+
 
-@dataclass
+# Text deltas are the agent's inner loop, so events carry typed slot fields instead
+# of a per-event dict; `data` rebuilds the dict view for callers that want one.
+@dataclass(slots=True)
 class AgentEvent:
     type: AgentEventType
-    data: dict[str, Any] = field(default_factory=dict)
+    content: str | None = None
+    error: str | None = None
+    details: dict[str, Any] | None = None
+    usage: TokenUsage | None = None
+    tool_call: ToolCall | None = None
+    tool_result: ToolResult | None = None
+    session_usage: UsageTotals | None = None
+    process_usage: UsageTotals | None = None
+
+    @property
+    def data(self) -> dict[str, Any]:
+        if self.type == AgentEventType.AGENT_START:
+            return {"message": self.content}
+        if self.type == AgentEventType.AGENT_END:
+            return {
+                "response": self.content,
+                "usage": asdict(self.usage) if self.usage else None,
+            }
+        if self.type == AgentEventType.USAGE:
+            return {
+                "usage": asdict(self.usage) if self.usage else None,
+                "session": self.session_usage.to_dict() if self.session_usage else None,
+                "process": self.process_usage.to_dict() if self.process_usage else None,
+            }
+        if self.type == AgentEventType.AGENT_ERROR:
+            return {"error": self.error, "details": self.details or {}}
+        if self.tool_call is not None:
+            data: dict[str, Any] = {
+                "call_id": self.tool_call.call_id,
+                "name": self.tool_call.name,
+                "arguments": self.tool_call.arguments or {},
+            }
+            if self.tool_result is not None:
+                data.update(
+                    success=self.tool_result.success,
+                    output=self.tool_result.output,
+                    error=self.tool_result.error,
+                    metadata=self.tool_result.metadata,
+                )
+            return data
+        return {"content": self.content}
 
     @classmethod
     def agent_start(cls, message: str) -> AgentEvent:
-        return cls(
-            type=AgentEventType.AGENT_START,
-            data={"message": message},
-        )
+        return cls(AgentEventType.AGENT_START, content=message)
 
     @classmethod
     def agent_end(
         cls, response: str | None = None, usage: TokenUsage | None = None
     ) -> AgentEvent:
-        return cls(
-            type=AgentEventType.AGENT_END,
-            data={"response": response, "usage": usage.__dict__ if usage else None},
-        )
+        return cls(AgentEventType.AGENT_END, content=response, usage=usage)
 
     @classmethod
     def agent_error(
         cls, error: str, details: dict[str, Any] | None = None
     ) -> AgentEvent:
-        return cls(
-            type=AgentEventType.AGENT_ERROR,
-            data={"error": error, "details": details or {}},
-        )
+        return cls(AgentEventType.AGENT_ERROR, error=error, details=details or {})
 
     @classmethod
     def text_delta(cls, content: str) -> AgentEvent:
-        return cls(
-            type=AgentEventType.TEXT_DELTA,
-            data={"content": content},
-        )
+        return cls(AgentEventType.TEXT_DELTA, content=content)
 
     @classmethod
     def text_complete(cls, content: str) -> AgentEvent:
+        return cls(AgentEventType.TEXT_COMPLETE, content=content)
+
+    @classmethod
+    def tool_call_start(cls, tool_call: ToolCall) -> AgentEvent:
+        return cls(AgentEventType.TOOL_CALL_START, tool_call=tool_call)
+
+    @classmethod
+    def tool_call_complete(cls, tool_call: ToolCall, result: ToolResult) -> AgentEvent:
+        return cls(AgentEventType.TOOL_CALL_COMPLETE, tool_call=tool_call, tool_result=result)
+
+    @classmethod
+    def usage_update(
+        cls, usage: TokenUsage, session: UsageTotals, process: UsageTotals
+    ) -> AgentEvent:
         return cls(
-            type=AgentEventType.TEXT_COMPLETE,
-            data={"content": content},
+            AgentEventType.USAGE, usage=usage, session_usage=session, process_usage=process
         )
@@ -0,0 +1,155 @@
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import time
+import tracemalloc
+from benchmarks.stub_server import StubConfig, StubServer
+
+
+def _summary(name: str, samples: list[float]) -> str:
+    if not samples:
+        return f"{name:<18} n/a"
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"{name:<18} mean {statistics.mean(samples) * 1e3:8.2f} ms"
+        f"   p50 {statistics.median(samples) * 1e3:8.2f} ms   p95 {p95 * 1e3:8.2f} ms"
+    )
+
+
+async def _measure_memory(turns: int) -> float:
+    from agent.agent import Agent
+
+    samples: list[int] = []
+    tracemalloc.start()
+    try:
+        async with Agent() as agent:
+            for turn in range(turns):
+                async for _ in agent.run(f"Explain step {turn} of the pipeline."):
+                    pass
+                samples.append(tracemalloc.get_traced_memory()[0])
+    finally:
+        tracemalloc.stop()
+
+    return (samples[-1] - samples[0]) / max(1, len(samples) - 1) if samples else 0.0
+
+
+async def _bench_agent(turns: int) -> None:
+    from agent.agent import Agent
+    from agent.events import AgentEventType
+
+    setup: list[float] = []
+    first_event: list[float] = []
+    ttft: list[float] = []
+    stream: list[float] = []
+    total: list[float] = []
+    events = 0
+    deltas = 0
+
+    start = time.perf_counter()
+    agent = Agent()
+    setup.append(time.perf_counter() - start)
+
+    async with agent:
+        for turn in range(turns):
+            turn_start = time.perf_counter()
+            first_delta: float | None = None
+            seen_first = False
+
+            async for event in agent.run(f"Explain step {turn} of the pipeline."):
+                now = time.perf_counter()
+                events += 1
+                if not seen_first:
+                    first_event.append(now - turn_start)
+                    seen_first = True
+                if event.type == AgentEventType.TEXT_DELTA:
+                    deltas += 1
+                    if first_delta is None:
+                        first_delta = now
+                        ttft.append(now - turn_start)
+
+            turn_end = time.perf_counter()
+            total.append(turn_end - turn_start)
+            if first_delta is not None:
+                stream.append(turn_end - first_delta)
+
+    elapsed = sum(total)
+    # Traced separately: tracemalloc would distort the timings above.
+    growth = await _measure_memory(turns)
+
+    print(f"Agent.run x{turns}")
+    print(_summary("agent setup", setup))
+    print(_summary("first event", first_event))
+    print(_summary("time to 1st token", ttft))
+    print(_summary("stream", stream))
+    print(_summary("turn total", total))
+    print(f"{'events/sec':<18} {events / elapsed:10.0f}   ({deltas} text deltas)")
+    print(f"{'memory/turn':<18} {growth / 1024:10.1f} KiB")
+
+
+async def _bench_cli(turns: int) -> None:
+    from rich.console import Console
+    from agent.agent import Agent
+    from main import CLI
+    from ui.tui import AGENT_THEME, TUI
+
+    cli = CLI()
+    cli.tui = TUI(Console(file=io.StringIO(), theme=AGENT_THEME, force_terminal=True))
+
+    samples: list[float] = []
+    async with Agent() as agent:
+        cli.agent = agent
+        for turn in range(turns):
+            start = time.perf_counter()
+            await cli._process_message(f"Summarize change {turn}.")
+            samples.append(time.perf_counter() - start)
+
+    print(f"CLI._process_message x{turns}")
+    print(_summary("turn total", samples))
+
+
+async def _run(args: argparse.Namespace) -> None:
+    server = StubServer(
+        StubConfig(
+            tokens_per_second=args.tokens_per_second,
+            time_to_first_token=args.ttft,
+            response_tokens=args.response_tokens,
+            rate_limit_probability=args.rate_limit_probability,
+            disconnect_probability=args.disconnect_probability,
+        )
+    )
+    base_url = await server.start()
+    os.environ["OPEN_ROUTER_BASE_URL"] = base_url
+    os.environ.setdefault("OPEN_ROUTER_API_KEY", "stub")
+    os.environ.setdefault("DEFAULT_MODEL_NAME", "stub-model")
+
+    from client.transport import close_shared_http_client
+
+    try:
+        print(f"stub: {base_url}  ttft={args.ttft}s  rate={args.tokens_per_second} tok/s")
+        await _bench_agent(args.turns)
+        print()
+        await _bench_cli(args.turns)
+        print(f"\nrequests served: {server.requests}")
+    finally:
+        await close_shared_http_client()
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="End-to-end agent latency against a local stub")
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--tokens-per-second", type=float, default=0.0)
+    parser.add_argument("--ttft", type=float, default=0.0)
+    parser.add_argument("--response-tokens", type=int, default=400)
+    parser.add_argument("--rate-limit-probability", type=float, default=0.0)
+    parser.add_argument("--disconnect-probability", type=float, default=0.0)
+    args = parser.parse_args()
+
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any
+from agent.events import AgentEvent, AgentEventType
+from client.response import StreamEvent, StreamEventType, TextDelta
+
+
+# The pre-slots representation, kept here only as the benchmark baseline.
+@dataclass
+class _LegacyTextDelta:
+    content: str
+
+
+@dataclass
+class _LegacyStreamEvent:
+    type: StreamEventType
+    text_delta: _LegacyTextDelta | None = None
+    error: str | None = None
+    finish_reason: str | None = None
+    tool_call_delta: Any = None
+    tool_call: Any = None
+    usage: Any = None
+
+
+@dataclass
+class _LegacyAgentEvent:
+    type: AgentEventType
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+def _legacy_path(chunks: list[str], keep: list | None) -> str:
+    response_text = ""
+    for chunk in chunks:
+        event = _LegacyStreamEvent(
+            type=StreamEventType.TEXT_DELTA, text_delta=_LegacyTextDelta(content=chunk)
+        )
+        content = event.text_delta.content
+        response_text += content
+        agent_event = _LegacyAgentEvent(type=AgentEventType.TEXT_DELTA, data={"content": content})
+        if keep is not None:
+            keep.append((event, agent_event))
+    return response_text
+
+
+def _current_path(chunks: list[str], keep: list | None) -> str:
+    parts: list[str] = []
+    text_delta_type = StreamEventType.TEXT_DELTA
+    for chunk in chunks:
+        event = StreamEvent(type=text_delta_type, text_delta=TextDelta(content=chunk))
+        content = event.text_delta.content
+        parts.append(content)
+        agent_event = AgentEvent(AgentEventType.TEXT_DELTA, content=content)
+        if keep is not None:
+            keep.append((event, agent_event))
+    return "".join(parts)
+
+
+async def _agent_loop(chunks: list[str]) -> float:
+    from agent.agent import Agent
+
+    class _ReplayClient:
+        async def chat_completion(self, *args, **kwargs):
+            for chunk in chunks:
+                yield StreamEvent(type=StreamEventType.TEXT_DELTA, text_delta=TextDelta(content=chunk))
+
+        async def close(self) -> None:
+            pass
+
+    agent = Agent()
+    agent.client = _ReplayClient()
+    start = time.process_time()
+    async for _ in agent._agentic_loop():
+        pass
+    return time.process_time() - start
+
+
+def _measure(path, chunks: list[str]) -> tuple[float, float]:
+    start = time.process_time()
+    path(chunks, None)
+    cpu = time.process_time() - start
+
+    keep: list = []
+    tracemalloc.start()
+    path(chunks, keep)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu, retained / len(chunks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Allocations and CPU per streamed delta")
+    parser.add_argument("--deltas", type=int, default=10000)
+    parser.add_argument("--chunk", default="token ")
+    args = parser.parse_args()
+
+    chunks = [args.chunk] * args.deltas
+
+    legacy_cpu, legacy_bytes = _measure(_legacy_path, chunks)
+    current_cpu, current_bytes = _measure(_current_path, chunks)
+    loop_cpu = asyncio.run(_agent_loop(chunks))
+
+    print(f"{args.deltas} deltas")
+    print(f"{'':<22}{'cpu ms':>10}{'bytes/delta':>14}")
+    print(f"{'before (dict events)':<22}{legacy_cpu * 1e3:10.2f}{legacy_bytes:14.1f}")
+    print(f"{'after (slots events)':<22}{current_cpu * 1e3:10.2f}{current_bytes:14.1f}")
+    print(f"{'Agent._agentic_loop':<22}{loop_cpu * 1e3:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from tools.base import ToolInvocation
+from tools.builtin.grep import GrepTool
+from utils.trigram_index import enable_process_pool, get_trigram_index
+
+WORDS = (
+    "handler request response config session buffer parser token stream cache "
+    "index window client server retry budget schema payload channel worker"
+).split()
+QUERIES = [r"def handle_request_\d+", r"class Parser\w*Cache", r"needle_[a-f0-9]{6}", r"TODO\(\w+\)"]
+
+
+def _make_tree(root: Path, files: int, lines: int, rng: random.Random) -> None:
+    for n in range(files):
+        directory = root / f"pkg{n % 50}" / f"mod{n % 7}"
+        directory.mkdir(parents=True, exist_ok=True)
+        body = []
+        for i in range(lines):
+            words = " ".join(rng.choice(WORDS) for _ in range(8))
+            body.append(f"    value_{i} = compute({words!r})")
+        if n % 97 == 0:
+            body.append(f"def handle_request_{n}(payload):")
+        if n % 211 == 0:
+            body.append(f"needle_{n:06x} = True")
+        (directory / f"file{n}.py").write_text("\n".join(body) + "\n")
+
+
+async def _run(tool: GrepTool, root: Path, pattern: str) -> tuple[float, dict]:
+    start = time.perf_counter()
+    result = await tool.execute(ToolInvocation(params={"pattern": pattern}, cwd=root))
+    return time.perf_counter() - start, result.metadata
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="grep with the trigram index vs a full scan")
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--lines", type=int, default=80)
+    args = parser.parse_args()
+    enable_process_pool()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp).resolve()
+        _make_tree(root, args.files, args.lines, random.Random(0))
+        os.chdir(root)
+
+        os.environ["GREP_INDEX_ENABLED"] = "false"
+        scan_tool = GrepTool()
+        os.environ["GREP_INDEX_ENABLED"] = "true"
+
+        start = time.perf_counter()
+        tool = GrepTool()
+        index = get_trigram_index(root)
+        index.start()
+        index.wait_ready()
+        build = time.perf_counter() - start
+
+        print(f"tree:          {args.files} files x {args.lines} lines")
+        print(f"index build:   {build * 1e3:10.1f} ms ({index.file_count} files)")
+        for pattern in QUERIES:
+            indexed, meta = asyncio.run(_run(tool, root, pattern))
+            scanned, scan_meta = asyncio.run(_run(scan_tool, root, pattern))
+            assert meta["matches"] == scan_meta["matches"], (pattern, meta, scan_meta)
+            print(
+                f"{pattern:<28} indexed {indexed * 1e3:8.2f} ms "
+                f"({meta['files_searched']} candidates)   scan {scanned * 1e3:8.2f} ms   "
+                f"{meta['matches']} matches"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+from tools.base import ToolInvocation
+from tools.builtin.read_file import ReadFileTool
+from utils.line_index import LineIndex, LineIndexCache
+from utils.paths import read_line_window
+
+LINE = "2024-05-01T12:00:00Z INFO request handled path=/api/v1/items status=200\n"
+
+
+def _make_file(directory: Path, size_mb: int) -> Path:
+    path = directory / f"bench_{size_mb}mb.log"
+    block = LINE * 1000
+    with open(path, "w") as f:
+        for _ in range(size_mb * 1024 * 1024 // len(block)):
+            f.write(block)
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Random-window reads on a large file")
+    parser.add_argument("--size-mb", type=int, default=100)
+    parser.add_argument("--reads", type=int, default=200)
+    parser.add_argument("--window", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _make_file(Path(tmp), args.size_mb)
+
+        start = time.perf_counter()
+        index = LineIndex.build(path)
+        build = time.perf_counter() - start
+
+        cache = LineIndexCache(spill_dir=Path(tmp) / "sidecars")
+        cache.get(path)
+        cache.clear()
+        start = time.perf_counter()
+        cache.get(path)
+        sidecar_load = time.perf_counter() - start
+
+        rng = random.Random(0)
+        starts = [rng.randrange(index.total_lines) for _ in range(args.reads)]
+
+        start = time.perf_counter()
+        for line in starts:
+            read_line_window(path, line, args.window, index=index)
+        indexed = (time.perf_counter() - start) / args.reads
+
+        # End to end through the tool, which must accept the file for windowed reads.
+        tool = ReadFileTool()
+        start = time.perf_counter()
+        for line in starts:
+            result = asyncio.run(
+                tool.execute(
+                    ToolInvocation(
+                        params={"path": str(path), "offset": line + 1, "limit": args.window},
+                        cwd=Path(tmp),
+                    )
+                )
+            )
+            assert result.success, result.error
+        tool_read = (time.perf_counter() - start) / args.reads
+
+        scan_reads = max(1, args.reads // 20)
+        start = time.perf_counter()
+        for line in starts[:scan_reads]:
+            read_line_window(path, line, args.window)
+        scanned = (time.perf_counter() - start) / scan_reads
+
+    print(f"file:              {args.size_mb} MB, {index.total_lines} lines")
+    print(f"index build:       {build * 1e3:10.2f} ms")
+    print(f"sidecar load:      {sidecar_load * 1e3:10.2f} ms")
+    print(f"indexed window:    {indexed * 1e3:10.3f} ms/read")
+    print(f"streaming window:  {scanned * 1e3:10.3f} ms/read")
+    print(f"read_file window:  {tool_read * 1e3:10.3f} ms/read")
+
+
+if __name__ == "__main__":
+    main()
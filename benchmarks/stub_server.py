@@ -0,0 +1,323 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+WORDS = (
+    "the agent reads the file and then explains how the function handles each "
+    "edge case before suggesting a smaller change"
+).split()
+
+
+@dataclass
+class StubConfig:
+    host: str = "127.0.0.1"
+    port: int = 0
+    tokens_per_second: float = 500.0
+    time_to_first_token: float = 0.05
+    response_tokens: int = 200
+    # Emit a tool call when the last message is from the user.
+    tool_call_name: str | None = None
+    tool_call_arguments: dict[str, Any] = field(default_factory=dict)
+    rate_limit_probability: float = 0.0
+    retry_after_seconds: float = 0.1
+    disconnect_probability: float = 0.0
+    # Drops the connection after this many SSE chunks of a streamed reply
+    # (with this probability), i.e. after the client has already seen output.
+    mid_stream_disconnect_probability: float = 0.0
+    disconnect_after_chunks: int = 5
+    seed: int = 0
+
+
+class StubServer:
+    # Minimal OpenAI-compatible chat-completions endpoint over HTTP/1.1 keep-alive.
+    def __init__(self, config: StubConfig | None = None) -> None:
+        self.config = config or StubConfig()
+        self.requests = 0
+        self._rng = random.Random(self.config.seed)
+        self._server: asyncio.base_events.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("Stub server is not running")
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.config.host, self.config.port
+        )
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, body = request
+                keep_open = await self._dispatch(writer, method, path, body)
+                if not keep_open:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> tuple[str, str, bytes] | None:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+        headers: dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", "0"))
+        body = await reader.readexactly(length) if length else b""
+        return method, path, body
+
+    async def _dispatch(
+        self, writer: asyncio.StreamWriter, method: str, path: str, body: bytes
+    ) -> bool:
+        if method != "POST" or not path.endswith("/chat/completions"):
+            await self._write_response(writer, 200, b"{}", head=method == "HEAD")
+            return True
+
+        self.requests += 1
+        payload = json.loads(body or b"{}")
+
+        if self._rng.random() < self.config.disconnect_probability:
+            return False
+
+        if self._rng.random() < self.config.rate_limit_probability:
+            error = json.dumps({"error": {"message": "Rate limit exceeded", "type": "rate_limit"}})
+            await self._write_response(
+                writer,
+                429,
+                error.encode(),
+                extra_headers={"retry-after": str(self.config.retry_after_seconds)},
+            )
+            return True
+
+        if payload.get("stream"):
+            return await self._stream(writer, payload)
+
+        message, finish_reason = self._build_message(payload)
+        completion = {
+            "id": f"chatcmpl-stub-{self.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "stub"),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": self._usage(payload),
+        }
+        await asyncio.sleep(self.config.time_to_first_token)
+        await self._write_response(writer, 200, json.dumps(completion).encode())
+        return True
+
+    async def _stream(self, writer: asyncio.StreamWriter, payload: dict[str, Any]) -> bool:
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"content-type: text/event-stream\r\n"
+            b"transfer-encoding: chunked\r\n"
+            b"x-ratelimit-limit-requests: 10000\r\n"
+            b"x-ratelimit-remaining-requests: 9999\r\n"
+            b"\r\n"
+        )
+        await asyncio.sleep(self.config.time_to_first_token)
+
+        model = payload.get("model", "stub")
+        delay = 1.0 / self.config.tokens_per_second if self.config.tokens_per_second else 0.0
+        message, finish_reason = self._build_message(payload)
+        drop_after: int | None = None
+        if self._rng.random() < self.config.mid_stream_disconnect_probability:
+            drop_after = self.config.disconnect_after_chunks
+        sent = 0
+
+        async def send(data: dict[str, Any]) -> bool:
+            # False means the fault fired: the caller closes the connection mid-body.
+            nonlocal sent
+            if drop_after is not None and sent >= drop_after:
+                return False
+            sent += 1
+            await self._send_event(writer, data)
+            return True
+
+        def chunk(delta: dict[str, Any], finish: str | None = None) -> dict[str, Any]:
+            return {
+                "id": f"chatcmpl-stub-{self.requests}",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+
+        if message.get("tool_calls"):
+            call = message["tool_calls"][0]
+            arguments = call["function"]["arguments"]
+            if not await send(chunk({
+                "role": "assistant",
+                "tool_calls": [{
+                    "index": 0,
+                    "id": call["id"],
+                    "type": "function",
+                    "function": {"name": call["function"]["name"], "arguments": ""},
+                }],
+            })):
+                return False
+            for start in range(0, len(arguments), 8):
+                if not await send(chunk({
+                    "tool_calls": [{
+                        "index": 0,
+                        "function": {"arguments": arguments[start:start + 8]},
+                    }],
+                })):
+                    return False
+                await asyncio.sleep(delay)
+        else:
+            for word in message["content"].split(" "):
+                if not await send(chunk({"content": word + " "})):
+                    return False
+                if delay:
+                    await asyncio.sleep(delay)
+
+        if not await send(chunk({}, finish_reason)):
+            return False
+
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            if not await send({
+                "id": f"chatcmpl-stub-{self.requests}",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [],
+                "usage": self._usage(payload),
+            }):
+                return False
+
+        await self._write_chunk(writer, b"data: [DONE]\n\n")
+        await self._write_chunk(writer, b"")
+        return True
+
+    def _build_message(self, payload: dict[str, Any]) -> tuple[dict[str, Any], str]:
+        messages = payload.get("messages") or []
+        last_role = messages[-1].get("role") if messages else "user"
+
+        if self.config.tool_call_name and payload.get("tools") and last_role == "user":
+            return {
+                "role": "assistant",
+                "content": None,
+                "tool_calls": [{
+                    "id": f"call_stub_{self.requests}",
+                    "type": "function",
+                    "function": {
+                        "name": self.config.tool_call_name,
+                        "arguments": json.dumps(self.config.tool_call_arguments),
+                    },
+                }],
+            }, "tool_calls"
+
+        words = [WORDS[i % len(WORDS)] for i in range(self.config.response_tokens)]
+        return {"role": "assistant", "content": " ".join(words)}, "stop"
+
+    def _usage(self, payload: dict[str, Any]) -> dict[str, Any]:
+        prompt_chars = sum(len(str(m.get("content") or "")) for m in payload.get("messages") or [])
+        prompt_tokens = prompt_chars // 4
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": self.config.response_tokens,
+            "total_tokens": prompt_tokens + self.config.response_tokens,
+            "prompt_tokens_details": {"cached_tokens": 0},
+        }
+
+    async def _send_event(self, writer: asyncio.StreamWriter, data: dict[str, Any]) -> None:
+        await self._write_chunk(writer, f"data: {json.dumps(data)}\n\n".encode())
+
+    async def _write_chunk(self, writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        await writer.drain()
+
+    async def _write_response(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        body: bytes,
+        extra_headers: dict[str, str] | None = None,
+        head: bool = False,
+    ) -> None:
+        reason = {200: "OK", 429: "Too Many Requests"}.get(status, "Error")
+        headers = [
+            f"HTTP/1.1 {status} {reason}",
+            "content-type: application/json",
+            f"content-length: {len(body)}",
+        ]
+        headers.extend(f"{name}: {value}" for name, value in (extra_headers or {}).items())
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + (b"" if head else body))
+        await writer.drain()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tokens-per-second", type=float, default=500.0)
+    parser.add_argument("--ttft", type=float, default=0.05)
+    parser.add_argument("--response-tokens", type=int, default=200)
+    parser.add_argument("--tool-call", default=None, help="Tool name to call on user turns")
+    parser.add_argument("--tool-args", default="{}", help="JSON arguments for --tool-call")
+    parser.add_argument("--rate-limit-probability", type=float, default=0.0)
+    parser.add_argument("--disconnect-probability", type=float, default=0.0)
+    parser.add_argument("--mid-stream-disconnect-probability", type=float, default=0.0)
+    parser.add_argument("--disconnect-after-chunks", type=int, default=5)
+    args = parser.parse_args()
+
+    config = StubConfig(
+        host=args.host,
+        port=args.port,
+        tokens_per_second=args.tokens_per_second,
+        time_to_first_token=args.ttft,
+        response_tokens=args.response_tokens,
+        tool_call_name=args.tool_call,
+        tool_call_arguments=json.loads(args.tool_args),
+        rate_limit_probability=args.rate_limit_probability,
+        disconnect_probability=args.disconnect_probability,
+        mid_stream_disconnect_probability=args.mid_stream_disconnect_probability,
+        disconnect_after_chunks=args.disconnect_after_chunks,
+    )
+
+    async def serve() -> None:
+        server = StubServer(config)
+        print(f"Stub server listening on {await server.start()}")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import time
+from utils.text import count_tokens, count_tokens_batch, get_tokenizer_registry
+
+SAMPLE = (
+    "def handler(event, context):\n"
+    "    payload = json.loads(event['body'])\n"
+    "    return {'statusCode': 200, 'body': json.dumps(payload)}\n"
+)
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold vs warm token counting")
+    parser.add_argument("--model", default="gpt-4")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    texts = [SAMPLE * (i % 16 + 1) for i in range(args.batch_size)]
+    registry = get_tokenizer_registry()
+
+    registry.clear()
+    cold = _timed(lambda: count_tokens(SAMPLE, args.model))
+    warm = _timed(
+        lambda: [count_tokens(SAMPLE, args.model) for _ in range(args.iterations)]
+    ) / args.iterations
+
+    sequential = _timed(lambda: [count_tokens(text, args.model) for text in texts])
+    batched = _timed(lambda: count_tokens_batch(texts, args.model))
+
+    print(f"model:                {args.model}")
+    print(f"cold count:           {cold * 1e3:9.3f} ms")
+    print(f"warm count (avg):     {warm * 1e6:9.3f} us")
+    print(f"sequential x{len(texts):<4}      {sequential * 1e3:9.3f} ms")
+    print(f"count_tokens_batch:   {batched * 1e3:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
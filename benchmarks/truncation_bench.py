@@ -0,0 +1,36 @@
+import argparse
+import time
+from utils.text import TruncationStrategy, count_tokens, truncate_text
+
+LINE = "    result = process_record(record, options=options)  # keep going\n"
+
+
+def _make_text(size_mb: int) -> str:
+    target = size_mb * 1024 * 1024
+    return LINE * (target // len(LINE))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Token-budget truncation scaling")
+    parser.add_argument("--model", default="gpt-4")
+    parser.add_argument("--max-tokens", type=int, default=25000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    count_tokens("warm up", args.model)
+
+    print(f"{'size':>6} {'strategy':>8} {'seconds':>9} {'ms/MB':>9}")
+    for size_mb in args.sizes:
+        text = _make_text(size_mb)
+        for strategy in TruncationStrategy:
+            start = time.perf_counter()
+            truncate_text(text, args.model, args.max_tokens, strategy=strategy)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{size_mb:>4}MB {strategy.value:>8} {elapsed:9.3f} "
+                f"{elapsed * 1e3 / size_mb:9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from utils.workspace_tree import WorkspaceTree, glob_to_regex
+
+
+def _make_tree(root: Path, files: int, per_dir: int) -> None:
+    (root / ".gitignore").write_text("*.log\nbuild/\n")
+    for n in range(0, files, per_dir):
+        directory = root / f"pkg{n // (per_dir * 40)}" / f"mod{n // per_dir}"
+        directory.mkdir(parents=True, exist_ok=True)
+        for i in range(min(per_dir, files - n)):
+            suffix = ".log" if i % 25 == 0 else ".py"
+            (directory / f"f{i}{suffix}").touch()
+
+
+def _os_walk(root: Path) -> int:
+    count = 0
+    for _, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != ".git"]
+        count += len(filenames)
+    return count
+
+
+def _timed(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Workspace tree snapshot vs os.walk")
+    parser.add_argument("--files", type=int, default=200_000)
+    parser.add_argument("--per-dir", type=int, default=100)
+    parser.add_argument("--touched-dirs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        setup, _ = _timed(lambda: _make_tree(root, args.files, args.per_dir))
+        print(f"tree:              {args.files} files, {args.per_dir}/dir (created in {setup:.1f}s)")
+
+        walk, walked = _timed(lambda: _os_walk(root))
+        print(f"os.walk:           {walk * 1e3:10.1f} ms ({walked} files)")
+
+        tree = WorkspaceTree(root)
+        build, _ = _timed(tree.refresh)
+        print(f"snapshot build:    {build * 1e3:10.1f} ms ({tree.file_count} files after .gitignore)")
+
+        unchanged, _ = _timed(tree.refresh)
+        print(f"refresh, no edits: {unchanged * 1e3:10.1f} ms ({tree.last_rescanned_dirs} dirs re-listed)")
+
+        dirs = sorted(p for p in root.glob("pkg*/mod*"))[:: max(1, len(list(root.glob('pkg*/mod*'))) // args.touched_dirs)]
+        for directory in dirs[: args.touched_dirs]:
+            (directory / "added.py").touch()
+        time.sleep(0.01)
+        touched, _ = _timed(tree.refresh)
+        print(f"refresh, {args.touched_dirs} dirs:  {touched * 1e3:10.1f} ms ({tree.last_rescanned_dirs} dirs re-listed)")
+
+        regex = glob_to_regex("**/f1*.py")
+        query, matched = _timed(lambda: sum(1 for path in tree.iter_files() if regex.match(path)))
+        print(f"glob **/f1*.py:    {query * 1e3:10.1f} ms ({matched} matches)")
+
+
+if __name__ == "__main__":
+    main()
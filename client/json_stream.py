@@ -0,0 +1,109 @@
+from __future__ import annotations
+import json
+from typing import Any
+
+
+class IncrementalJSONObject:
+    # Scans a JSON object as it arrives in fragments. Only structural state is tracked
+    # (nesting depth, string/escape state), so each fragment is scanned once. Top-level
+    # fields are decoded as soon as their value closes, which lets callers act on e.g. a
+    # path argument before the rest of the object has streamed in.
+    def __init__(self) -> None:
+        self._text = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._started = False
+        self._end: int | None = None
+
+        self._key_start: int | None = None
+        self._key: str | None = None
+        self._value_start: int | None = None
+        self.fields: dict[str, Any] = {}
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def complete(self) -> bool:
+        return self._end is not None
+
+    def feed(self, fragment: str) -> bool:
+        # Consume a fragment; returns True once the top-level object has closed.
+        if self._end is not None or not fragment:
+            return self._end is not None
+
+        base = len(self._text)
+        self._text += fragment
+
+        for offset, ch in enumerate(fragment):
+            position = base + offset
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._key_start is not None and self._key is None:
+                        self._key = self._decode_key(position)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if (
+                    self._depth == 1
+                    and self._key is None
+                    and self._value_start is None
+                ):
+                    self._key_start = position
+            elif ch == "{" or ch == "[":
+                if not self._started:
+                    if ch == "{":
+                        self._started = True
+                        self._depth = 1
+                    continue
+                self._depth += 1
+            elif ch == "}" or ch == "]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._close_field(position)
+                    self._end = position + 1
+                    return True
+            elif self._depth == 1:
+                if ch == ":":
+                    self._value_start = position + 1
+                elif ch == ",":
+                    self._close_field(position)
+
+        return False
+
+    def value(self) -> dict[str, Any] | None:
+        # The fully decoded object, or None until it has closed.
+        if self._end is None:
+            return None
+        try:
+            decoded = json.loads(self._text[: self._end])
+        except json.JSONDecodeError:
+            return None
+        return decoded if isinstance(decoded, dict) else None
+
+    def _decode_key(self, end: int) -> str | None:
+        raw = self._text[self._key_start : end + 1]
+        try:
+            return json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+
+    def _close_field(self, end: int) -> None:
+        if self._key is not None and self._value_start is not None:
+            raw = self._text[self._value_start : end].strip()
+            if raw:
+                try:
+                    self.fields[self._key] = json.loads(raw)
+                except json.JSONDecodeError:
+                    pass
+        self._key_start = None
+        self._key = None
+        self._value_start = None
@@ -1,19 +1,47 @@
 import asyncio
+import time
+from contextlib import aclosing
 from typing import Any, AsyncGenerator
+import httpx
 from dotenv import load_dotenv
-from openai import APIConnectionError, APIError, AsyncOpenAI, RateLimitError
+from openai import APIConnectionError, APIError, AsyncOpenAI, InternalServerError, RateLimitError
 from common.constants.environment_constants import EnvironmentConstants
 from common.constants.llm_client_constants import LLMClientConstants
 from common.helpers.environment_helper import EnvironmentHelper as Env
-from client.response import TextDelta, TokenUsage, StreamEvent, StreamEventType, ToolCall, ToolCallDelta, parse_tool_call_arguments
+from client.json_stream import IncrementalJSONObject
+from client.rate_limiter import Priority, get_rate_limiter
+from client.response_cache import CachedResponse, ResponseCache, get_response_cache, make_cache_key
+from client.retry import RetryPolicy, RetryState, StreamResumer, retry_after_seconds
+from client.transport import get_shared_http_client, warm_up as warm_up_transport
+from client.response import TextDelta, TokenUsage, StreamEvent, StreamEventType, ToolCall, ToolCallDelta, build_openai_tools, parse_token_usage, parse_tool_call_arguments
+from utils.metrics import get_metrics
+from utils.text import estimate_tokens
 
 load_dotenv()
 
+# The first event carrying model output; its arrival is the time to first token.
+_FIRST_TOKEN_EVENTS = {
+    StreamEventType.TEXT_DELTA,
+    StreamEventType.TOOL_CALL_START,
+    StreamEventType.TOOL_CALL_DELTA,
+    StreamEventType.TOOL_CALL_COMPLETE,
+}
+
 
 class LLMClient:
-    def __init__(self) -> None:
+    def __init__(self, response_cache: ResponseCache | None = None) -> None:
         self._client: AsyncOpenAI | None = None
-        self._max_retries: int = LLMClientConstants.MAX_RETRIES
+        self._response_cache = response_cache or get_response_cache()
+        self._rate_limiter = get_rate_limiter()
+        self._retry_policy = RetryPolicy(
+            max_retries=Env.get_env_variable(
+                EnvironmentConstants.LLM_MAX_RETRIES, LLMClientConstants.MAX_RETRIES
+            ),
+            deadline=Env.get_env_variable(
+                EnvironmentConstants.LLM_REQUEST_DEADLINE,
+                LLMClientConstants.REQUEST_DEADLINE_SECONDS,
+            ),
+        )
 
     def get_client(self) -> AsyncOpenAI:
         if self._client is None:
@@ -22,92 +50,202 @@ class LLMClient:
                 base_url=Env.get_env_variable(
                     EnvironmentConstants.OPEN_ROUTER_BASE_URL
                 ),
+                http_client=get_shared_http_client(),
             )
         return self._client
 
+    async def warm_up(self) -> None:
+        await warm_up_transport(Env.get_env_variable(EnvironmentConstants.OPEN_ROUTER_BASE_URL))
+
     async def close(self) -> None:
-        if self._client is not None:
-            await self._client.close()
-            self._client = None
+        # The pooled transport outlives this client; close_shared_http_client() owns it.
+        self._client = None
     
     def _build_tools(self, tools: list[dict[str, Any]]):
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": tool.get("name"),
-                    "description": tool.get("description", ""),
-                    "parameters": tool.get("parameters", {"type": "object", "properties": {}}),
-                }
-            }
-            for tool in tools
-        ]
+        # ToolRegistry payloads arrive already in wire format; pass those through.
+        if all(tool.get("type") == "function" for tool in tools):
+            return tools
+
+        return build_openai_tools(tools)
 
     async def chat_completion(
-        self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None, stream: bool = True
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        stream: bool = True,
+        estimated_tokens: int | None = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncGenerator[StreamEvent, None]:
+        metrics = get_metrics()
+        span = metrics.start_span(
+            "llm_chat_completion",
+            stream=str(stream).lower(),
+            priority=priority.name.lower(),
+        )
+        first_token_at: float | None = None
+        outcome = "ok"
+        try:
+            events = self._chat_completion(
+                messages, tools, stream, estimated_tokens, priority, span.attributes
+            )
+            async with aclosing(events):
+                async for event in events:
+                    # Cache replays would drag the latency histograms towards zero.
+                    live = span.attributes.get("cache") != "hit"
+                    if live and first_token_at is None and event.type in _FIRST_TOKEN_EVENTS:
+                        first_token_at = time.perf_counter()
+                        ttft = first_token_at - span.started
+                        span.attributes["ttft_ms"] = round(ttft * 1000, 3)
+                        metrics.observe("llm_time_to_first_token_seconds", ttft)
+                    elif (
+                        live
+                        and event.type == StreamEventType.MESSAGE_COMPLETE
+                        and first_token_at is not None
+                    ):
+                        metrics.observe(
+                            "llm_stream_seconds", time.perf_counter() - first_token_at
+                        )
+                    if event.type == StreamEventType.ERROR:
+                        outcome = "error"
+                    yield event
+        except (GeneratorExit, asyncio.CancelledError):
+            outcome = "cancelled"
+            raise
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            span.end(outcome=outcome)
+
+    async def _chat_completion(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        stream: bool,
+        estimated_tokens: int | None,
+        priority: Priority,
+        attributes: dict[str, Any],
     ) -> AsyncGenerator[StreamEvent, None]:
         client: AsyncOpenAI = self.get_client()
+        metrics = get_metrics()
+        if estimated_tokens is None:
+            estimated_tokens = estimate_tokens(
+                "".join(str(message.get("content") or "") for message in messages)
+            )
 
         kwargs: dict[str, Any] = {
             "model": Env.get_env_variable(EnvironmentConstants.DEFAULT_MODEL_NAME),
             "messages": messages,
             "stream": stream,
         }
+        if stream:
+            # Without this most providers send no usage at all on streamed replies.
+            kwargs["stream_options"] = {"include_usage": True}
 
         if tools:
             kwargs["tools"] = self._build_tools(tools)
             kwargs["tool_choice"] = "auto"
 
-        for attempt in range(self._max_retries + 1):
+        cache_key: str | None = None
+        recording: CachedResponse | None = None
+        if self._response_cache is not None:
+            cache_key = make_cache_key(kwargs["model"], messages, kwargs.get("tools"), stream)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                metrics.increment("llm_cache_hits_total")
+                attributes["cache"] = "hit"
+                for event in cached.replay(stream):
+                    yield event
+                return
+            recording = CachedResponse()
+
+        retry = RetryState(self._retry_policy)
+        resumer = StreamResumer()
+
+        while True:
+            resumer.begin_attempt()
+            queued = time.perf_counter()
+            await self._rate_limiter.acquire(estimated_tokens, priority)
+            metrics.observe("llm_rate_limit_wait_seconds", time.perf_counter() - queued)
             try:
                 if stream:
                     async for event in self._stream_response(client, kwargs):
-                        yield event
+                        # A retried stream replays from the start; drop what was already sent.
+                        event = resumer.filter(event)
+                        if event is not None:
+                            self._record_usage(event, estimated_tokens)
+                            if recording is not None:
+                                recording.record(event)
+                            yield event
                 else:
                     event = await self._non_stream_response(client, kwargs)
+                    self._record_usage(event, estimated_tokens)
+                    if recording is not None:
+                        recording.record(event)
                     yield event
+
+                if cache_key is not None and recording is not None and recording.finish_reason:
+                    self._response_cache.put(cache_key, recording)
                 return
             except RateLimitError as e:
-                if attempt < self._max_retries:
-                    wait_time = 2**attempt
-                    await asyncio.sleep(wait_time)
-                else:
+                self._rate_limiter.on_rate_limited(
+                    retry_after_seconds(e), e.response.headers
+                )
+                delay = retry.next_delay(e)
+                if delay is None:
                     yield StreamEvent(
                         type=StreamEventType.ERROR,
                         error=f"Rate Limit Exceeded: {e}",
                     )
                     return
-            except APIConnectionError as e:
-                if attempt < self._max_retries:
-                    wait_time = 2**attempt
-                    await asyncio.sleep(wait_time)
-                else:
+                metrics.increment("llm_retries_total", reason="rate_limit")
+                await asyncio.sleep(delay)
+            except (APIConnectionError, httpx.TransportError) as e:
+                # openai wraps transport errors raised while sending the request,
+                # but a connection lost mid-stream surfaces as the bare httpx
+                # error; both retry, and the resumer drops the replayed prefix.
+                delay = retry.next_delay(e)
+                if delay is None:
                     yield StreamEvent(
                         type=StreamEventType.ERROR,
                         error=f"Connection Error: {e}",
                     )
                     return
+                metrics.increment("llm_retries_total", reason="connection")
+                await asyncio.sleep(delay)
+            except InternalServerError as e:
+                delay = retry.next_delay(e)
+                if delay is None:
+                    yield StreamEvent(type=StreamEventType.ERROR, error=f"API error: {e}")
+                    return
+                metrics.increment("llm_retries_total", reason="server")
+                await asyncio.sleep(delay)
             except APIError as e:
                 yield StreamEvent(type=StreamEventType.ERROR, error=f"API error: {e}")
                 return
 
+    def _record_usage(self, event: StreamEvent, estimated_tokens: int) -> None:
+        # Text deltas carry the running usage too; the bucket is corrected once
+        # per request, from the final event.
+        if event.type == StreamEventType.MESSAGE_COMPLETE and event.usage is not None:
+            self._rate_limiter.record_usage(estimated_tokens, event.usage.total_tokens)
+
     async def _stream_response(
         self, client: AsyncOpenAI, kwargs: dict[str, Any]
     ) -> AsyncGenerator[StreamEvent, None]:
-        response = await client.chat.completions.create(**kwargs)
+        raw_response = await client.chat.completions.with_raw_response.create(**kwargs)
+        self._rate_limiter.on_success(raw_response.headers)
+        response = raw_response.parse()
 
         finish_reason: str | None = None
         usage: TokenUsage | None = None
         tool_calls: dict[int, dict[str, Any]] = {}
 
         async for chunk in response:
-            if hasattr(chunk, "usage") and chunk.usage:
-                usage = TokenUsage(
-                    prompt_tokens=chunk.usage.prompt_tokens,
-                    completion_tokens=chunk.usage.completion_tokens,
-                    total_tokens=chunk.usage.total_tokens,
-                    cached_tokens=chunk.usage.prompt_tokens_details.cached_tokens,
-                )
+            # With include_usage the totals arrive on a last chunk with no choices.
+            chunk_usage = parse_token_usage(getattr(chunk, "usage", None))
+            if chunk_usage is not None:
+                usage = chunk_usage
 
             if not chunk.choices:
                 continue
@@ -129,57 +267,89 @@ class LLMClient:
             
             if delta.tool_calls:
                 for tool_call_delta in delta.tool_calls:
-                    idx = tool_call_delta.index
-                    if idx not in tool_calls:
-                        tool_calls[idx] = {
-                            "id": tool_call_delta.id or "",
-                            "name": "",
-                            "arguments": "",
-                        }
-
-                        if tool_call_delta.function:
-                            if tool_call_delta.function.name:
-                                tool_calls[idx]["name"] = tool_call_delta.function.name
-                                yield StreamEvent(
-                                    type=StreamEventType.TOOL_CALL_START,
-                                    tool_call_delta=ToolCallDelta(
-                                        call_id=tool_calls[idx]["id"],
-                                        name=tool_calls[idx]["name"],
-                                    )
-                                )
-                            
-                            if tool_call_delta.function.arguments:
-                                tool_calls[idx]["arguments"] += tool_call_delta.function.arguments
-                                yield StreamEvent(
-                                    type=StreamEventType.TOOL_CALL_DELTA,
-                                    tool_call_delta=ToolCallDelta(
-                                        call_id=tool_calls[idx]["id"],
-                                        name=tool_calls[idx]["name"],
-                                        arguments_delta=tool_call_delta.function.arguments,
-                                    )
-                                )
-                
-        for idex, tc in tool_calls.items():
-            if finish_reason == "tool_call" and tc["id"] == choice.tool_calls[0].id:
-                yield StreamEvent(
-                    type=StreamEventType.TOOL_CALL_COMPLETE,
-                    tool_call=ToolCall(
-                        call_id=tc["id"],
-                        name=tc["name"],
-                        arguments=parse_tool_call_arguments(tc["arguments"]),
-                    )
-                )
-                del tool_calls[idex]
+                    for event in self._on_tool_call_delta(tool_calls, tool_call_delta):
+                        yield event
+
+        # Calls whose arguments never formed a closed object (empty or
+        # malformed) are completed once the stream ends.
+        for state in tool_calls.values():
+            if not state["completed"]:
+                state["completed"] = True
+                yield self._tool_call_complete(state)
+
         yield StreamEvent(
             type=StreamEventType.MESSAGE_COMPLETE,
             finish_reason=finish_reason,
             usage=usage,
         )
 
+    def _on_tool_call_delta(
+        self, tool_calls: dict[int, dict[str, Any]], tool_call_delta: Any
+    ) -> list[StreamEvent]:
+        events: list[StreamEvent] = []
+        idx = tool_call_delta.index
+        state = tool_calls.get(idx)
+        if state is None:
+            state = tool_calls[idx] = {
+                "id": "",
+                "name": "",
+                "arguments": IncrementalJSONObject(),
+                "started": False,
+                "completed": False,
+            }
+        if tool_call_delta.id and not state["id"]:
+            state["id"] = tool_call_delta.id
+
+        function = tool_call_delta.function
+        if function is None:
+            return events
+
+        if function.name and not state["started"]:
+            state["name"] = function.name
+            state["started"] = True
+            events.append(
+                StreamEvent(
+                    type=StreamEventType.TOOL_CALL_START,
+                    tool_call_delta=ToolCallDelta(call_id=state["id"], name=state["name"]),
+                )
+            )
+
+        if function.arguments and not state["completed"]:
+            closed = state["arguments"].feed(function.arguments)
+            events.append(
+                StreamEvent(
+                    type=StreamEventType.TOOL_CALL_DELTA,
+                    tool_call_delta=ToolCallDelta(
+                        call_id=state["id"],
+                        name=state["name"],
+                        arguments_delta=function.arguments,
+                        arguments=state["arguments"].fields,
+                    ),
+                )
+            )
+            if closed:
+                state["completed"] = True
+                events.append(self._tool_call_complete(state))
+
+        return events
+
+    @staticmethod
+    def _tool_call_complete(state: dict[str, Any]) -> StreamEvent:
+        parser: IncrementalJSONObject = state["arguments"]
+        arguments = parser.value()
+        if arguments is None:
+            arguments = parse_tool_call_arguments(parser.text)
+        return StreamEvent(
+            type=StreamEventType.TOOL_CALL_COMPLETE,
+            tool_call=ToolCall(call_id=state["id"], name=state["name"], arguments=arguments),
+        )
+
     async def _non_stream_response(
         self, client: AsyncOpenAI, kwargs: dict[str, Any]
     ) -> StreamEvent:
-        response = await client.chat.completions.create(**kwargs)
+        raw_response = await client.chat.completions.with_raw_response.create(**kwargs)
+        self._rate_limiter.on_success(raw_response.headers)
+        response = raw_response.parse()
         choice = response.choices[0]
         message = choice.message
 
@@ -198,14 +368,7 @@ class LLMClient:
                     )
                 )
 
-        usage = None
-        if response.usage:
-            usage = TokenUsage(
-                prompt_tokens=response.usage.prompt_tokens,
-                completion_tokens=response.usage.completion_tokens,
-                total_tokens=response.usage.total_tokens,
-                cached_tokens=response.usage.prompt_tokens_details.cached_tokens,
-            )
+        usage = parse_token_usage(response.usage)
 
         return StreamEvent(
             type=StreamEventType.TEXT_DELTA,
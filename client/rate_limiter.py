@@ -0,0 +1,191 @@
+from __future__ import annotations
+import asyncio
+import heapq
+import itertools
+import time
+from enum import IntEnum
+from typing import Mapping
+from common.helpers.environment_helper import EnvironmentHelper as Env
+from common.constants.environment_constants import EnvironmentConstants
+from common.constants.rate_limit_constants import RateLimitConstants
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float) -> None:
+        self.ceiling = float(per_minute)
+        self.rate = float(per_minute)
+        self.level = float(per_minute)
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ceiling > 0
+
+    def set_ceiling(self, per_minute: float) -> None:
+        if per_minute <= 0 or per_minute == self.ceiling:
+            return
+        self._refill()
+        if not self.enabled:
+            self.rate = self.level = float(per_minute)
+        self.ceiling = float(per_minute)
+        self.rate = min(self.rate, self.ceiling)
+        self.level = min(self.level, self.ceiling)
+
+    def cap_level(self, remaining: float) -> None:
+        self._refill()
+        self.level = min(self.level, remaining)
+
+    def wait_time(self, amount: float) -> float:
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        # A single request larger than the whole bucket would otherwise wait forever.
+        amount = min(amount, self.ceiling)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60.0 / self.rate
+
+    def consume(self, amount: float) -> None:
+        if not self.enabled:
+            return
+        self._refill()
+        self.level -= min(amount, self.ceiling)
+
+    def debit(self, amount: float) -> None:
+        # Post-hoc correction once real usage is known; may push the level negative.
+        if self.enabled:
+            self._refill()
+            self.level -= amount
+
+    def decrease(self) -> None:
+        if not self.enabled:
+            return
+        floor = self.ceiling * RateLimitConstants.MIN_RATE_FRACTION
+        self.rate = max(floor, self.rate * RateLimitConstants.DECREASE_FACTOR)
+
+    def recover(self) -> None:
+        if not self.enabled:
+            return
+        step = self.ceiling * RateLimitConstants.RECOVERY_FRACTION
+        self.rate = min(self.ceiling, self.rate + step)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self.level = min(self.ceiling, self.level + elapsed * self.rate / 60.0)
+
+
+class RateLimiter:
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int) -> None:
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._paused_until = 0.0
+        self._queue: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._condition: asyncio.Condition | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def acquire(self, tokens: int, priority: Priority = Priority.INTERACTIVE) -> None:
+        condition = self._get_condition()
+        entry = (int(priority), next(self._sequence))
+
+        async with condition:
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    wait: float | None = None
+                    # Only the head of the queue may spend budget, so interactive
+                    # requests always go before queued batch work.
+                    if self._queue[0] == entry:
+                        wait = self._wait_time(tokens)
+                        if wait <= 0:
+                            heapq.heappop(self._queue)
+                            self.requests.consume(1)
+                            self.tokens.consume(tokens)
+                            condition.notify_all()
+                            return
+                    try:
+                        await asyncio.wait_for(condition.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+            except BaseException:
+                if entry in self._queue:
+                    self._queue.remove(entry)
+                    heapq.heapify(self._queue)
+                    condition.notify_all()
+                raise
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        self.tokens.debit(actual_tokens - estimated_tokens)
+
+    def on_success(self, headers: Mapping[str, str] | None = None) -> None:
+        if headers:
+            self.observe_headers(headers)
+        self.requests.recover()
+        self.tokens.recover()
+
+    def on_rate_limited(
+        self, retry_after: float | None, headers: Mapping[str, str] | None = None
+    ) -> None:
+        if headers:
+            self.observe_headers(headers)
+        self.requests.decrease()
+        self.tokens.decrease()
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        for bucket, axis in ((self.requests, "requests"), (self.tokens, "tokens")):
+            limit = _header_number(headers, f"x-ratelimit-limit-{axis}")
+            if limit is not None:
+                bucket.set_ceiling(limit)
+            remaining = _header_number(headers, f"x-ratelimit-remaining-{axis}")
+            if remaining is not None and bucket.enabled:
+                bucket.cap_level(remaining)
+
+    def _wait_time(self, tokens: int) -> float:
+        pause = self._paused_until - time.monotonic()
+        return max(pause, self.requests.wait_time(1), self.tokens.wait_time(tokens))
+
+    def _get_condition(self) -> asyncio.Condition:
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+            self._queue.clear()
+        return self._condition
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> float | None:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+_limiter: RateLimiter | None = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(
+            requests_per_minute=Env.get_env_variable(
+                EnvironmentConstants.LLM_REQUESTS_PER_MINUTE,
+                RateLimitConstants.REQUESTS_PER_MINUTE,
+            ),
+            tokens_per_minute=Env.get_env_variable(
+                EnvironmentConstants.LLM_TOKENS_PER_MINUTE,
+                RateLimitConstants.TOKENS_PER_MINUTE,
+            ),
+        )
+    return _limiter
@@ -4,7 +4,7 @@ from enum import Enum
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class TextDelta:
     content: str
 
@@ -22,7 +22,7 @@ class StreamEventType(str, Enum):
     TOOL_CALL_COMPLETE = "tool_call_complete"
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenUsage:
     prompt_tokens: int = 0
     completion_tokens: int = 0
@@ -37,19 +37,21 @@ class TokenUsage:
             cached_tokens=self.cached_tokens + other.cached_tokens,
         )
 
-@dataclass
+@dataclass(slots=True)
 class ToolCallDelta:
     call_id: str
     name: str | None = None
     arguments_delta: str = ""
+    # Top-level arguments whose values have fully streamed in so far.
+    arguments: dict[str, Any] | None = None
 
-@dataclass
+@dataclass(slots=True)
 class ToolCall:
     call_id: str
     name: str | None = None
     arguments: dict[str, Any] | None = None
 
-@dataclass
+@dataclass(slots=True)
 class StreamEvent:
     type: StreamEventType
     text_delta: TextDelta | None = None
@@ -59,6 +61,19 @@ class StreamEvent:
     tool_call: ToolCall | None = None
     usage: TokenUsage | None = None
 
+def build_openai_tools(schemas: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": schema.get("name"),
+                "description": schema.get("description", ""),
+                "parameters": schema.get("parameters", {"type": "object", "properties": {}}),
+            }
+        }
+        for schema in schemas
+    ]
+
 def parse_tool_call_arguments(arguments_str: str) -> dict[str, Any]:
     if not arguments_str:
         return {}
@@ -66,4 +81,18 @@ def parse_tool_call_arguments(arguments_str: str) -> dict[str, Any]:
         import json
         return json.loads(arguments_str)
     except json.JSONDecodeError:
-        return {"raw_arguments": arguments_str}
\ No newline at end of file
+        return {"raw_arguments": arguments_str}
+
+
+def parse_token_usage(usage: Any) -> TokenUsage | None:
+    if not usage:
+        return None
+    # Providers differ in which fields they fill; prompt_tokens_details in
+    # particular is often null when nothing was served from the prefix cache.
+    details = getattr(usage, "prompt_tokens_details", None)
+    return TokenUsage(
+        prompt_tokens=usage.prompt_tokens or 0,
+        completion_tokens=usage.completion_tokens or 0,
+        total_tokens=usage.total_tokens or 0,
+        cached_tokens=(getattr(details, "cached_tokens", None) or 0) if details else 0,
+    )
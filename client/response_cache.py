@@ -0,0 +1,216 @@
+from __future__ import annotations
+import abc
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from client.response import (
+    StreamEvent,
+    StreamEventType,
+    TextDelta,
+    ToolCall,
+    ToolCallDelta,
+)
+from common.helpers.environment_helper import EnvironmentHelper as Env
+from common.constants.environment_constants import EnvironmentConstants
+from common.constants.response_cache_constants import ResponseCacheConstants
+
+# Roughly one word per delta, like a provider streaming a token or two at a time.
+_REPLAY_CHUNK = re.compile(r"\s*\S+|\s+")
+
+
+def make_cache_key(
+    model: str | None,
+    messages: list[dict[str, Any]],
+    tools: list[dict[str, Any]] | None,
+    stream: bool,
+) -> str:
+    normalized = {
+        "model": model or "",
+        "messages": [
+            {k: v for k, v in message.items() if v is not None} for message in messages
+        ],
+        "tools": tools or [],
+        "stream": stream,
+    }
+    payload = json.dumps(normalized, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    text: str = ""
+    tool_calls: list[dict[str, Any]] = field(default_factory=list)
+    finish_reason: str | None = None
+
+    def record(self, event: StreamEvent) -> None:
+        if event.text_delta is not None:
+            self.text += event.text_delta.content
+        if event.type == StreamEventType.TOOL_CALL_COMPLETE and event.tool_call is not None:
+            self.tool_calls.append(
+                {
+                    "call_id": event.tool_call.call_id,
+                    "name": event.tool_call.name,
+                    "arguments": event.tool_call.arguments or {},
+                }
+            )
+        if event.finish_reason:
+            self.finish_reason = event.finish_reason
+
+    def replay(self, stream: bool) -> list[StreamEvent]:
+        # Hits are served locally, so they carry no token usage.
+        if not stream:
+            return [
+                StreamEvent(
+                    type=StreamEventType.TEXT_DELTA,
+                    text_delta=TextDelta(content=self.text) if self.text else None,
+                    finish_reason=self.finish_reason,
+                )
+            ]
+
+        events = [
+            StreamEvent(type=StreamEventType.TEXT_DELTA, text_delta=TextDelta(content=chunk))
+            for chunk in _REPLAY_CHUNK.findall(self.text)
+        ]
+
+        for call in self.tool_calls:
+            arguments = json.dumps(call["arguments"])
+            events.append(
+                StreamEvent(
+                    type=StreamEventType.TOOL_CALL_START,
+                    tool_call_delta=ToolCallDelta(call_id=call["call_id"], name=call["name"]),
+                )
+            )
+            events.extend(
+                StreamEvent(
+                    type=StreamEventType.TOOL_CALL_DELTA,
+                    tool_call_delta=ToolCallDelta(
+                        call_id=call["call_id"], name=call["name"], arguments_delta=chunk
+                    ),
+                )
+                for chunk in _REPLAY_CHUNK.findall(arguments)
+            )
+            events.append(
+                StreamEvent(
+                    type=StreamEventType.TOOL_CALL_COMPLETE,
+                    tool_call=ToolCall(
+                        call_id=call["call_id"], name=call["name"], arguments=call["arguments"]
+                    ),
+                )
+            )
+
+        events.append(
+            StreamEvent(
+                type=StreamEventType.MESSAGE_COMPLETE, finish_reason=self.finish_reason
+            )
+        )
+        return events
+
+    def dumps(self) -> str:
+        return json.dumps(
+            {"text": self.text, "tool_calls": self.tool_calls, "finish_reason": self.finish_reason}
+        )
+
+    @classmethod
+    def loads(cls, payload: str) -> CachedResponse:
+        data = json.loads(payload)
+        return cls(
+            text=data.get("text", ""),
+            tool_calls=data.get("tool_calls", []),
+            finish_reason=data.get("finish_reason"),
+        )
+
+
+class ResponseCache(abc.ABC):
+    @abc.abstractmethod
+    def get(self, key: str) -> CachedResponse | None:
+        pass
+
+    @abc.abstractmethod
+    def put(self, key: str, response: CachedResponse) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryResponseCache(ResponseCache):
+    def __init__(self, max_entries: int = ResponseCacheConstants.MEMORY_MAX_ENTRIES) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                return None
+            self._entries.move_to_end(key)
+        return CachedResponse.loads(payload)
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = response.dumps()
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class SqliteResponseCache(ResponseCache):
+    def __init__(self, path: str | Path = ResponseCacheConstants.SQLITE_PATH) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, payload TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return CachedResponse.loads(row[0]) if row else None
+
+    def put(self, key: str, response: CachedResponse) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, payload) VALUES (?, ?)",
+                (key, response.dumps()),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: ResponseCache | None = None
+_cache_loaded = False
+
+
+def get_response_cache() -> ResponseCache | None:
+    global _cache, _cache_loaded
+    if _cache_loaded:
+        return _cache
+
+    backend = (Env.get_env_variable(EnvironmentConstants.LLM_RESPONSE_CACHE) or "").lower()
+    if backend == ResponseCacheConstants.BACKEND_MEMORY:
+        _cache = MemoryResponseCache()
+    elif backend == ResponseCacheConstants.BACKEND_SQLITE:
+        _cache = SqliteResponseCache(
+            Env.get_env_variable(
+                EnvironmentConstants.LLM_RESPONSE_CACHE_PATH,
+                ResponseCacheConstants.SQLITE_PATH,
+            )
+        )
+    _cache_loaded = True
+    return _cache
@@ -0,0 +1,149 @@
+from __future__ import annotations
+import random
+import time
+from dataclasses import dataclass, field, replace
+from email.utils import parsedate_to_datetime
+from openai import APIStatusError
+from client.response import StreamEvent, StreamEventType, TextDelta, ToolCallDelta
+from common.constants.llm_client_constants import LLMClientConstants
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = LLMClientConstants.MAX_RETRIES
+    base_delay: float = LLMClientConstants.RETRY_BASE_DELAY_SECONDS
+    max_delay: float = LLMClientConstants.RETRY_MAX_DELAY_SECONDS
+    deadline: float = LLMClientConstants.REQUEST_DEADLINE_SECONDS
+
+    def backoff(self, attempt: int, retry_after: float | None = None) -> float:
+        if retry_after is not None:
+            # The provider knows when capacity frees up; add a little spread so a
+            # crowd of agents given the same hint does not return in lockstep.
+            return retry_after + random.uniform(0, self.base_delay)
+
+        # Full jitter: uniform over [0, capped exponential].
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+@dataclass
+class RetryState:
+    policy: RetryPolicy
+    attempt: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def next_delay(self, error: Exception) -> float | None:
+        if self.attempt >= self.policy.max_retries:
+            return None
+
+        delay = self.policy.backoff(self.attempt, retry_after_seconds(error))
+        elapsed = time.monotonic() - self.started_at
+        if elapsed + delay > self.policy.deadline:
+            return None
+
+        self.attempt += 1
+        return delay
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    if not isinstance(error, APIStatusError):
+        return None
+
+    headers = error.response.headers
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class StreamResumer:
+    # Tracks what a stream already emitted so a retried attempt only forwards
+    # output past that point. This assumes the provider regenerates the same
+    # prefix, which holds for the cached/deterministic prefixes retries usually hit.
+    def __init__(self) -> None:
+        self._text_emitted = 0
+        self._tool_args_emitted: list[int] = []
+        self._tools_completed = 0
+        self._text_seen = 0
+        self._tool_args_seen: list[int] = []
+        self._tools_seen_complete = 0
+
+    def begin_attempt(self) -> None:
+        self._text_seen = 0
+        self._tool_args_seen = []
+        self._tools_seen_complete = 0
+
+    def filter(self, event: StreamEvent) -> StreamEvent | None:
+        if event.type == StreamEventType.TEXT_DELTA and event.text_delta is not None:
+            return self._filter_text(event)
+        if event.type == StreamEventType.TOOL_CALL_START:
+            self._tool_args_seen.append(0)
+            if len(self._tool_args_seen) <= len(self._tool_args_emitted):
+                return None
+            self._tool_args_emitted.append(0)
+            return event
+        if event.type == StreamEventType.TOOL_CALL_DELTA and event.tool_call_delta is not None:
+            return self._filter_tool_args(event)
+        if event.type == StreamEventType.TOOL_CALL_COMPLETE:
+            self._tools_seen_complete += 1
+            if self._tools_seen_complete <= self._tools_completed:
+                return None
+            self._tools_completed += 1
+        return event
+
+    def _filter_text(self, event: StreamEvent) -> StreamEvent | None:
+        content = event.text_delta.content
+        start = self._text_seen
+        self._text_seen += len(content)
+
+        skip = self._text_emitted - start
+        if skip >= len(content):
+            return None
+
+        self._text_emitted = self._text_seen
+        if skip <= 0:
+            return event
+        return replace(event, text_delta=TextDelta(content=content[skip:]))
+
+    def _filter_tool_args(self, event: StreamEvent) -> StreamEvent | None:
+        if not self._tool_args_seen:
+            return event
+
+        ordinal = len(self._tool_args_seen) - 1
+        arguments = event.tool_call_delta.arguments_delta
+        start = self._tool_args_seen[ordinal]
+        self._tool_args_seen[ordinal] += len(arguments)
+
+        skip = self._tool_args_emitted[ordinal] - start
+        if skip >= len(arguments):
+            return None
+
+        self._tool_args_emitted[ordinal] = self._tool_args_seen[ordinal]
+        if skip <= 0:
+            return event
+        return replace(
+            event,
+            tool_call_delta=ToolCallDelta(
+                call_id=event.tool_call_delta.call_id,
+                name=event.tool_call_delta.name,
+                arguments_delta=arguments[skip:],
+                arguments=event.tool_call_delta.arguments,
+            ),
+        )
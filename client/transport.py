@@ -0,0 +1,123 @@
+import asyncio
+import importlib.util
+import logging
+import httpx
+from openai import DefaultAsyncHttpxClient
+from common.helpers.environment_helper import EnvironmentHelper as Env
+from common.constants.environment_constants import EnvironmentConstants
+from common.constants.http_constants import HttpConstants
+
+logger = logging.getLogger(__name__)
+
+# One pooled client per event loop: every LLMClient in the process shares its
+# keep-alive connections instead of paying a fresh TCP+TLS handshake per Agent.
+_shared_client: httpx.AsyncClient | None = None
+_shared_loop: asyncio.AbstractEventLoop | None = None
+_shared_closer: asyncio.Task | None = None
+# Clients replaced after their loop stopped; closed by close_shared_http_client().
+_retired: list[httpx.AsyncClient] = []
+
+
+def _http2_enabled() -> bool:
+    wanted = Env.get_env_variable(
+        EnvironmentConstants.HTTP2_ENABLED, HttpConstants.HTTP2_ENABLED
+    )
+    if wanted and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP2_ENABLED is set but the 'h2' package is not installed; using HTTP/1.1")
+        return False
+    return bool(wanted)
+
+
+def _build_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=Env.get_env_variable(
+            EnvironmentConstants.HTTP_MAX_CONNECTIONS, HttpConstants.MAX_CONNECTIONS
+        ),
+        max_keepalive_connections=Env.get_env_variable(
+            EnvironmentConstants.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            HttpConstants.MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        keepalive_expiry=Env.get_env_variable(
+            EnvironmentConstants.HTTP_KEEPALIVE_EXPIRY,
+            HttpConstants.KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+    timeout = httpx.Timeout(
+        Env.get_env_variable(
+            EnvironmentConstants.HTTP_READ_TIMEOUT, HttpConstants.READ_TIMEOUT_SECONDS
+        ),
+        connect=Env.get_env_variable(
+            EnvironmentConstants.HTTP_CONNECT_TIMEOUT,
+            HttpConstants.CONNECT_TIMEOUT_SECONDS,
+        ),
+    )
+    return DefaultAsyncHttpxClient(limits=limits, timeout=timeout, http2=_http2_enabled())
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    global _shared_client, _shared_loop, _shared_closer
+
+    loop = asyncio.get_running_loop()
+    if _shared_client is None or _shared_client.is_closed or _shared_loop is not loop:
+        if _shared_client is not None and not _shared_client.is_closed:
+            _retire(_shared_client, _shared_loop)
+        # Pooled connections are bound to the loop that opened them.
+        _shared_client = _build_client()
+        _shared_loop = loop
+        # asyncio.run() cancels leftover tasks before closing its loop, which
+        # closes the pool while the loop that owns its sockets can still do it.
+        _shared_closer = loop.create_task(_close_when_cancelled(_shared_client))
+
+    return _shared_client
+
+
+async def _close_when_cancelled(client: httpx.AsyncClient) -> None:
+    try:
+        await asyncio.Future()
+    finally:
+        if not client.is_closed:
+            await client.aclose()
+
+
+def _retire(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None) -> None:
+    if loop is not None and loop.is_running():
+        # Still serving another thread: close the pool there.
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+    else:
+        _retired.append(client)
+
+
+async def warm_up(base_url: str | None) -> None:
+    if not base_url:
+        return
+
+    client = get_shared_http_client()
+    try:
+        # Any response will do: the point is to leave a TLS connection in the pool.
+        await client.head(base_url, timeout=HttpConstants.WARM_UP_TIMEOUT_SECONDS)
+    except httpx.HTTPError as e:
+        logger.debug(f"Transport warm-up to {base_url} failed: {e}")
+
+
+async def close_shared_http_client() -> None:
+    global _shared_client, _shared_loop, _shared_closer
+
+    loop = asyncio.get_running_loop()
+    if _shared_client is not None and not _shared_client.is_closed:
+        if _shared_loop is loop:
+            await _shared_client.aclose()
+        else:
+            _retire(_shared_client, _shared_loop)
+    if _shared_closer is not None and _shared_loop is loop:
+        _shared_closer.cancel()
+    _shared_client = None
+    _shared_loop = None
+    _shared_closer = None
+
+    retired, _retired[:] = list(_retired), []
+    for client in retired:
+        try:
+            await client.aclose()
+        except RuntimeError as e:
+            # Its loop is closed, so the sockets cannot be released from here.
+            logger.debug(f"Could not close a stale HTTP client: {e}")
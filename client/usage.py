@@ -0,0 +1,159 @@
+from __future__ import annotations
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any
+from client.response import TokenUsage
+from utils.metrics import get_metrics
+from common.helpers.environment_helper import EnvironmentHelper as Env
+from common.constants.environment_constants import EnvironmentConstants
+from common.constants.usage_constants import UsageConstants
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class UsagePricing:
+    input_per_mtok: float = 0.0
+    cached_input_per_mtok: float = 0.0
+    output_per_mtok: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> UsagePricing:
+        return cls(
+            input_per_mtok=Env.get_env_variable(
+                EnvironmentConstants.USAGE_PRICE_INPUT_PER_MTOK,
+                UsageConstants.PRICE_INPUT_PER_MTOK,
+            ),
+            cached_input_per_mtok=Env.get_env_variable(
+                EnvironmentConstants.USAGE_PRICE_CACHED_INPUT_PER_MTOK,
+                UsageConstants.PRICE_CACHED_INPUT_PER_MTOK,
+            ),
+            output_per_mtok=Env.get_env_variable(
+                EnvironmentConstants.USAGE_PRICE_OUTPUT_PER_MTOK,
+                UsageConstants.PRICE_OUTPUT_PER_MTOK,
+            ),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.input_per_mtok or self.cached_input_per_mtok or self.output_per_mtok)
+
+    def cost(self, usage: TokenUsage) -> float:
+        # cached_tokens is a subset of prompt_tokens, billed at its own rate.
+        uncached = max(0, usage.prompt_tokens - usage.cached_tokens)
+        return (
+            uncached * self.input_per_mtok
+            + usage.cached_tokens * self.cached_input_per_mtok
+            + usage.completion_tokens * self.output_per_mtok
+        ) / 1_000_000
+
+
+@dataclass(slots=True)
+class UsageTotals:
+    requests: int = 0
+    usage: TokenUsage = field(default_factory=TokenUsage)
+    cost: float = 0.0
+
+    def add(self, usage: TokenUsage, cost: float = 0.0) -> None:
+        self.requests += 1
+        self.usage = self.usage + usage
+        self.cost += cost
+
+    @property
+    def cached_ratio(self) -> float:
+        # Share of prompt tokens served from the provider's prefix cache.
+        if not self.usage.prompt_tokens:
+            return 0.0
+        return self.usage.cached_tokens / self.usage.prompt_tokens
+
+    def snapshot(self) -> UsageTotals:
+        return replace(self)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            **asdict(self.usage),
+            "cached_ratio": round(self.cached_ratio, 4),
+            "cost": round(self.cost, 6),
+        }
+
+
+class UsageLedger:
+    # Process-wide usage totals, with one JSONL line appended per request.
+    def __init__(self, path: str | Path | None = None, pricing: UsagePricing | None = None) -> None:
+        enabled = Env.get_env_variable(
+            EnvironmentConstants.USAGE_LOG_ENABLED, UsageConstants.LOG_ENABLED
+        )
+        path = path or Env.get_env_variable(
+            EnvironmentConstants.USAGE_LOG_PATH, UsageConstants.LOG_PATH
+        )
+        self.path = Path(path) if enabled and path else None
+        self.pricing = pricing or UsagePricing.from_env()
+        self.totals = UsageTotals()
+        self._lock = threading.Lock()
+
+    async def record(
+        self,
+        usage: TokenUsage,
+        session: UsageTotals,
+        session_id: str,
+        model: str | None = None,
+    ) -> tuple[UsageTotals, UsageTotals]:
+        # Adds one request's usage to the session and process totals; returns
+        # snapshots of both.
+        cost = self.pricing.cost(usage) if self.pricing.enabled else 0.0
+        with self._lock:
+            session.add(usage, cost)
+            self.totals.add(usage, cost)
+            session_totals, process_totals = session.snapshot(), self.totals.snapshot()
+
+        metrics = get_metrics()
+        metrics.increment("llm_tokens_total", usage.prompt_tokens, kind="prompt")
+        metrics.increment("llm_tokens_total", usage.cached_tokens, kind="cached")
+        metrics.increment("llm_tokens_total", usage.completion_tokens, kind="completion")
+
+        if self.path is not None:
+            # Blocking file I/O; kept off the event loop.
+            await asyncio.to_thread(
+                self._append,
+                {
+                    "at": time.time(),
+                    "session_id": session_id,
+                    "model": model,
+                    **asdict(usage),
+                    "cost": round(cost, 6),
+                    "session": session_totals.to_dict(),
+                },
+            )
+        return session_totals, process_totals
+
+    def _append(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record) + "\n"
+        try:
+            with self._lock:
+                if self.path is None:
+                    return
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+        except OSError as e:
+            # Accounting must never fail a request.
+            logger.warning(f"Could not write usage log {self.path}: {e}")
+            self.path = None
+
+
+_ledger: UsageLedger | None = None
+_ledger_lock = threading.Lock()
+
+
+def get_usage_ledger() -> UsageLedger:
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = UsageLedger()
+        return _ledger
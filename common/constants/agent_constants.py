@@ -0,0 +1,3 @@
+class AgentConstants:
+    # LLM round trips allowed per user message before the loop gives up.
+    MAX_TURNS: int = 25
@@ -0,0 +1,5 @@
+class BatchConstants:
+    CONCURRENCY: int = 4
+    # Parsed items buffered ahead of the workers, per worker.
+    QUEUE_DEPTH_PER_WORKER: int = 2
+    PROMPT_KEYS: tuple[str, ...] = ("prompt", "message", "input")
@@ -0,0 +1,10 @@
+class ContextConstants:
+    DEFAULT_CONTEXT_WINDOW: int = 128000
+    # Per-message framing the chat format adds around role and content.
+    MESSAGE_OVERHEAD_TOKENS: int = 4
+    # Tokens the provider adds to prime the assistant reply.
+    REPLY_PRIMING_TOKENS: int = 3
+    # Fraction of the context window at which older turns get summarized.
+    COMPACTION_THRESHOLD: float = 0.8
+    KEEP_RECENT_TURNS: int = 4
+    SUMMARY_PREFIX: str = "[Summary of earlier conversation]"
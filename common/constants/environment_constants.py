@@ -2,3 +2,39 @@ class EnvironmentConstants:
     OPEN_ROUTER_API_KEY: str = "OPEN_ROUTER_API_KEY"
     OPEN_ROUTER_BASE_URL: str = "OPEN_ROUTER_BASE_URL"
     DEFAULT_MODEL_NAME: str = "DEFAULT_MODEL_NAME"
+    MODEL_CONTEXT_WINDOW: str = "MODEL_CONTEXT_WINDOW"
+    CONTEXT_COMPACTION_THRESHOLD: str = "CONTEXT_COMPACTION_THRESHOLD"
+    CONTEXT_KEEP_RECENT_TURNS: str = "CONTEXT_KEEP_RECENT_TURNS"
+    TOOL_MAX_CONCURRENCY: str = "TOOL_MAX_CONCURRENCY"
+    TOOL_CALL_TIMEOUT: str = "TOOL_CALL_TIMEOUT"
+    LINE_INDEX_CACHE_DIR: str = "LINE_INDEX_CACHE_DIR"
+    READ_CACHE_MAX_BYTES: str = "READ_CACHE_MAX_BYTES"
+    HTTP_MAX_CONNECTIONS: str = "HTTP_MAX_CONNECTIONS"
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: str = "HTTP_MAX_KEEPALIVE_CONNECTIONS"
+    HTTP_KEEPALIVE_EXPIRY: str = "HTTP_KEEPALIVE_EXPIRY"
+    HTTP_CONNECT_TIMEOUT: str = "HTTP_CONNECT_TIMEOUT"
+    HTTP_READ_TIMEOUT: str = "HTTP_READ_TIMEOUT"
+    HTTP2_ENABLED: str = "HTTP2_ENABLED"
+    LLM_MAX_RETRIES: str = "LLM_MAX_RETRIES"
+    LLM_REQUEST_DEADLINE: str = "LLM_REQUEST_DEADLINE"
+    LLM_REQUESTS_PER_MINUTE: str = "LLM_REQUESTS_PER_MINUTE"
+    LLM_TOKENS_PER_MINUTE: str = "LLM_TOKENS_PER_MINUTE"
+    LLM_RESPONSE_CACHE: str = "LLM_RESPONSE_CACHE"
+    LLM_RESPONSE_CACHE_PATH: str = "LLM_RESPONSE_CACHE_PATH"
+    TUI_FRAME_RATE: str = "TUI_FRAME_RATE"
+    TUI_FLUSH_THRESHOLD: str = "TUI_FLUSH_THRESHOLD"
+    TUI_MARKDOWN: str = "TUI_MARKDOWN"
+    AGENT_MAX_TURNS: str = "AGENT_MAX_TURNS"
+    BATCH_CONCURRENCY: str = "BATCH_CONCURRENCY"
+    GREP_INDEX_ENABLED: str = "GREP_INDEX_ENABLED"
+    GREP_INDEX_WORKERS: str = "GREP_INDEX_WORKERS"
+    WORKSPACE_SCAN_WORKERS: str = "WORKSPACE_SCAN_WORKERS"
+    TOOL_TURN_OUTPUT_TOKENS: str = "TOOL_TURN_OUTPUT_TOKENS"
+    TOOL_OUTPUT_STORE_MAX_BYTES: str = "TOOL_OUTPUT_STORE_MAX_BYTES"
+    METRICS_JSONL_PATH: str = "METRICS_JSONL_PATH"
+    METRICS_PROMETHEUS_PATH: str = "METRICS_PROMETHEUS_PATH"
+    USAGE_LOG_ENABLED: str = "USAGE_LOG_ENABLED"
+    USAGE_LOG_PATH: str = "USAGE_LOG_PATH"
+    USAGE_PRICE_INPUT_PER_MTOK: str = "USAGE_PRICE_INPUT_PER_MTOK"
+    USAGE_PRICE_CACHED_INPUT_PER_MTOK: str = "USAGE_PRICE_CACHED_INPUT_PER_MTOK"
+    USAGE_PRICE_OUTPUT_PER_MTOK: str = "USAGE_PRICE_OUTPUT_PER_MTOK"
@@ -1,2 +1,3 @@
 class ErrorConstants:
     UNKNOWN_ERROR_MESSAGE = "Unknown error occurred"
+    MAX_TURNS_REACHED_MESSAGE = "Stopped after reaching the maximum of {max_turns} agent turns"
@@ -0,0 +1,11 @@
+class GrepConstants:
+    INDEX_ENABLED: bool = True
+    # Files above this are not indexed; they are always scanned as candidates.
+    INDEX_MAX_FILE_SIZE: int = 2 * 1024 * 1024
+    # Files per worker task; small enough to bound exit latency, large enough to amortize IPC.
+    INDEX_BATCH_SIZE: int = 64
+    # Below this many files a build is done in-process instead of in the pool.
+    INDEX_POOL_MIN_FILES: int = 2000
+    BINARY_SNIFF_BYTES: int = 8192
+    MAX_RESULTS: int = 100
+    MAX_LINE_LENGTH: int = 500
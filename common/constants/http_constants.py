@@ -0,0 +1,8 @@
+class HttpConstants:
+    MAX_CONNECTIONS: int = 100
+    MAX_KEEPALIVE_CONNECTIONS: int = 20
+    KEEPALIVE_EXPIRY_SECONDS: float = 120.0
+    CONNECT_TIMEOUT_SECONDS: float = 10.0
+    READ_TIMEOUT_SECONDS: float = 600.0
+    HTTP2_ENABLED: bool = False
+    WARM_UP_TIMEOUT_SECONDS: float = 5.0
@@ -0,0 +1,4 @@
+class LineIndexConstants:
+    MAX_MEMORY_BYTES: int = 64 * 1024 * 1024
+    SCAN_CHUNK_SIZE: int = 1024 * 1024
+    SIDECAR_SUFFIX: str = ".lineidx"
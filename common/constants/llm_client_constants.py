@@ -1,2 +1,6 @@
 class LLMClientConstants:
-    MAX_RETRIES: int = 3
\ No newline at end of file
+    MAX_RETRIES: int = 3
+    RETRY_BASE_DELAY_SECONDS: float = 1.0
+    RETRY_MAX_DELAY_SECONDS: float = 60.0
+    # Wall-clock budget for one chat_completion call, retries included.
+    REQUEST_DEADLINE_SECONDS: float = 300.0
@@ -0,0 +1,10 @@
+class MetricsConstants:
+    # Upper bounds in seconds, Prometheus-style (a +Inf bucket is implied).
+    HISTOGRAM_BUCKETS: tuple[float, ...] = (
+        0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+        0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+    )
+    # Recent observations kept per histogram for the CLI summary's percentiles.
+    SUMMARY_SAMPLES: int = 2048
+    # Span lines buffered by the JSONL exporter before one write off the event loop.
+    JSONL_FLUSH_LINES: int = 64
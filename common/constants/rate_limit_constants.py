@@ -0,0 +1,8 @@
+class RateLimitConstants:
+    # 0 disables an axis until the provider's rate-limit headers reveal a limit.
+    REQUESTS_PER_MINUTE: int = 0
+    TOKENS_PER_MINUTE: int = 0
+    # Multiplicative decrease on 429, additive recovery per successful request.
+    DECREASE_FACTOR: float = 0.5
+    RECOVERY_FRACTION: float = 0.05
+    MIN_RATE_FRACTION: float = 0.1
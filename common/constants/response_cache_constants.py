@@ -0,0 +1,5 @@
+class ResponseCacheConstants:
+    BACKEND_MEMORY: str = "memory"
+    BACKEND_SQLITE: str = "sqlite"
+    MEMORY_MAX_ENTRIES: int = 256
+    SQLITE_PATH: str = ".mx-card/response_cache.sqlite3"
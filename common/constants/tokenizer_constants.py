@@ -0,0 +1,5 @@
+class TokenizerConstants:
+    FALLBACK_ENCODING: str = "cl100k_base"
+    CACHE_SIZE: int = 8
+    BATCH_THREADS: int = 8
+    BATCH_MIN_SIZE: int = 4
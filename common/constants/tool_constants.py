@@ -0,0 +1,10 @@
+class ToolConstants:
+    MAX_CONCURRENCY: int = 8
+    CALL_TIMEOUT_SECONDS: float = 120.0
+    READ_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    # Shared by every tool result of one model turn; split max-min fairly.
+    TURN_OUTPUT_TOKENS: int = 40000
+    # A result is never cut below this, even when many calls share the budget.
+    MIN_EXCERPT_TOKENS: int = 512
+    OUTPUT_STORE_MAX_BYTES: int = 32 * 1024 * 1024
+    FETCH_OUTPUT_MAX_TOKENS: int = 10000
@@ -0,0 +1,5 @@
+class TUIConstants:
+    FRAME_RATE: float = 30.0
+    # Flush early once this many characters are buffered, whatever the frame clock says.
+    FLUSH_THRESHOLD_CHARS: int = 4096
+    MARKDOWN_ENABLED: bool = False
@@ -0,0 +1,8 @@
+class UsageConstants:
+    # Opt-in (USAGE_LOG_ENABLED): the log lands in whatever directory the agent runs in.
+    LOG_ENABLED: bool = False
+    LOG_PATH: str = ".mx-card/usage.jsonl"
+    # USD per million tokens; all zero means no cost is reported.
+    PRICE_INPUT_PER_MTOK: float = 0.0
+    PRICE_CACHED_INPUT_PER_MTOK: float = 0.0
+    PRICE_OUTPUT_PER_MTOK: float = 0.0
@@ -0,0 +1,24 @@
+class WorkspaceConstants:
+    # Threads only pay off when listings hit the disk (cold cache, network
+    # filesystems); with a warm cache the hand-offs cost more than one thread.
+    SCAN_WORKERS: int = 1
+    # Snapshots younger than this are served without re-statting directories.
+    REFRESH_INTERVAL_SECONDS: float = 1.0
+    # Never listed, whatever .gitignore says.
+    ALWAYS_IGNORED: frozenset[str] = frozenset(
+        {
+            ".git",
+            ".hg",
+            ".svn",
+            ".mx-card",
+            "__pycache__",
+        }
+    )
+    # Snapshots kept for reuse (one per working directory in practice).
+    MAX_CACHED_TREES: int = 4
+    # Directories outside the snapshot (outside cwd, or ignored) are walked per
+    # call and never cached, so glob and grep over them stop at these bounds.
+    UNCACHED_WALK_MAX_DEPTH: int = 8
+    UNCACHED_WALK_MAX_ENTRIES: int = 20000
+    GLOB_MAX_RESULTS: int = 200
+    LIST_DIR_MAX_ENTRIES: int = 500
@@ -1,23 +1,42 @@
+from __future__ import annotations
+import json
+import logging
 from dataclasses import dataclass
-from typing import Any
-from prompts.system import get_system_prompt
-from utils.text import count_tokens
+from typing import TYPE_CHECKING, Any
+from client.rate_limiter import Priority
+from client.response import StreamEventType, TokenUsage, ToolCall
+from prompts.system import get_compression_prompt, get_system_prompt
+from utils.text import count_tokens, count_tokens_batch
 from common.helpers.environment_helper import EnvironmentHelper as EnvHelper
+from common.constants.context_constants import ContextConstants
 from common.constants.environment_constants import EnvironmentConstants as EnvConst
 
+if TYPE_CHECKING:
+    from client.llm_client import LLMClient
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class MessageItem:
     role: str
     content: str
     token_count: int | None = None
+    tool_calls: list[dict[str, Any]] | None = None
+    tool_call_id: str | None = None
 
     def to_dict(self) -> dict[str, Any]:
         result: dict[str, Any] = {"role": self.role}
 
-        if self.content:
+        if self.content or self.role == "tool":
             result["content"] = self.content
 
+        if self.tool_calls:
+            result["tool_calls"] = self.tool_calls
+
+        if self.tool_call_id:
+            result["tool_call_id"] = self.tool_call_id
+
         return result
 
 
@@ -25,7 +44,24 @@ class ContextManager:
     def __init__(self) -> None:
         self._system_prompt = get_system_prompt()
         self._model_name = EnvHelper.get_env_variable(EnvConst.DEFAULT_MODEL_NAME) or ""
+        self._context_window = EnvHelper.get_env_variable(
+            EnvConst.MODEL_CONTEXT_WINDOW, ContextConstants.DEFAULT_CONTEXT_WINDOW
+        )
+        self._compaction_threshold = EnvHelper.get_env_variable(
+            EnvConst.CONTEXT_COMPACTION_THRESHOLD, ContextConstants.COMPACTION_THRESHOLD
+        )
+        self._keep_recent_turns = EnvHelper.get_env_variable(
+            EnvConst.CONTEXT_KEEP_RECENT_TURNS, ContextConstants.KEEP_RECENT_TURNS
+        )
         self._messages: list[MessageItem] = []
+        self._compacting = False
+
+        # Running ledger, kept in sync on every append so budget queries are O(1).
+        # The system prompt is counted on first query so construction never waits
+        # on the tokenizer.
+        self._system_prompt_tokens: int | None = None
+        self._message_tokens = 0
+        self._tool_schema_tokens = 0
 
     def add_user_message(self, content: str) -> None:
         item = MessageItem(
@@ -34,16 +70,117 @@ class ContextManager:
             token_count=count_tokens(content, self._model_name),
         )
 
-        self._messages.append(item)
+        self._append(item)
+
+    def add_assistant_message(
+        self, content: str, tool_calls: list[ToolCall] | None = None
+    ) -> None:
+        wire_calls = [
+            {
+                "id": call.call_id,
+                "type": "function",
+                "function": {
+                    "name": call.name or "",
+                    "arguments": json.dumps(call.arguments or {}),
+                },
+            }
+            for call in tool_calls or []
+        ]
+
+        token_count = count_tokens(content, self._model_name) if content else 0
+        if wire_calls:
+            token_count += count_tokens(json.dumps(wire_calls), self._model_name)
 
-    def add_assistant_message(self, content: str) -> None:
         item = MessageItem(
             role="assistant",
             content=content or "",
-            token_count=count_tokens(content, self._model_name),
+            token_count=token_count,
+            tool_calls=wire_calls or None,
         )
 
-        self._messages.append(item)
+        self._append(item)
+
+    def add_tool_results(self, results: list[tuple[str, str]]) -> None:
+        # One batch per turn: a multi-call turn can carry several large outputs.
+        counts = count_tokens_batch([content for _, content in results], self._model_name)
+        for (tool_call_id, content), token_count in zip(results, counts):
+            self._append(
+                MessageItem(
+                    role="tool",
+                    content=content,
+                    token_count=token_count,
+                    tool_call_id=tool_call_id,
+                )
+            )
+
+    def set_tool_schema_tokens(self, token_count: int) -> None:
+        self._tool_schema_tokens = token_count
+
+    @property
+    def message_tokens(self) -> int:
+        return self._message_tokens
+
+    @property
+    def prompt_tokens(self) -> int:
+        return (
+            self._get_system_prompt_tokens()
+            + self._message_tokens
+            + self._tool_schema_tokens
+            + ContextConstants.REPLY_PRIMING_TOKENS
+        )
+
+    def headroom(self, model_context_window: int | None = None) -> int:
+        window = model_context_window or self._context_window
+        return window - self.prompt_tokens
+
+    def needs_compaction(self) -> bool:
+        if self._compacting:
+            return False
+
+        if self.prompt_tokens < self._context_window * self._compaction_threshold:
+            return False
+
+        return self._compaction_cut() > 0
+
+    async def compact(self, client: LLMClient) -> tuple[bool, TokenUsage | None]:
+        # Returns whether the context was compacted, and the summary request's
+        # usage, which is spent even when the summary ends up discarded.
+        if self._compacting:
+            return False, None
+
+        cut = self._compaction_cut()
+        if cut <= 0:
+            return False, None
+
+        self._compacting = True
+        try:
+            # New messages may be appended while the summary is generated; only the
+            # snapshotted prefix is replaced, and only if it is still intact.
+            snapshot = self._messages[:cut]
+            summary, usage = await self._summarize(client, snapshot)
+            if not summary:
+                return False, usage
+
+            if self._messages[:cut] != snapshot:
+                logger.debug("Context changed during compaction; discarding summary")
+                return False, usage
+
+            # The assistant role keeps roles alternating: the first retained
+            # message is always a user turn.
+            content = f"{ContextConstants.SUMMARY_PREFIX}\n\n{summary}"
+            item = MessageItem(
+                role="assistant",
+                content=content,
+                token_count=count_tokens(content, self._model_name),
+            )
+            self._messages[:cut] = [item]
+            self._message_tokens += self._item_tokens(item) - sum(
+                self._item_tokens(old) for old in snapshot
+            )
+            logger.debug(f"Compacted {len(snapshot)} messages into a summary")
+            return True, usage
+        finally:
+            self._compacting = False
 
     def get_messages(self) -> list[dict[str, Any]]:
         messages = []
@@ -55,3 +192,66 @@ class ContextManager:
             messages.append(item.to_dict())
 
         return messages
+
+    def _append(self, item: MessageItem) -> None:
+        self._messages.append(item)
+        self._message_tokens += self._item_tokens(item)
+
+    def _compaction_cut(self) -> int:
+        turn_starts = [
+            idx
+            for idx, item in enumerate(self._messages)
+            if item.role == "user"
+        ]
+
+        if len(turn_starts) <= self._keep_recent_turns:
+            return 0
+
+        if self._keep_recent_turns > 0:
+            cut = turn_starts[-self._keep_recent_turns]
+        else:
+            cut = len(self._messages)
+
+        # A lone summary in front of the kept turns has nothing left to fold in.
+        if cut == 1 and self._messages[0].content.startswith(ContextConstants.SUMMARY_PREFIX):
+            return 0
+
+        return cut
+
+    async def _summarize(
+        self, client: LLMClient, items: list[MessageItem]
+    ) -> tuple[str, TokenUsage | None]:
+        messages: list[dict[str, Any]] = []
+        if self._system_prompt:
+            messages.append({"role": "system", "content": self._system_prompt})
+        messages.extend(item.to_dict() for item in items)
+        messages.append({"role": "user", "content": get_compression_prompt()})
+
+        parts: list[str] = []
+        usage: TokenUsage | None = None
+        async for event in client.chat_completion(
+            messages, stream=False, priority=Priority.BATCH
+        ):
+            if event.type == StreamEventType.ERROR:
+                logger.warning(f"Context compaction failed: {event.error}")
+                return "", usage
+            if event.text_delta is not None:
+                parts.append(event.text_delta.content)
+            if event.usage is not None:
+                usage = event.usage
+
+        return "".join(parts).strip(), usage
+
+    def _get_system_prompt_tokens(self) -> int:
+        if self._system_prompt_tokens is None:
+            self._system_prompt_tokens = 0
+            if self._system_prompt:
+                self._system_prompt_tokens = (
+                    count_tokens(self._system_prompt, self._model_name)
+                    + ContextConstants.MESSAGE_OVERHEAD_TOKENS
+                )
+        return self._system_prompt_tokens
+
+    @staticmethod
+    def _item_tokens(item: MessageItem) -> int:
+        return (item.token_count or 0) + ContextConstants.MESSAGE_OVERHEAD_TOKENS
@@ -1,25 +1,89 @@
+from __future__ import annotations
 import sys
+import time
 import click
 import asyncio
 
-from agent.agent import Agent
-from agent.events import AgentEventType
-from ui.tui import TUI, get_console
+from typing import TYPE_CHECKING, TextIO
+from dotenv import load_dotenv
+from common.constants.environment_constants import EnvironmentConstants
+from common.helpers.environment_helper import EnvironmentHelper as Env
 
-console = get_console()
+# The agent stack (openai, pydantic, tiktoken, rich) is imported on first use so
+# argument parsing and --help never pay for it.
+if TYPE_CHECKING:
+    from agent.agent import Agent
+    from agent.batch import BatchResult
+    from ui.tui import TUI
+    from utils.metrics import Metrics
 
 
 class CLI:
     def __init__(self):
         self.agent: Agent | None = None
-        self.tui = TUI()
+        self._tui: TUI | None = None
+
+    @property
+    def tui(self) -> TUI:
+        if self._tui is None:
+            from ui.tui import TUI
+
+            self._tui = TUI()
+        return self._tui
+
+    @tui.setter
+    def tui(self, tui: TUI) -> None:
+        self._tui = tui
 
     async def run_single(self, message: str) -> str | None:
-        async with Agent() as agent:
-            self.agent = agent
-            return await self._process_message(message)
+        from agent.agent import Agent
+        from client.transport import close_shared_http_client
+
+        try:
+            async with Agent() as agent:
+                self.agent = agent
+                return await self._process_message(message)
+        finally:
+            await close_shared_http_client()
+
+    async def run_batch(
+        self,
+        source: TextIO,
+        sink: TextIO,
+        concurrency: int | None = None,
+        resume_from: int = 0,
+    ) -> bool:
+        from agent.batch import BatchRunner
+        from client.transport import close_shared_http_client
+
+        runner = BatchRunner(concurrency)
+
+        def report(result: BatchResult) -> None:
+            status = "error" if result.error else "ok"
+            click.echo(
+                f"[{result.index}] {status} in {result.latency_ms:.0f} ms",
+                err=True,
+            )
+
+        try:
+            summary = await runner.run(source, sink, resume_from, on_result=report)
+        finally:
+            await close_shared_http_client()
+
+        usage = summary.usage
+        cached_ratio = usage.cached_tokens / usage.prompt_tokens if usage.prompt_tokens else 0.0
+        click.echo(
+            f"Batch finished: {summary.completed} ok, {summary.failed} failed, "
+            f"{summary.skipped} skipped in {summary.elapsed_seconds:.1f}s "
+            f"({usage.prompt_tokens} prompt / {usage.completion_tokens} completion tokens, "
+            f"{cached_ratio:.0%} of prompt tokens cached)",
+            err=True,
+        )
+        return summary.failed == 0
 
     async def _process_message(self, message: str) -> str | None:
+        from agent.events import AgentEventType
+
         if not self.agent:
             return None
 
@@ -28,32 +92,181 @@ class CLI:
 
         async for event in self.agent.run(message):
             if event.type == AgentEventType.TEXT_DELTA:
-                content = event.data.get("content", "")
+                content = event.content or ""
                 if not assistant_streaming:
                     assistant_streaming = True
                     self.tui.begin_assistant()
                 self.tui.stream_assistant_delta(content)
             elif event.type == AgentEventType.TEXT_COMPLETE:
-                final_response = event.data.get("content", "")
+                final_response = event.content or ""
                 if assistant_streaming:
                     assistant_streaming = False
                     self.tui.end_assistant()
+            elif event.type == AgentEventType.TOOL_CALL_START and event.tool_call:
+                if assistant_streaming:
+                    assistant_streaming = False
+                    self.tui.end_assistant()
+                self.tui.tool_call_start(
+                    event.tool_call.name or "", event.tool_call.arguments or {}
+                )
+            elif event.type == AgentEventType.TOOL_CALL_COMPLETE and event.tool_call:
+                result = event.tool_result
+                self.tui.tool_call_complete(
+                    event.tool_call.name or "",
+                    result.success if result else False,
+                    result.error if result else None,
+                )
             elif event.type == AgentEventType.AGENT_ERROR:
-                error = event.data.get("error", "Unknown error")
-                console.print(f"\n[error]Error: {error}[/error]")
+                assistant_streaming = False
+                self.tui.agent_error(event.error or "Unknown error")
+
+        if assistant_streaming:
+            self.tui.end_assistant()
 
         return final_response
 
 
 @click.command()
 @click.argument("prompt", required=False)
-def main(prompt: str | None = None):
+@click.option(
+    "--batch",
+    "batch_file",
+    type=click.File("r"),
+    help="Run prompts from a JSONL file ('-' for stdin) instead of a single prompt.",
+)
+@click.option(
+    "--output",
+    "output_file",
+    type=click.File("w"),
+    default="-",
+    show_default=True,
+    help="Where batch results are written as JSONL.",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of prompts a batch runs at once.",
+)
+@click.option(
+    "--resume-from",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Skip batch items before this 0-based offset (blank lines are not counted).",
+)
+@click.option(
+    "--profile-startup",
+    is_flag=True,
+    help="Print an import-time breakdown of startup to stderr.",
+)
+@click.option(
+    "--metrics-jsonl",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Append timing spans and a final metrics snapshot to this JSONL file.",
+)
+@click.option(
+    "--metrics-prometheus",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write metrics in Prometheus text format to this file on exit.",
+)
+@click.option(
+    "--metrics-summary",
+    is_flag=True,
+    help="Print a latency breakdown per stage to stderr on exit.",
+)
+def main(
+    prompt: str | None = None,
+    batch_file: TextIO | None = None,
+    output_file: TextIO | None = None,
+    concurrency: int | None = None,
+    resume_from: int = 0,
+    profile_startup: bool = False,
+    metrics_jsonl: str | None = None,
+    metrics_prometheus: str | None = None,
+    metrics_summary: bool = False,
+):
+    load_dotenv()
+    if profile_startup:
+        _profile_startup()
+
+    metrics = _configure_metrics(metrics_jsonl, metrics_prometheus, metrics_summary)
+    try:
+        _run(prompt, batch_file, output_file, concurrency, resume_from)
+    finally:
+        metrics.shutdown()
+
+
+def _run(
+    prompt: str | None,
+    batch_file: TextIO | None,
+    output_file: TextIO | None,
+    concurrency: int | None,
+    resume_from: int,
+) -> None:
+    # Decoding the BPE ranks is the slowest part of startup; it runs on a
+    # background thread while the agent stack imports.
+    from utils.text import prewarm_tokenizer
+
+    prewarm_tokenizer(Env.get_env_variable(EnvironmentConstants.DEFAULT_MODEL_NAME) or "")
+
+    # This entry point is import-safe, so large workspaces may be indexed in
+    # spawned worker processes.
+    from utils.trigram_index import enable_process_pool
+
+    enable_process_pool()
+
     cli = CLI()
     # messages = [{"role": "user", "content": prompt}]
-    if prompt:
+    if batch_file is not None:
+        ok = asyncio.run(cli.run_batch(batch_file, output_file, concurrency, resume_from))
+        if not ok:
+            sys.exit(1)
+    elif prompt:
         result = asyncio.run(cli.run_single(prompt))
         if result is None:
             sys.exit(1)
 
 
-main()
+def _configure_metrics(jsonl: str | None, prometheus: str | None, summary: bool) -> Metrics:
+    from utils.metrics import JsonlExporter, PrometheusExporter, SummaryExporter, get_metrics
+
+    metrics = get_metrics()
+    jsonl = jsonl or Env.get_env_variable(EnvironmentConstants.METRICS_JSONL_PATH)
+    prometheus = prometheus or Env.get_env_variable(EnvironmentConstants.METRICS_PROMETHEUS_PATH)
+    if jsonl:
+        metrics.add_exporter(JsonlExporter(jsonl))
+    if prometheus:
+        metrics.add_exporter(PrometheusExporter(prometheus))
+    if summary:
+        metrics.add_exporter(SummaryExporter(lambda line: click.echo(line, err=True)))
+    return metrics
+
+
+def _profile_startup() -> None:
+    from utils.startup import ImportProfiler
+    from utils.text import prewarm_tokenizer
+
+    started = time.perf_counter()
+    with ImportProfiler() as profiler:
+        prewarm = prewarm_tokenizer(
+            Env.get_env_variable(EnvironmentConstants.DEFAULT_MODEL_NAME) or ""
+        )
+        import agent.agent  # noqa: F401
+        import agent.batch  # noqa: F401
+        import ui.tui  # noqa: F401
+        imports_done = time.perf_counter()
+        prewarm.join()
+
+    for line in profiler.format_report():
+        click.echo(line, err=True)
+    click.echo(
+        f"agent stack imported in {(imports_done - started) * 1000:.1f} ms; "
+        f"tokenizer ready after {(time.perf_counter() - started) * 1000:.1f} ms",
+        err=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,13 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from pydantic import BaseModel, ValidationError
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from pydantic.json_schema import model_json_schema
 
+if TYPE_CHECKING:
+    from tools.output_store import OutputStore
+    from tools.read_cache import ReadCache
+
 
 class ToolKind(str, Enum):
     READ = "read"
@@ -34,11 +38,21 @@ class ToolResult:
     def success_result(cls, output: str = "", **kwargs: Any):
         return cls(success=True, output=output, error=None, **kwargs)
 
+    def to_model_output(self) -> str:
+        if self.success:
+            return self.output
+
+        if self.output:
+            return f"Error: {self.error}\n\n{self.output}"
+        return f"Error: {self.error}"
+
 
 @dataclass
 class ToolInvocation:
     params: dict[str, Any]
     cwd: Path
+    read_cache: ReadCache | None = None
+    output_store: OutputStore | None = None
 
 
 @dataclass
@@ -71,7 +85,7 @@ class Tool(abc.ABC):
                 schema(**params)
             except ValidationError as e:
                 errors = []
-                for error in errors:
+                for error in e.errors():
                     field = ".".join(str(x) for x in error.get("loc", []))
                     msg = error.get("msg", "Validation Error")
                     errors.append(f"Parameter '{field}': {msg}")
@@ -1,7 +1,11 @@
 from tools.base import Tool
+from tools.builtin.glob import GlobTool
+from tools.builtin.grep import GrepTool
+from tools.builtin.list_dir import ListDirTool
 from tools.builtin.read_file import ReadFileTool
+from tools.builtin.read_tool_output import ReadToolOutputTool
 
-__all__ = ["ReadFileTool"]
+__all__ = ["GlobTool", "GrepTool", "ListDirTool", "ReadFileTool", "ReadToolOutputTool"]
 
 def get_all_builtin_tools() -> list[type[Tool]]:
-    return [ReadFileTool]
\ No newline at end of file
+    return [ReadFileTool, GrepTool, GlobTool, ListDirTool, ReadToolOutputTool]
\ No newline at end of file
@@ -0,0 +1,114 @@
+import asyncio
+import os
+import re
+from pathlib import Path
+from pydantic import BaseModel, Field
+from tools.base import Tool, ToolInvocation, ToolKind, ToolResult
+from utils.paths import resolve_path
+from utils.workspace_tree import UncachedWalk, WorkspaceTree, get_workspace_tree, glob_to_regex
+from common.constants.workspace_constants import WorkspaceConstants
+
+
+class GlobParams(BaseModel):
+    pattern: str = Field(
+        ...,
+        description="Glob pattern relative to path, e.g. '**/*.py' or 'src/*.ts'. '**' matches across directories",
+    )
+
+    path: str = Field(
+        ".",
+        description="Directory to search from (relative to working directory or absolute path)",
+    )
+
+    max_results: int = Field(
+        WorkspaceConstants.GLOB_MAX_RESULTS,
+        ge=1,
+        description=f"Maximum number of paths to return. Defaults to {WorkspaceConstants.GLOB_MAX_RESULTS}",
+    )
+
+
+class GlobTool(Tool):
+    name = "glob"
+    description = (
+        "Find files by name pattern. Returns matching file paths, sorted. "
+        "Files ignored by .gitignore are skipped."
+    )
+    kind = ToolKind.READ
+
+    schema: type[BaseModel] = GlobParams
+
+    async def execute(self, invocation: ToolInvocation) -> ToolResult:
+        params = GlobParams(**invocation.params)
+        base = resolve_path(invocation.cwd, params.path)
+        if not base.is_dir():
+            return ToolResult.error_result(f"Not a directory: {base}")
+
+        return await asyncio.to_thread(self._glob, base, params, invocation.cwd)
+
+    def _glob(self, base: Path, params: GlobParams, cwd: Path) -> ToolResult:
+        regex = glob_to_regex(params.pattern.removeprefix("./"))
+        resolved = resolve_tree(base, cwd)
+        if resolved is None:
+            return self._glob_uncached(base, regex, params, cwd)
+
+        tree, relative = resolved
+        skip = len(relative) + 1 if relative else 0
+        matches = sorted(
+            path for path in tree.iter_files(relative) if regex.match(path[skip:])
+        )
+        total = len(matches)
+        shown = [
+            os.path.relpath(os.path.join(tree.root, path), cwd)
+            for path in matches[: params.max_results]
+        ]
+
+        metadata = {"matches": total}
+        if not shown:
+            return ToolResult.success_result(
+                f"No files match {params.pattern!r}", metadata=metadata
+            )
+
+        output = "\n".join(shown)
+        truncated = total > params.max_results
+        if truncated:
+            output += f"\n... [{total - params.max_results} more matches not shown]"
+        return ToolResult.success_result(output, metadata=metadata, truncated=truncated)
+
+    def _glob_uncached(
+        self, base: Path, regex: re.Pattern, params: GlobParams, cwd: Path
+    ) -> ToolResult:
+        # No snapshot to count against: stop at the first match past the limit.
+        walk = UncachedWalk(base)
+        matches: list[str] = []
+        for path in walk:
+            if regex.match(path):
+                matches.append(path)
+                if len(matches) > params.max_results:
+                    break
+        truncated = len(matches) > params.max_results or walk.capped
+        shown = [
+            os.path.relpath(os.path.join(walk.root, path), cwd)
+            for path in sorted(matches[: params.max_results])
+        ]
+
+        metadata = {"matches": len(shown), "walk_capped": walk.capped}
+        if not shown:
+            output = f"No files match {params.pattern!r}"
+        else:
+            output = "\n".join(shown)
+        if len(matches) > params.max_results:
+            output += "\n... [more matches not shown]"
+        elif walk.capped:
+            output += "\n... [search stopped early: directory too large or too deep]"
+        return ToolResult.success_result(output, metadata=metadata, truncated=truncated)
+
+
+def resolve_tree(path: Path, cwd: Path) -> tuple[WorkspaceTree, str] | None:
+    # The working directory's snapshot and the path's place in it. None for
+    # paths outside it, or left out by .gitignore: a path asked for explicitly
+    # is still searched, by an UncachedWalk (only rules from inside it apply).
+    tree = get_workspace_tree(cwd)
+    relative = tree.relative(path)
+    if relative is None or not tree.has_dir(relative):
+        return None
+    return tree, relative
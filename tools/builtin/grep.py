@@ -0,0 +1,188 @@
+import asyncio
+import fnmatch
+import os
+import re
+from pathlib import Path
+from pydantic import BaseModel, Field
+from tools.base import Tool, ToolInvocation, ToolKind, ToolResult
+from tools.builtin.glob import resolve_tree
+from utils.paths import resolve_path
+from utils.trigram_index import get_trigram_index, required_literals
+from utils.workspace_tree import UncachedWalk
+from common.helpers.environment_helper import EnvironmentHelper as EnvH
+from common.constants.environment_constants import EnvironmentConstants as EnvC
+from common.constants.grep_constants import GrepConstants
+
+
+class GrepParams(BaseModel):
+    pattern: str = Field(
+        ...,
+        description="Regular expression to search for (Python re syntax). Matched per line.",
+    )
+
+    path: str = Field(
+        ".",
+        description="File or directory to search (relative to working directory or absolute path)",
+    )
+
+    include: str | None = Field(
+        None,
+        description="Only search files whose name matches this glob, e.g. '*.py'",
+    )
+
+    case_insensitive: bool = Field(
+        False,
+        description="Match without regard to case",
+    )
+
+    max_results: int = Field(
+        GrepConstants.MAX_RESULTS,
+        ge=1,
+        description=f"Maximum number of matching lines to return. Defaults to {GrepConstants.MAX_RESULTS}",
+    )
+
+
+class GrepTool(Tool):
+    name = "grep"
+    description = (
+        "Search file contents with a regular expression. Returns matching lines as "
+        "path:line: text. Use include to limit the search to file names matching a glob."
+    )
+    kind = ToolKind.READ
+
+    schema: type[BaseModel] = GrepParams
+
+    def __init__(self) -> None:
+        super().__init__()
+        # The index is built on first use (see _candidate_files), not on
+        # construction: registering the tool must not start any work.
+        self._index_enabled = EnvH.get_env_variable(
+            EnvC.GREP_INDEX_ENABLED, GrepConstants.INDEX_ENABLED
+        )
+
+    async def execute(self, invocation: ToolInvocation) -> ToolResult:
+        params = GrepParams(**invocation.params)
+        flags = re.MULTILINE | (re.IGNORECASE if params.case_insensitive else 0)
+        try:
+            regex = re.compile(params.pattern, flags)
+        except re.error as e:
+            return ToolResult.error_result(f"Invalid regular expression: {e}")
+
+        path = resolve_path(invocation.cwd, params.path)
+        if not path.exists():
+            return ToolResult.error_result(f"Path not found: {path}")
+
+        return await asyncio.to_thread(self._search, regex, path, params, invocation.cwd)
+
+    def _search(
+        self, regex: re.Pattern, path: Path, params: GrepParams, cwd: Path
+    ) -> ToolResult:
+        files, index_used, walk_capped = self._candidate_files(regex, path, cwd)
+        if params.include:
+            files = [f for f in files if fnmatch.fnmatch(os.path.basename(f), params.include)]
+        files.sort()
+
+        matches: list[str] = []
+        matched_files = 0
+        truncated = False
+        for file_path in files:
+            found = self._search_file(regex, file_path, params.max_results - len(matches))
+            if not found:
+                continue
+            matched_files += 1
+            display = self._display_path(file_path, cwd)
+            matches.extend(f"{display}:{line_no}: {text}" for line_no, text in found)
+            if len(matches) >= params.max_results:
+                truncated = True
+                break
+
+        metadata = {
+            "matches": len(matches),
+            "files_matched": matched_files,
+            "files_searched": len(files),
+            "index_used": index_used,
+        }
+        if walk_capped:
+            metadata["walk_capped"] = True
+        if not matches and not walk_capped:
+            return ToolResult.success_result(
+                f"No matches for {params.pattern!r}", metadata=metadata
+            )
+
+        output = "\n".join(matches) if matches else f"No matches for {params.pattern!r}"
+        if truncated:
+            output += f"\n... [stopped at {params.max_results} matches]"
+        elif walk_capped:
+            output += "\n... [search stopped early: directory too large or too deep]"
+        return ToolResult.success_result(
+            output, metadata=metadata, truncated=truncated or walk_capped
+        )
+
+    def _candidate_files(
+        self, regex: re.Pattern, path: Path, cwd: Path
+    ) -> tuple[list[str], bool, bool]:
+        # (files to search, whether the index chose them, whether a walk was capped)
+        if path.is_file():
+            return [str(path)], False, False
+
+        resolved = resolve_tree(path, cwd)
+        if resolved is None:
+            walk = UncachedWalk(path)
+            files = [os.path.join(walk.root, relative) for relative in walk]
+            return files, False, walk.capped
+
+        tree, relative = resolved
+        index = get_trigram_index(cwd) if self._index_enabled else None
+        if index is not None and tree.root == index.root:
+            index.start()
+            candidates = index.candidates(required_literals(regex.pattern, regex.flags))
+            if candidates is not None:
+                if relative:
+                    prefix = os.path.join(tree.root, relative) + os.sep
+                    candidates = [c for c in candidates if c.startswith(prefix)]
+                return candidates, True, False
+
+        # No index for this tree yet: scan every file in the workspace snapshot.
+        files = tree.iter_files(relative, max_age=0)
+        return [os.path.join(tree.root, path) for path in files], False, False
+
+    @staticmethod
+    def _search_file(regex: re.Pattern, file_path: str, limit: int) -> list[tuple[int, str]]:
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return []
+
+        if b"\0" in data[: GrepConstants.BINARY_SNIFF_BYTES]:
+            return []
+
+        text = data.decode("utf-8", errors="replace")
+        found: list[tuple[int, str]] = []
+        line_no = 1
+        scanned = 0
+        last_line_start = -1
+        for match in regex.finditer(text):
+            start = match.start()
+            line_start = text.rfind("\n", 0, start) + 1
+            if line_start == last_line_start:
+                continue
+            line_no += text.count("\n", scanned, line_start)
+            scanned = line_start
+            last_line_start = line_start
+
+            line_end = text.find("\n", start)
+            line = text[line_start : line_end if line_end != -1 else len(text)].rstrip("\r")
+            if len(line) > GrepConstants.MAX_LINE_LENGTH:
+                line = line[: GrepConstants.MAX_LINE_LENGTH] + "..."
+            found.append((line_no, line))
+            if len(found) >= limit:
+                break
+        return found
+
+    @staticmethod
+    def _display_path(file_path: str, cwd: Path) -> str:
+        try:
+            return os.path.relpath(file_path, cwd)
+        except ValueError:
+            return file_path
@@ -0,0 +1,59 @@
+import asyncio
+from pathlib import Path
+from pydantic import BaseModel, Field
+from tools.base import Tool, ToolInvocation, ToolKind, ToolResult
+from tools.builtin.glob import resolve_tree
+from utils.paths import resolve_path
+from utils.workspace_tree import UncachedWalk
+from common.constants.workspace_constants import WorkspaceConstants
+
+
+class ListDirParams(BaseModel):
+    path: str = Field(
+        ".",
+        description="Directory to list (relative to working directory or absolute path)",
+    )
+
+
+class ListDirTool(Tool):
+    name = "list_dir"
+    description = (
+        "List the entries of a directory. Subdirectories are shown first with a trailing '/'. "
+        "Entries ignored by .gitignore are skipped."
+    )
+    kind = ToolKind.READ
+
+    schema: type[BaseModel] = ListDirParams
+
+    async def execute(self, invocation: ToolInvocation) -> ToolResult:
+        params = ListDirParams(**invocation.params)
+        path = resolve_path(invocation.cwd, params.path)
+        if not path.is_dir():
+            return ToolResult.error_result(f"Not a directory: {path}")
+
+        return await asyncio.to_thread(self._list, path, invocation.cwd)
+
+    def _list(self, path: Path, cwd: Path) -> ToolResult:
+        resolved = resolve_tree(path, cwd)
+        if resolved is None:
+            # Outside the snapshot: one scandir of this directory, not a tree of it.
+            listing = UncachedWalk(path).list_dir()
+        else:
+            tree, relative = resolved
+            listing = tree.list_dir(relative)
+        if listing is None:
+            return ToolResult.error_result(f"Cannot list directory: {path}")
+        dirs, files = listing
+
+        entries = [f"{name}/" for name in dirs] + files
+        total = len(entries)
+        metadata = {"dirs": len(dirs), "files": len(files)}
+        if not entries:
+            return ToolResult.success_result("Directory is empty.", metadata=metadata)
+
+        limit = WorkspaceConstants.LIST_DIR_MAX_ENTRIES
+        output = "\n".join(entries[:limit])
+        truncated = total > limit
+        if truncated:
+            output += f"\n... [{total - limit} more entries not shown]"
+        return ToolResult.success_result(output, metadata=metadata, truncated=truncated)
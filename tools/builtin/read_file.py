@@ -1,7 +1,11 @@
+import asyncio
+from pathlib import Path
 from pydantic import BaseModel, Field
 from tools.base import Tool, ToolInvocation, ToolKind, ToolResult
-from utils.paths import is_binary_file, resolve_path
-from utils.text import count_tokens, truncate_text
+from tools.read_cache import ReadCache
+from utils.line_index import get_line_index_cache
+from utils.paths import is_binary_file, read_line_window, resolve_path
+from utils.text import truncate_text
 from common.helpers.environment_helper import EnvironmentHelper as EnvH
 from common.constants.environment_constants import EnvironmentConstants as EnvC
 
@@ -37,26 +41,49 @@ class ReadFileTool(Tool):
     schema: type[BaseModel] = ReadFileParams
 
     MAX_FILE_SIZE = 1024*1024*10
+    # A read with a limit only touches its window (through the line index), so
+    # it is allowed on much larger files than a whole-file read.
+    MAX_WINDOWED_FILE_SIZE = 1024*1024*1024
     MAX_OUTPUT_TOKENS = 25000
+    # Files at least this large get a cached line-offset index on first read.
+    INDEX_MIN_FILE_SIZE = 1024*1024
 
     async def execute(self, invocation: ToolInvocation) -> ToolResult:
         params = ReadFileParams(**invocation.params)
         path = resolve_path(invocation.cwd, params.path)
 
+        # stat, binary sniffing, reading and tokenizing all block; keep them off the loop.
+        return await asyncio.to_thread(self._read, path, params, invocation.read_cache)
+
+    def _read(
+        self, path: Path, params: ReadFileParams, cache: ReadCache | None
+    ) -> ToolResult:
         if not path.exists():
             return ToolResult.error_result(f"File not found: {path}")
 
         if not path.is_file():
             return ToolResult.error_result(f"Path is not a file: {path}")
 
-        file_size = path.stat().st_size
+        stat = path.stat()
+        file_size = stat.st_size
 
-        if file_size > self.MAX_FILE_SIZE:
+        max_size = self.MAX_FILE_SIZE if params.limit is None else self.MAX_WINDOWED_FILE_SIZE
+        if file_size > max_size:
+            hint = " Use offset and limit to read a range of lines." if params.limit is None else ""
             return ToolResult.error_result(
                 f"File too large ({file_size / (1024*1024):.1f}MB)."
-                f"Maximum is {self.MAX_FILE_SIZE / (1024*1024):.0f}MB"
+                f"Maximum is {max_size / (1024*1024):.0f}MB.{hint}"
             )
 
+        cache_key = ReadCache.make_key(
+            path, stat.st_mtime_ns, file_size, params.offset, params.limit
+        )
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                cached.metadata["read_cache"] = cache.stats(hit=True)
+                return cached
+
         if is_binary_file(path):
             file_size_mb = file_size / (1024*1024)
             size_str = f"{file_size_mb:.1f}MB" if file_size_mb >= 1 else f"{file_size} bytes"
@@ -64,47 +91,57 @@ class ReadFileTool(Tool):
                 f"Cannot read binary file {path.name} ({size_str}))."
                 f"This tool only reads text files."
             )
-        
-        try:
-            try:
-                content = path.read_text(encoding='utf-8')
-            except UnicodeDecodeError:
-                content = path.read_text(encoding='latin-1')
-            
-            lines = content.splitlines()
-            total_lines = len(lines)
 
-            if total_lines == 0:
+        result = self._read_content(path, params, file_size)
+
+        if cache is not None:
+            if result.success:
+                cache.put(cache_key, result)
+            result.metadata["read_cache"] = cache.stats(hit=False)
+
+        return result
+
+    def _read_content(self, path: Path, params: ReadFileParams, file_size: int) -> ToolResult:
+        try:
+            if file_size == 0:
                 return ToolResult.success_result("File is empty.", metadata={"lines": 0})
-            
+
             start_idx = max(0, params.offset - 1)
+            index_cache = get_line_index_cache()
+            index = index_cache.peek(path)
+            if index is None and file_size >= self.INDEX_MIN_FILE_SIZE:
+                index = index_cache.get(path)
+
+            window = read_line_window(path, start_idx, params.limit, index=index)
+            total_lines = window.total_lines
+            end_idx = start_idx + len(window.lines)
 
-            if params.limit is not None:
-                end_idx = min(start_idx + params.limit, total_lines)
-            else:
-                end_idx = total_lines
-            
-            selected_lines = lines[start_idx:end_idx]
             formatted_lines = []
 
-            for i, line in enumerate(selected_lines, start=start_idx + 1):
+            for i, line in enumerate(window.lines, start=start_idx + 1):
                 formatted_lines.append(f"{i:6}|{line}")
             
             output = "\n".join(formatted_lines)
-            token_count = count_tokens(output, EnvH.get_env_variable(EnvC.DEFAULT_MODEL_NAME) or "")
-
-            truncated = False
-            if token_count > self.MAX_OUTPUT_TOKENS:
-                output = truncate_text(
-                    output,
-                    max_tokens=self.MAX_OUTPUT_TOKENS,
-                    model=EnvH.get_env_variable(EnvC.DEFAULT_MODEL_NAME) or "",
-                    suffix=f"\n... [truncated {total_lines} total lines]"
-                )
-                truncated = True
+
+            if total_lines is not None:
+                suffix = f"\n... [truncated {total_lines} total lines]"
+            else:
+                suffix = "\n... [truncated]"
+
+            # truncate_text encodes once and hands back the same string when it fits
+            truncated_output = truncate_text(
+                output,
+                max_tokens=self.MAX_OUTPUT_TOKENS,
+                model=EnvH.get_env_variable(EnvC.DEFAULT_MODEL_NAME) or "",
+                suffix=suffix
+            )
+            truncated = truncated_output is not output
+            output = truncated_output
 
             metadata_lines = []
-            if start_idx > 0 or end_idx < total_lines:
+            if total_lines is None:
+                metadata_lines.append(f"Showing lines {start_idx+1}-{end_idx}")
+            elif start_idx > 0 or end_idx < total_lines:
                 metadata_lines.append(
                     f"Showing lines {start_idx+1}-{end_idx} of {total_lines}"
                 )
@@ -124,4 +161,4 @@ class ReadFileTool(Tool):
                 }
             )
         except Exception as e:
-            return ToolResult.error_result(f"Failed to read file: {e}")
\ No newline at end of file
+            return ToolResult.error_result(f"Failed to read file: {e}")
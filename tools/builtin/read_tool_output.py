@@ -0,0 +1,72 @@
+from pydantic import BaseModel, Field
+from tools.base import Tool, ToolInvocation, ToolKind, ToolResult
+from utils.text import truncate_text
+from common.helpers.environment_helper import EnvironmentHelper as EnvH
+from common.constants.environment_constants import EnvironmentConstants as EnvC
+from common.constants.tool_constants import ToolConstants
+
+
+class ReadToolOutputParams(BaseModel):
+    handle: str = Field(
+        ...,
+        description="Handle from a truncated tool result, e.g. 'out-3'",
+    )
+
+    offset: int = Field(
+        1,
+        ge=1,
+        description="Line number to start reading from (1-based). Defaults to 1",
+    )
+
+    limit: int | None = Field(
+        None,
+        ge=1,
+        description="Maximum number of lines to read. If not specified read to the end",
+    )
+
+
+class ReadToolOutputTool(Tool):
+    name = "read_tool_output"
+    description = (
+        "Read the full output of an earlier tool call that was truncated to save context. "
+        "Truncated results name a handle; use offset and limit to page through it "
+        "instead of running the original tool again."
+    )
+    kind = ToolKind.READ
+
+    schema: type[BaseModel] = ReadToolOutputParams
+
+    async def execute(self, invocation: ToolInvocation) -> ToolResult:
+        params = ReadToolOutputParams(**invocation.params)
+        store = invocation.output_store
+        output = store.get(params.handle) if store is not None else None
+        if output is None:
+            return ToolResult.error_result(
+                f"Unknown or expired output handle: {params.handle}"
+            )
+
+        lines = output.split("\n")
+        start_idx = min(params.offset - 1, len(lines))
+        end_idx = len(lines) if params.limit is None else min(len(lines), start_idx + params.limit)
+        # Raw lines: outputs often carry their own numbering (read_file, grep).
+        window = "\n".join(lines[start_idx:end_idx])
+        if not window:
+            return ToolResult.success_result(
+                f"No lines in this range; the output has {len(lines)} lines."
+            )
+
+        excerpt = truncate_text(
+            window,
+            max_tokens=ToolConstants.FETCH_OUTPUT_MAX_TOKENS,
+            model=EnvH.get_env_variable(EnvC.DEFAULT_MODEL_NAME) or "",
+            suffix="\n... [truncated; continue with a larger offset]",
+        )
+        truncated = excerpt is not window
+        if start_idx > 0 or end_idx < len(lines):
+            excerpt += f"\n\n[Lines {start_idx + 1}-{end_idx} of {len(lines)}]"
+
+        return ToolResult.success_result(
+            excerpt,
+            metadata={"lines": len(lines), "start": start_idx + 1, "end": end_idx},
+            truncated=truncated,
+        )
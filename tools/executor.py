@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from pathlib import Path
+from client.response import ToolCall
+from tools.base import ToolResult
+from tools.registry import ToolRegistry
+from common.helpers.environment_helper import EnvironmentHelper as EnvH
+from common.constants.environment_constants import EnvironmentConstants as EnvC
+from common.constants.tool_constants import ToolConstants
+
+logger = logging.getLogger(__name__)
+
+
+class ToolExecutor:
+    def __init__(
+        self,
+        registry: ToolRegistry,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self._registry = registry
+        self._max_concurrency = max_concurrency or EnvH.get_env_variable(
+            EnvC.TOOL_MAX_CONCURRENCY, ToolConstants.MAX_CONCURRENCY
+        )
+        self._timeout = timeout or EnvH.get_env_variable(
+            EnvC.TOOL_CALL_TIMEOUT, ToolConstants.CALL_TIMEOUT_SECONDS
+        )
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+    async def execute(self, call: ToolCall, cwd: Path | None = None) -> ToolResult:
+        name = call.name or ""
+        async with self._semaphore:
+            try:
+                return await asyncio.wait_for(
+                    self._registry.invoke(name, call.arguments or {}, cwd),
+                    timeout=self._timeout,
+                )
+            except asyncio.TimeoutError:
+                logger.warning(f"Tool '{name}' timed out after {self._timeout}s")
+                return ToolResult.error_result(
+                    f"Tool '{name}' timed out after {self._timeout}s",
+                    metadata={"tool_name": name},
+                )
+
+    async def execute_batch(
+        self, calls: list[ToolCall], cwd: Path | None = None
+    ) -> list[ToolResult]:
+        results: list[ToolResult | None] = [None] * len(calls)
+        pending_reads: list[int] = []
+
+        async def flush_reads() -> None:
+            outcomes = await asyncio.gather(
+                *(self.execute(calls[idx], cwd) for idx in pending_reads)
+            )
+            for idx, result in zip(pending_reads, outcomes):
+                results[idx] = result
+            pending_reads.clear()
+
+        # Consecutive reads run together; a mutating call is a barrier so it sees
+        # every earlier read finished and no later read starts before it is done.
+        for idx, call in enumerate(calls):
+            if self._is_mutating(call):
+                await flush_reads()
+                results[idx] = await self.execute(call, cwd)
+            else:
+                pending_reads.append(idx)
+
+        await flush_reads()
+        return await self._registry.compact_results(
+            [result for result in results if result is not None]
+        )
+
+    def _is_mutating(self, call: ToolCall) -> bool:
+        tool = self._registry.get(call.name or "")
+        if tool is None:
+            return False
+        return tool.is_mutating(call.arguments or {})
@@ -0,0 +1,76 @@
+from dataclasses import replace
+from tools.base import ToolResult
+from tools.output_store import OutputStore
+from utils.text import TruncationStrategy, count_tokens_batch, truncate_text
+from common.helpers.environment_helper import EnvironmentHelper as EnvH
+from common.constants.environment_constants import EnvironmentConstants as EnvC
+from common.constants.tool_constants import ToolConstants
+
+
+def fair_shares(sizes: list[int], budget: int) -> list[int]:
+    # Max-min fair split: small results keep everything, the rest share what is
+    # left evenly.
+    shares = [0] * len(sizes)
+    remaining = budget
+    order = sorted(range(len(sizes)), key=sizes.__getitem__)
+    for position, index in enumerate(order):
+        share = min(sizes[index], remaining // (len(order) - position))
+        shares[index] = share
+        remaining -= share
+    return shares
+
+
+class OutputBudget:
+    def __init__(self, store: OutputStore, turn_tokens: int | None = None) -> None:
+        self._store = store
+        self.turn_tokens = turn_tokens or EnvH.get_env_variable(
+            EnvC.TOOL_TURN_OUTPUT_TOKENS, ToolConstants.TURN_OUTPUT_TOKENS
+        )
+
+    def exceeded(self, results: list[ToolResult]) -> bool:
+        # A token is at least one byte, so most turns are settled without tokenizing.
+        return sum(len(result.output.encode("utf-8")) for result in results) > self.turn_tokens
+
+    def compact(self, results: list[ToolResult]) -> list[ToolResult]:
+        model = EnvH.get_env_variable(EnvC.DEFAULT_MODEL_NAME) or ""
+        originals = [self._original(result) for result in results]
+        sizes = count_tokens_batch(originals, model)
+        shares = fair_shares(sizes, self.turn_tokens)
+
+        compacted: list[ToolResult] = []
+        for result, original, size, share in zip(results, originals, sizes, shares):
+            share = max(share, ToolConstants.MIN_EXCERPT_TOKENS)
+            if size <= share:
+                compacted.append(result)
+            else:
+                compacted.append(self._excerpt(result, original, size, share, model))
+        return compacted
+
+    def _original(self, result: ToolResult) -> str:
+        # Results compacted once already (per call, before the turn-wide pass)
+        # are cut again from the stored full text, never from the excerpt.
+        handle = result.metadata.get("output_handle")
+        if handle:
+            stored = self._store.get(handle)
+            if stored is not None:
+                return stored
+        return result.output
+
+    def _excerpt(
+        self, result: ToolResult, original: str, size: int, share: int, model: str
+    ) -> ToolResult:
+        handle = result.metadata.get("output_handle") or self._store.put(original)
+        lines = original.count("\n") + 1
+        marker = (
+            f"\n... [output cut to fit this turn's budget: {size} tokens, {lines} lines in full. "
+            f"Call read_tool_output with handle '{handle}' and an offset/limit to read the rest]"
+        )
+        excerpt = truncate_text(
+            original, model, share, suffix=marker, strategy=TruncationStrategy.MIDDLE
+        )
+        return replace(
+            result,
+            output=excerpt,
+            truncated=True,
+            metadata={**result.metadata, "output_handle": handle, "output_tokens": size},
+        )
@@ -0,0 +1,44 @@
+import itertools
+import threading
+from collections import OrderedDict
+from common.helpers.environment_helper import EnvironmentHelper as EnvH
+from common.constants.environment_constants import EnvironmentConstants as EnvC
+from common.constants.tool_constants import ToolConstants
+
+
+class OutputStore:
+    # Full text of tool outputs that were cut down before entering the context,
+    # kept so the model can page through them without re-running the tool.
+    def __init__(self, max_bytes: int | None = None) -> None:
+        self._max_bytes = max_bytes or EnvH.get_env_variable(
+            EnvC.TOOL_OUTPUT_STORE_MAX_BYTES, ToolConstants.OUTPUT_STORE_MAX_BYTES
+        )
+        self._entries: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._bytes = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def put(self, output: str) -> str:
+        nbytes = len(output.encode("utf-8"))
+        with self._lock:
+            handle = f"out-{next(self._ids)}"
+            self._entries[handle] = (output, nbytes)
+            self._bytes += nbytes
+            # The newest entry always stays, even when it alone is over the limit.
+            while self._bytes > self._max_bytes and len(self._entries) > 1:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+        return handle
+
+    def get(self, handle: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return None
+            self._entries.move_to_end(handle)
+            return entry[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
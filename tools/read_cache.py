@@ -0,0 +1,68 @@
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+from tools.base import ToolResult
+from common.helpers.environment_helper import EnvironmentHelper as EnvH
+from common.constants.environment_constants import EnvironmentConstants as EnvC
+from common.constants.tool_constants import ToolConstants
+
+ReadKey = tuple[str, int, int, int, int | None]
+
+
+class ReadCache:
+    def __init__(self, max_bytes: int | None = None) -> None:
+        self._max_bytes = max_bytes or EnvH.get_env_variable(
+            EnvC.READ_CACHE_MAX_BYTES, ToolConstants.READ_CACHE_MAX_BYTES
+        )
+        self._entries: OrderedDict[ReadKey, tuple[ToolResult, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        path: Path, mtime_ns: int, size: int, offset: int, limit: int | None
+    ) -> ReadKey:
+        return (str(path), mtime_ns, size, offset, limit)
+
+    def get(self, key: ReadKey) -> ToolResult | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            result = entry[0]
+
+        # Hand out a copy so callers can annotate metadata without touching the cache.
+        return replace(result, metadata=dict(result.metadata))
+
+    def put(self, key: ReadKey, result: ToolResult) -> None:
+        nbytes = len(result.output.encode("utf-8"))
+        if nbytes > self._max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (replace(result, metadata=dict(result.metadata)), nbytes)
+            self._bytes += nbytes
+            while self._bytes > self._max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self._bytes -= evicted_bytes
+
+    def invalidate(self, path: str | Path) -> int:
+        target = str(path)
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == target]
+            for key in stale:
+                _, nbytes = self._entries.pop(key)
+                self._bytes -= nbytes
+            return len(stale)
+
+    def stats(self, hit: bool) -> dict[str, int | bool]:
+        return {"hit": hit, "hits": self.hits, "misses": self.misses}
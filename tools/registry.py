@@ -1,25 +1,55 @@
+import asyncio
+import json
 import logging
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
+from client.response import build_openai_tools
 from tools.base import Tool, ToolInvocation, ToolResult
 from tools.builtin import ReadFileTool, get_all_builtin_tools
+from tools.output_budget import OutputBudget
+from tools.output_store import OutputStore
+from tools.read_cache import ReadCache
+from utils.metrics import get_metrics
+from utils.paths import resolve_path
+from utils.text import count_tokens
+from utils.trigram_index import notify_path_changed
+from common.helpers.environment_helper import EnvironmentHelper as EnvH
+from common.constants.environment_constants import EnvironmentConstants as EnvC
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True)
+class ToolSchemaPayload:
+    version: int
+    schemas: list[dict[str, Any]]
+    tools: list[dict[str, Any]]
+    serialized: str
+    token_count: int
+
+
 class ToolRegistry:
     def __init__(self) -> None:
         self._tools: dict[str, Tool] = {}
+        self._version = 0
+        self._payload: ToolSchemaPayload | None = None
+        self.read_cache = ReadCache()
+        self.output_store = OutputStore()
+        self.output_budget = OutputBudget(self.output_store)
 
     def register(self, tool: Tool) -> None:
         if tool.name in self._tools:
             logger.warning(f"Tool '{tool.name}' is already registered. Overwriting.")
 
         self._tools[tool.name] = tool
+        self._invalidate_payload()
         logger.debug(f"Registered tool: {tool.name}")
 
     def unregister(self, tool_name: str) -> bool:
         if tool_name in self._tools:
             del self._tools[tool_name]
+            self._invalidate_payload()
             logger.debug(f"Unregistered tool: {tool_name}")
             return True
         else:
@@ -35,9 +65,44 @@ class ToolRegistry:
         return list(self._tools.values())
 
     def get_schemas(self) -> list[dict]:
-        return [tool.to_openai_schema() for tool in self.get_tools()]
+        return self.get_payload().schemas
+
+    def get_payload(self) -> ToolSchemaPayload:
+        # Built once per registry version; register/unregister are the only invalidators.
+        if self._payload is None:
+            schemas = [tool.to_openai_schema() for tool in self.get_tools()]
+            tools = build_openai_tools(schemas)
+            serialized = json.dumps(tools, sort_keys=True, separators=(",", ":"))
+            self._payload = ToolSchemaPayload(
+                version=self._version,
+                schemas=schemas,
+                tools=tools,
+                serialized=serialized,
+                token_count=count_tokens(
+                    serialized, EnvH.get_env_variable(EnvC.DEFAULT_MODEL_NAME) or ""
+                ) if tools else 0,
+            )
+        return self._payload
+
+    def _invalidate_payload(self) -> None:
+        self._version += 1
+        self._payload = None
 
     async def invoke(self, name: str, params: dict[str, Any], cwd: Path | None):
+        # Unknown names come from the model; keep them out of the metric labels.
+        span = get_metrics().start_span(
+            "tool_invoke", tool=name if name in self._tools else "unknown"
+        )
+        outcome = "cancelled"
+        try:
+            result = await self._invoke(name, params, cwd)
+            outcome = "ok" if result.success else "error"
+            span.attributes["truncated"] = result.truncated
+            return result
+        finally:
+            span.end(outcome=outcome)
+
+    async def _invoke(self, name: str, params: dict[str, Any], cwd: Path | None) -> ToolResult:
         tool = self.get(name)
         if not tool:
             return ToolResult.error_result(
@@ -53,15 +118,48 @@ class ToolRegistry:
                 metadata={"tool_name": name, "validation_errors": validation_errors}
             )
         cwd_path = cwd if cwd else Path.cwd()
-        invocation = ToolInvocation(params=params, cwd=cwd_path)
+        invocation = ToolInvocation(
+            params=params,
+            cwd=cwd_path,
+            read_cache=self.read_cache,
+            output_store=self.output_store,
+        )
         try:
-            await tool.execute(invocation)
+            result = await tool.execute(invocation)
         except Exception as e:
             logger.exception(f"Tool {name} raised unexpected error during execution")
             return ToolResult.error_result(
                 f"Internal Error: {str(e)}",
                 metadata={"tool_name": name}
             )
+        finally:
+            if tool.is_mutating(params):
+                self._invalidate_reads(params, cwd_path)
+
+        # A single call may use the whole turn's budget; callers running several
+        # calls in one turn split it between them with compact_results.
+        return (await self.compact_results([result]))[0]
+
+    async def compact_results(self, results: list[ToolResult]) -> list[ToolResult]:
+        if not self.output_budget.exceeded(results):
+            return results
+        compacted = await asyncio.to_thread(self.output_budget.compact, results)
+        # Results cut again by the turn-wide pass were already counted per call.
+        new = sum(
+            1
+            for before, after in zip(results, compacted)
+            if after is not before and "output_handle" not in before.metadata
+        )
+        if new:
+            get_metrics().increment("tool_output_compactions_total", new)
+        return compacted
+
+    def _invalidate_reads(self, params: dict[str, Any], cwd: Path) -> None:
+        path = params.get("path")
+        if isinstance(path, str) and path:
+            resolved = resolve_path(cwd, path)
+            self.read_cache.invalidate(resolved)
+            notify_path_changed(resolved)
 
 def create_default_registry() -> ToolRegistry:
     registry = ToolRegistry()
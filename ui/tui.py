@@ -1,7 +1,20 @@
+from __future__ import annotations
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any
 from rich.console import Console
 from rich.theme import Theme
 from rich.rule import Rule
 from rich.text import Text
+from common.helpers.environment_helper import EnvironmentHelper as Env
+from common.constants.environment_constants import EnvironmentConstants
+from common.constants.tui_constants import TUIConstants
+from utils.metrics import get_metrics
+
+# Markdown rendering pulls in markdown-it and pygments; it is opt-in, so those
+# load only when a markdown stream actually starts.
+if TYPE_CHECKING:
+    from rich.live import Live
 
 AGENT_THEME = Theme(
     {
@@ -41,20 +54,168 @@ def get_console() -> Console:
     return _console
 
 
+def split_markdown_blocks(text: str) -> tuple[str, str]:
+    # Everything up to the last blank line outside a code fence is final; only the
+    # trailing block can still change as more deltas arrive.
+    boundary = 0
+    in_fence = False
+    position = 0
+
+    for line in text.splitlines(keepends=True):
+        position += len(line)
+        stripped = line.strip()
+        if stripped.startswith("```") or stripped.startswith("~~~"):
+            in_fence = not in_fence
+        elif not stripped and not in_fence and line.endswith("\n"):
+            boundary = position
+
+    return text[:boundary], text[boundary:]
+
+
 class TUI:
-    def __init__(self, console: Console | None = None) -> None:
+    def __init__(
+        self,
+        console: Console | None = None,
+        frame_rate: float | None = None,
+        flush_threshold: int | None = None,
+        markdown: bool | None = None,
+    ) -> None:
         self.console = console or get_console()
         self._assistant_stream_open = False
 
+        frame_rate = frame_rate or Env.get_env_variable(
+            EnvironmentConstants.TUI_FRAME_RATE, TUIConstants.FRAME_RATE
+        )
+        self._frame_interval = 1.0 / frame_rate if frame_rate > 0 else 0.0
+        self._flush_threshold = flush_threshold or Env.get_env_variable(
+            EnvironmentConstants.TUI_FLUSH_THRESHOLD, TUIConstants.FLUSH_THRESHOLD_CHARS
+        )
+        self._markdown = (
+            markdown
+            if markdown is not None
+            else Env.get_env_variable(
+                EnvironmentConstants.TUI_MARKDOWN, TUIConstants.MARKDOWN_ENABLED
+            )
+        )
+
+        self._buffer: list[str] = []
+        self._buffered_chars = 0
+        self._last_flush = 0.0
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+        self._live: Live | None = None
+        self._markdown_tail = ""
+
     def begin_assistant(self) -> None:
         self.console.print()
         self.console.print(Rule(Text("Assistant", style="assistant")))
         self._assistant_stream_open = True
+        self._last_flush = time.monotonic()
+
+        if self._markdown:
+            from rich.live import Live
+
+            self._markdown_tail = ""
+            self._live = Live(console=self.console, auto_refresh=False)
+            self._live.start()
 
     def end_assistant(self) -> None:
+        self.flush()
+
+        if self._live is not None:
+            from rich.markdown import Markdown
+
+            self._live.update(Markdown(self._markdown_tail), refresh=True)
+            self._live.stop()
+            self._live = None
+            self._markdown_tail = ""
+
         if self._assistant_stream_open:
             self.console.print()
         self._assistant_stream_open = False
 
+    def tool_call_start(self, name: str, arguments: dict[str, Any]) -> None:
+        # Anything printed outside the stream goes after the text buffered before it.
+        self.flush()
+        summary = ", ".join(f"{key}={value!r}" for key, value in arguments.items())
+        self.console.print(
+            Text.assemble(("Tool ", "muted"), (name, "tool"), (f"({summary})", "muted"))
+        )
+
+    def tool_call_complete(self, name: str, success: bool, error: str | None = None) -> None:
+        self.flush()
+        if success:
+            self.console.print(Text.assemble(("  done ", "success"), (name, "muted")))
+        else:
+            self.console.print(
+                Text.assemble(("  failed ", "error"), (name, "muted"), (f": {error}", "muted"))
+            )
+
+    def agent_error(self, error: str) -> None:
+        # Closes an open stream first, so the error follows all of its text.
+        self.end_assistant()
+        self.console.print(f"\n[error]Error: {error}[/error]")
+
     def stream_assistant_delta(self, content: str) -> None:
-        self.console.print(content, end="", markup=False)
+        self._buffer.append(content)
+        self._buffered_chars += len(content)
+
+        now = time.monotonic()
+        if (
+            self._buffered_chars >= self._flush_threshold
+            or now - self._last_flush >= self._frame_interval
+        ):
+            self.flush()
+            return
+
+        self._schedule_flush(now)
+
+    def flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+
+        content = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered_chars = 0
+
+        # Timed per frame into a histogram only; a span per frame would flood exporters.
+        started = time.perf_counter()
+        if self._live is not None:
+            self._render_markdown(content)
+            mode = "markdown"
+        else:
+            # soft_wrap leaves wrapping to the terminal. This differs from the old
+            # per-delta prints, where rich folded any single delta wider than the
+            # console on its own (ignoring the cursor column); now long lines wrap
+            # where the terminal wraps them, and no extra newlines are written.
+            self.console.print(content, end="", markup=False, soft_wrap=True)
+            mode = "plain"
+        get_metrics().observe("tui_render_seconds", time.perf_counter() - started, mode=mode)
+
+    def _render_markdown(self, content: str) -> None:
+        from rich.markdown import Markdown
+
+        completed, self._markdown_tail = split_markdown_blocks(
+            self._markdown_tail + content
+        )
+        if completed:
+            # Printed above the live region once; only the trailing block re-renders.
+            self.console.print(Markdown(completed))
+        self._live.update(Markdown(self._markdown_tail), refresh=True)
+
+    def _schedule_flush(self, now: float) -> None:
+        if self._flush_handle is not None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        delay = max(0.0, self._frame_interval - (now - self._last_flush))
+        self._flush_handle = loop.call_later(delay, self.flush)
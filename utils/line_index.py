@@ -0,0 +1,161 @@
+import hashlib
+import logging
+import os
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+from common.helpers.environment_helper import EnvironmentHelper as EnvH
+from common.constants.environment_constants import EnvironmentConstants as EnvC
+from common.constants.line_index_constants import LineIndexConstants
+
+logger = logging.getLogger(__name__)
+
+IndexKey = tuple[str, int, int]
+
+
+@dataclass
+class LineIndex:
+    # Byte offset at which each line starts; line N (0-based) is offsets[N].
+    offsets: array
+    size: int
+
+    @property
+    def total_lines(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        return self.offsets.itemsize * len(self.offsets)
+
+    def byte_range(self, start: int, end: int) -> tuple[int, int]:
+        start = min(start, self.total_lines)
+        end = min(end, self.total_lines)
+        begin = self.offsets[start] if start < self.total_lines else self.size
+        stop = self.offsets[end] if end < self.total_lines else self.size
+        return begin, stop
+
+    @classmethod
+    def build(cls, path: str | Path) -> "LineIndex":
+        offsets = array("Q", [0])
+        size = 0
+
+        with open(path, "rb") as f:
+            while chunk := f.read(LineIndexConstants.SCAN_CHUNK_SIZE):
+                # Every \n ends a line, so the next one starts right after it.
+                starts = accumulate(
+                    (len(part) + 1 for part in chunk.split(b"\n")[:-1]), initial=size
+                )
+                next(starts)
+                offsets.extend(starts)
+                size += len(chunk)
+
+        # A trailing newline does not open another line; an empty file has none.
+        if offsets[-1] == size:
+            offsets.pop()
+
+        return cls(offsets=offsets, size=size)
+
+
+class LineIndexCache:
+    def __init__(
+        self,
+        max_memory_bytes: int = LineIndexConstants.MAX_MEMORY_BYTES,
+        spill_dir: str | Path | None = None,
+    ) -> None:
+        self._max_memory_bytes = max_memory_bytes
+        self._spill_dir = Path(spill_dir) if spill_dir else None
+        self._entries: OrderedDict[IndexKey, LineIndex] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+    def peek(self, path: str | Path) -> LineIndex | None:
+        key = self._key(path)
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+            return index
+
+    def get(self, path: str | Path) -> LineIndex:
+        key = self._key(path)
+        with self._lock:
+            index = self._entries.get(key)
+            if index is not None:
+                self._entries.move_to_end(key)
+                return index
+
+        index = self._load_sidecar(key)
+        if index is None:
+            index = LineIndex.build(key[0])
+            self._write_sidecar(key, index)
+
+        self._store(key, index)
+        return index
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+    @staticmethod
+    def _key(path: str | Path) -> IndexKey:
+        resolved = str(Path(path).resolve())
+        stat = os.stat(resolved)
+        return (resolved, stat.st_mtime_ns, stat.st_size)
+
+    def _store(self, key: IndexKey, index: LineIndex) -> None:
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = index
+            self._memory_bytes += index.nbytes
+            while self._memory_bytes > self._max_memory_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_bytes -= evicted.nbytes
+
+    def _sidecar_path(self, key: IndexKey) -> Path | None:
+        if self._spill_dir is None:
+            return None
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return self._spill_dir / f"{digest}{LineIndexConstants.SIDECAR_SUFFIX}"
+
+    def _load_sidecar(self, key: IndexKey) -> LineIndex | None:
+        sidecar = self._sidecar_path(key)
+        if sidecar is None or not sidecar.exists():
+            return None
+
+        try:
+            offsets = array("Q")
+            offsets.frombytes(sidecar.read_bytes())
+            return LineIndex(offsets=offsets, size=key[2])
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable line index {sidecar}: {e}")
+            return None
+
+    def _write_sidecar(self, key: IndexKey, index: LineIndex) -> None:
+        sidecar = self._sidecar_path(key)
+        if sidecar is None:
+            return
+
+        try:
+            sidecar.parent.mkdir(parents=True, exist_ok=True)
+            tmp = sidecar.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_bytes(index.offsets.tobytes())
+            os.replace(tmp, sidecar)
+        except OSError as e:
+            logger.debug(f"Could not spill line index to {sidecar}: {e}")
+
+
+_cache: LineIndexCache | None = None
+
+
+def get_line_index_cache() -> LineIndexCache:
+    global _cache
+    if _cache is None:
+        _cache = LineIndexCache(
+            spill_dir=EnvH.get_env_variable(EnvC.LINE_INDEX_CACHE_DIR),
+        )
+    return _cache
@@ -0,0 +1,321 @@
+from __future__ import annotations
+import asyncio
+import bisect
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, Protocol
+from common.constants.metrics_constants import MetricsConstants
+
+# Stdlib only: count_tokens and the CLI import this before anything heavy loads.
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...] = MetricsConstants.HISTOGRAM_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.samples: deque[float] = deque(maxlen=MetricsConstants.SUMMARY_SAMPLES)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+        self.samples.append(value)
+
+    def quantile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        # Nearest rank.
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+@dataclass(slots=True)
+class SpanRecord:
+    name: str
+    started_at: float
+    duration: float
+    labels: dict[str, str]
+    attributes: dict[str, Any]
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    labels: dict[str, Any]
+    attributes: dict[str, Any] = field(default_factory=dict)
+    started_at: float = field(default_factory=time.time)
+    started: float = field(default_factory=time.perf_counter)
+    _metrics: Metrics | None = None
+    _ended: bool = False
+
+    def end(self, **labels: Any) -> float:
+        # Labels passed here (typically the outcome) are only known at the end.
+        duration = time.perf_counter() - self.started
+        if self._ended or self._metrics is None:
+            return duration
+        self._ended = True
+        self.labels.update(labels)
+        self._metrics.record_span(self, duration)
+        return duration
+
+
+class Exporter(Protocol):
+    def on_span(self, record: SpanRecord) -> None: ...
+
+    def close(self, metrics: Metrics) -> None: ...
+
+
+class Metrics:
+    # Process-wide counters, histograms and spans. Spans record their duration into the
+    # <name>_seconds histogram and are handed to every exporter; bare observations (e.g.
+    # per tokenizer call) only update the histogram.
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], Histogram] = {}
+        self._exporters: list[Exporter] = []
+
+    def add_exporter(self, exporter: Exporter) -> None:
+        with self._lock:
+            self._exporters.append(exporter)
+
+    def increment(self, name: str, amount: float = 1, **labels: Any) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def start_span(self, name: str, **labels: Any) -> Span:
+        return Span(name=name, labels=labels, _metrics=self)
+
+    @contextmanager
+    def span(self, name: str, **labels: Any) -> Iterator[Span]:
+        span = self.start_span(name, **labels)
+        try:
+            yield span
+        except BaseException:
+            span.end(outcome="error")
+            raise
+        else:
+            span.end()
+
+    def record_span(self, span: Span, duration: float) -> None:
+        self.observe(f"{span.name}_seconds", duration, **span.labels)
+        with self._lock:
+            exporters = list(self._exporters)
+        if not exporters:
+            return
+        record = SpanRecord(
+            name=span.name,
+            started_at=span.started_at,
+            duration=duration,
+            labels={key: str(value) for key, value in span.labels.items()},
+            attributes=span.attributes,
+        )
+        for exporter in exporters:
+            exporter.on_span(record)
+
+    def counters(self) -> list[tuple[str, Labels, float]]:
+        with self._lock:
+            return sorted((name, labels, value) for (name, labels), value in self._counters.items())
+
+    def histograms(self) -> list[tuple[str, Labels, Histogram]]:
+        with self._lock:
+            return sorted(
+                ((name, labels, histogram) for (name, labels), histogram in self._histograms.items()),
+                key=lambda item: (item[0], item[1]),
+            )
+
+    def shutdown(self) -> None:
+        with self._lock:
+            exporters, self._exporters = self._exporters, []
+        for exporter in exporters:
+            exporter.close(self)
+
+
+def _format_labels(labels: Labels, extra: tuple[tuple[str, str], ...] = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in pairs
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def format_prometheus(metrics: Metrics) -> str:
+    lines: list[str] = []
+    typed: set[str] = set()
+    for name, labels, value in metrics.counters():
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+    for name, labels, histogram in metrics.histograms():
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} histogram")
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(labels, (('le', f'{bound:g}'),))} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(labels, (('le', '+Inf'),))} {histogram.count}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum:.6f}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+
+def format_summary(metrics: Metrics) -> list[str]:
+    lines = [f"{'timing':<52}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+    for name, labels, histogram in metrics.histograms():
+        label = name + (f" {' '.join(f'{k}={v}' for k, v in labels)}" if labels else "")
+        lines.append(
+            f"{label[:51]:<52}{histogram.count:>8}"
+            f"{histogram.sum / max(1, histogram.count) * 1000:>10.2f}"
+            f"{histogram.quantile(0.5) * 1000:>10.2f}"
+            f"{histogram.quantile(0.95) * 1000:>10.2f}"
+            f"{histogram.max * 1000:>10.2f}"
+        )
+    counters = metrics.counters()
+    if counters:
+        lines.append(f"{'counter':<52}{'value':>8}")
+        for name, labels, value in counters:
+            label = name + (f" {' '.join(f'{k}={v}' for k, v in labels)}" if labels else "")
+            lines.append(f"{label[:51]:<52}{value:>8g}")
+    return lines
+
+
+class JsonlExporter:
+    # One line per span as it ends, then a final snapshot of every metric. Spans
+    # end on the event loop, so lines are buffered and written in batches on a
+    # worker thread; close() writes whatever is left.
+    def __init__(
+        self, path: str | Path, flush_lines: int = MetricsConstants.JSONL_FLUSH_LINES
+    ) -> None:
+        self._file = open(path, "a", encoding="utf-8")
+        self._flush_lines = flush_lines
+        self._lock = threading.Lock()
+        # Held across a whole write, so batches land in the order they were taken.
+        self._write_lock = threading.Lock()
+        self._pending: list[str] = []
+        self._writes: set[asyncio.Task] = set()
+
+    def on_span(self, record: SpanRecord) -> None:
+        line = json.dumps(
+            {
+                "type": "span",
+                "name": record.name,
+                "started_at": record.started_at,
+                "duration_ms": round(record.duration * 1000, 3),
+                "labels": record.labels,
+                "attributes": record.attributes,
+            },
+            default=str,
+        )
+        with self._lock:
+            self._pending.append(line + "\n")
+            if len(self._pending) < self._flush_lines:
+                return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_pending()
+            return
+        task = loop.create_task(asyncio.to_thread(self._write_pending))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    def _write_pending(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                lines, self._pending = self._pending, []
+            if lines and not self._file.closed:
+                self._file.write("".join(lines))
+
+    def close(self, metrics: Metrics) -> None:
+        snapshot = {
+            "type": "metrics",
+            "at": time.time(),
+            "counters": [
+                {"name": name, "labels": dict(labels), "value": value}
+                for name, labels, value in metrics.counters()
+            ],
+            "histograms": [
+                {
+                    "name": name,
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "max": histogram.max,
+                    "p50": histogram.quantile(0.5),
+                    "p95": histogram.quantile(0.95),
+                }
+                for name, labels, histogram in metrics.histograms()
+            ],
+        }
+        self._write_pending()
+        with self._write_lock:
+            self._file.write(json.dumps(snapshot) + "\n")
+            self._file.close()
+
+
+class PrometheusExporter:
+    # Writes the text exposition format on shutdown, e.g. for node_exporter's
+    # textfile collector. The rename keeps scrapers from seeing a partial file.
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+
+    def on_span(self, record: SpanRecord) -> None:
+        pass
+
+    def close(self, metrics: Metrics) -> None:
+        tmp = self._path.with_name(f".{self._path.name}.{os.getpid()}.tmp")
+        tmp.write_text(format_prometheus(metrics), encoding="utf-8")
+        os.replace(tmp, self._path)
+
+
+class SummaryExporter:
+    def __init__(self, echo: Callable[[str], None]) -> None:
+        self._echo = echo
+
+    def on_span(self, record: SpanRecord) -> None:
+        pass
+
+    def close(self, metrics: Metrics) -> None:
+        for line in format_summary(metrics):
+            self._echo(line)
+
+
+_metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    return _metrics
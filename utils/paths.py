@@ -1,4 +1,6 @@
+from dataclasses import dataclass
 from pathlib import Path
+from utils.line_index import LineIndex
 
 
 def resolve_path(base: str | Path, path: str | Path):
@@ -15,3 +17,56 @@ def is_binary_file(path: str | Path) -> bool:
             return b"\x00" in chunk
     except (OSError, IOError):
         return False
+
+
+@dataclass
+class LineWindow:
+    lines: list[str]
+    # None when the scan stopped before EOF and the file length is unknown.
+    total_lines: int | None
+
+
+def read_line_window(
+    path: str | Path, start: int, limit: int | None, index: LineIndex | None = None
+) -> LineWindow:
+    if index is not None:
+        end = start + limit if limit is not None else index.total_lines
+        begin, stop = index.byte_range(start, end)
+        with open(path, "rb") as f:
+            f.seek(begin)
+            data = f.read(stop - begin)
+        return LineWindow(lines=_decode_lines(data), total_lines=index.total_lines)
+
+    raw_lines: list[bytes] = []
+    end = start + limit if limit is not None else None
+    line_no = 0
+    reached_eof = True
+
+    # Stream line by line so a small window of a large file stops after `end` lines.
+    with open(path, "rb") as f:
+        for raw in f:
+            if end is not None and line_no >= end:
+                reached_eof = False
+                break
+            if line_no >= start:
+                raw_lines.append(raw)
+            line_no += 1
+
+    return LineWindow(
+        lines=_decode_lines(b"".join(raw_lines)),
+        total_lines=line_no if reached_eof else None,
+    )
+
+
+def _decode_lines(data: bytes) -> list[str]:
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError:
+        text = data.decode("latin-1")
+
+    # Split on \n only so line numbers agree with the byte-level scan and LineIndex.
+    lines = text.split("\n") if text else []
+    if text.endswith("\n"):
+        lines.pop()
+
+    return [line[:-1] if line.endswith("\r") else line for line in lines]
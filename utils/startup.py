@@ -0,0 +1,94 @@
+from __future__ import annotations
+import builtins
+import sys
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class ImportRecord:
+    name: str
+    depth: int
+    cumulative: float
+    self_time: float
+
+
+@dataclass
+class _Frame:
+    children: float = 0.0
+
+
+class ImportProfiler:
+    # Times first-time imports in-process, like python -X importtime. Only modules not
+    # yet in sys.modules are timed, so the report shows what a code path actually costs
+    # to load rather than what it references.
+    def __init__(self) -> None:
+        self.records: list[ImportRecord] = []
+        # Per thread, so a background import (e.g. the tokenizer prewarm) keeps
+        # its own nesting.
+        self._local = threading.local()
+        self._original = builtins.__import__
+        self._started = 0.0
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        self._original = builtins.__import__
+        self._started = time.perf_counter()
+        builtins.__import__ = self._import
+
+    def stop(self) -> None:
+        builtins.__import__ = self._original
+        self.elapsed = time.perf_counter() - self._started
+
+    def __enter__(self) -> ImportProfiler:
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def by_package(self) -> list[tuple[str, float]]:
+        totals: dict[str, float] = defaultdict(float)
+        for record in self.records:
+            totals[record.name.partition(".")[0]] += record.self_time
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    def format_report(self, limit: int = 15) -> list[str]:
+        lines = [f"{'package':<24}{'self ms':>10}"]
+        packages = self.by_package()
+        for package, seconds in packages[:limit]:
+            lines.append(f"{package:<24}{seconds * 1000:>10.1f}")
+        rest = sum(seconds for _, seconds in packages[limit:])
+        if rest:
+            lines.append(f"{'(other)':<24}{rest * 1000:>10.1f}")
+        lines.append(f"{'total':<24}{self.elapsed * 1000:>10.1f}")
+        return lines
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+
+        stack: list[_Frame] | None = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        frame = _Frame()
+        stack.append(frame)
+        started = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = time.perf_counter() - started
+            stack.pop()
+            if stack:
+                stack[-1].children += cumulative
+            self.records.append(
+                ImportRecord(
+                    name=name,
+                    depth=len(stack),
+                    cumulative=cumulative,
+                    self_time=max(0.0, cumulative - frame.children),
+                )
+            )
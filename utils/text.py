@@ -1,37 +1,185 @@
-import tiktoken
+from __future__ import annotations
+import threading
+import time
+from enum import Enum
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable
+from common.constants.tokenizer_constants import TokenizerConstants
+from utils.metrics import get_metrics
 
+if TYPE_CHECKING:
+    import tiktoken
 
-def get_tokenizer(model: str):
-    try:
-        encoding = tiktoken.encoding_for_model(model)
-        return encoding.encode
-    except Exception:
-        encoding = tiktoken.get_encoding("cl100k_base")
-        return encoding.encode
+
+class TokenizerRegistry:
+    def __init__(self, max_size: int = TokenizerConstants.CACHE_SIZE) -> None:
+        self._max_size = max_size
+        self._encodings: OrderedDict[str, tiktoken.Encoding | None] = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes loads so a caller racing the prewarm thread waits for its
+        # result instead of decoding the same BPE file a second time.
+        self._resolve_lock = threading.Lock()
+
+    def get_encoding(self, model: str) -> tiktoken.Encoding | None:
+        with self._lock:
+            if model in self._encodings:
+                self._encodings.move_to_end(model)
+                return self._encodings[model]
+
+        with self._resolve_lock:
+            with self._lock:
+                if model in self._encodings:
+                    return self._encodings[model]
+
+            encoding = self._resolve(model)
+
+            with self._lock:
+                self._encodings[model] = encoding
+                self._encodings.move_to_end(model)
+                while len(self._encodings) > self._max_size:
+                    self._encodings.popitem(last=False)
+
+        return encoding
+
+    def prewarm(self, model: str) -> threading.Thread:
+        thread = threading.Thread(
+            target=self.get_encoding, args=(model,), name="tokenizer-prewarm", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def clear(self) -> None:
+        with self._lock:
+            self._encodings.clear()
+
+    def _resolve(self, model: str) -> tiktoken.Encoding | None:
+        # Imported here so importing this module stays cheap on the startup path.
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except Exception:
+            pass
+
+        try:
+            return tiktoken.get_encoding(TokenizerConstants.FALLBACK_ENCODING)
+        except Exception:
+            # BPE files could not be loaded (e.g. offline); callers estimate instead.
+            return None
+
+
+_registry = TokenizerRegistry()
+_batch_executor: ThreadPoolExecutor | None = None
+_batch_executor_lock = threading.Lock()
+
+
+def get_tokenizer_registry() -> TokenizerRegistry:
+    return _registry
+
+
+def _get_batch_executor() -> ThreadPoolExecutor:
+    global _batch_executor
+    with _batch_executor_lock:
+        if _batch_executor is None:
+            _batch_executor = ThreadPoolExecutor(
+                max_workers=TokenizerConstants.BATCH_THREADS,
+                thread_name_prefix="tokenizer",
+            )
+    return _batch_executor
+
+
+def prewarm_tokenizer(model: str) -> threading.Thread:
+    return _registry.prewarm(model)
+
+
+def get_tokenizer(model: str) -> Callable[[str], list[int]] | None:
+    encoding = _registry.get_encoding(model)
+    if encoding is None:
+        return None
+    return encoding.encode_ordinary
 
 
 def count_tokens(text: str, model: str = "gpt-4") -> int:
+    started = time.perf_counter()
     tokenizer = get_tokenizer(model)
+    count = len(tokenizer(text)) if tokenizer else estimate_tokens(text)
+    get_metrics().observe("tokenizer_seconds", time.perf_counter() - started, op="count")
+    return count
+
+
+def count_tokens_batch(texts: list[str], model: str = "gpt-4") -> list[int]:
+    started = time.perf_counter()
+    counts = _count_tokens_batch(texts, model)
+    get_metrics().observe("tokenizer_seconds", time.perf_counter() - started, op="batch")
+    return counts
+
+
+def _count_tokens_batch(texts: list[str], model: str) -> list[int]:
+    encoding = _registry.get_encoding(model)
 
-    if tokenizer:
-        return len(tokenizer(text))
+    if encoding is None:
+        return [estimate_tokens(text) for text in texts]
 
-    return estimate_tokens(text)
+    if len(texts) < TokenizerConstants.BATCH_MIN_SIZE:
+        return [len(encoding.encode_ordinary(text)) for text in texts]
+
+    # tiktoken releases the GIL while encoding, so a shared pool gives real parallelism
+    # without paying for a fresh executor per call like encode_ordinary_batch does.
+    executor = _get_batch_executor()
+    return [len(tokens) for tokens in executor.map(encoding.encode_ordinary, texts)]
 
 
 def estimate_tokens(text: str) -> int:
     return max(1, len(text) // 4)
 
 
+class TruncationStrategy(str, Enum):
+    HEAD = "head"
+    TAIL = "tail"
+    MIDDLE = "middle"
+
+
+class _TokenView:
+    # Encodes the text once; every cut afterwards is a slice plus a single decode.
+    def __init__(self, text: str, encoding: tiktoken.Encoding | None) -> None:
+        self._text = text
+        self._encoding = encoding
+        self._tokens = encoding.encode_ordinary(text) if encoding else None
+
+    def __len__(self) -> int:
+        if self._tokens is None:
+            return estimate_tokens(self._text)
+        return len(self._tokens)
+
+    def head(self, n: int) -> str:
+        if n <= 0:
+            return ""
+        if self._encoding is None or self._tokens is None:
+            return self._text[: n * 4]
+        # A cut can land inside a multi-byte character; drop the partial bytes.
+        return self._encoding.decode_bytes(self._tokens[:n]).decode("utf-8", errors="ignore")
+
+    def tail(self, n: int) -> str:
+        if n <= 0:
+            return ""
+        if self._encoding is None or self._tokens is None:
+            return self._text[-n * 4 :]
+        return self._encoding.decode_bytes(self._tokens[-n:]).decode("utf-8", errors="ignore")
+
+
 def truncate_text(
     text: str,
     model: str,
     max_tokens: int,
     suffix: str = "\n... [truncated]",
     preserve_lines: bool = True,
+    strategy: TruncationStrategy = TruncationStrategy.HEAD,
 ):
-    current_tokens = count_tokens(text, model)
-    if current_tokens <= max_tokens:
+    encoding = _registry.get_encoding(model)
+    view = _TokenView(text, encoding)
+
+    if len(view) <= max_tokens:
         return text
 
     suffix_tokens = count_tokens(suffix, model)
@@ -40,40 +188,40 @@ def truncate_text(
     if target_tokens <= 0:
         return suffix.strip()
 
-    if preserve_lines:
-        return _truncate_by_lines(text, target_tokens, suffix, model)
-    else:
-        return _truncate_by_chars(text, target_tokens, suffix, model)
+    if strategy == TruncationStrategy.HEAD:
+        return _truncate_head(view, target_tokens, preserve_lines) + suffix
 
+    marker = suffix.lstrip("\n")
+    # One token is reserved for the newline that joins the marker to the tail.
+    target_tokens -= 1
 
-def _truncate_by_lines(text: str, target_tokens: int, suffix: str, model: str) -> str:
-    lines = text.split("\n")
-    result_lines: list[str] = []
-    current_tokens = 0
+    if strategy == TruncationStrategy.TAIL:
+        return marker + "\n" + _truncate_tail(view, target_tokens, preserve_lines)
 
-    for line in lines:
-        line_tokens = count_tokens(line + "\n", model)
-        if current_tokens + line_tokens > target_tokens:
-            break
-        result_lines.append(line)
-        current_tokens += line_tokens
+    head_tokens = target_tokens // 2
+    head = _truncate_head(view, head_tokens, preserve_lines)
+    tail = _truncate_tail(view, target_tokens - head_tokens, preserve_lines)
+    return head + suffix + "\n" + tail
 
-    if not result_lines:
-        # Fall back to character truncation if no complete lines fit
-        return _truncate_by_chars(text, target_tokens, suffix, model)
 
-    return "\n".join(result_lines) + suffix
+def _truncate_head(view: _TokenView, target_tokens: int, preserve_lines: bool) -> str:
+    prefix = view.head(target_tokens)
 
+    if preserve_lines:
+        cut = prefix.rfind("\n")
+        # Fall back to the raw token cut if no complete line fits
+        if cut >= 0:
+            return prefix[:cut]
+
+    return prefix
 
-def _truncate_by_chars(text: str, target_tokens: int, suffix: str, model: str) -> str:
-    # Binary search for the right length
-    low, high = 0, len(text)
 
-    while low < high:
-        mid = (low + high + 1) // 2
-        if count_tokens(text[:mid], model) <= target_tokens:
-            low = mid
-        else:
-            high = mid - 1
+def _truncate_tail(view: _TokenView, target_tokens: int, preserve_lines: bool) -> str:
+    tail = view.tail(target_tokens)
+
+    if preserve_lines:
+        cut = tail.find("\n")
+        if cut >= 0:
+            return tail[cut + 1 :]
 
-    return text[:low] + suffix
+    return tail
@@ -0,0 +1,400 @@
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+from common.helpers.environment_helper import EnvironmentHelper as EnvH
+from common.constants.environment_constants import EnvironmentConstants as EnvC
+from common.constants.grep_constants import GrepConstants
+from utils.workspace_tree import get_workspace_tree
+
+logger = logging.getLogger(__name__)
+
+# (path, mtime_ns, size, trigram blob | None, binary)
+IndexedFile = tuple[str, int, int, bytes | None, bool]
+
+_TOKEN = re.compile(rb"\w+|[^\w\s]+")
+
+# The regex parser is private and has moved before (sre_parse became
+# re._parser in 3.11). Without it no literals are extracted, so every query
+# just falls back to scanning all files.
+try:
+    from re import _constants as sre_constants, _parser as sre_parser
+except ImportError:
+    try:
+        import sre_constants, sre_parse as sre_parser
+    except ImportError:
+        sre_constants = sre_parser = None
+
+_REPEATS = (
+    {
+        sre_constants.MAX_REPEAT,
+        sre_constants.MIN_REPEAT,
+        getattr(sre_constants, "POSSESSIVE_REPEAT", sre_constants.MAX_REPEAT),
+    }
+    if sre_constants is not None
+    else set()
+)
+
+
+# Spawned workers re-import __main__, which re-runs any embedding script that
+# lacks an `if __name__ == "__main__"` guard. Only entry points known to be
+# guarded (the CLI, the benchmarks) opt in; everyone else indexes in-process.
+_process_pool_enabled = False
+
+
+def enable_process_pool(enabled: bool = True) -> None:
+    global _process_pool_enabled
+    _process_pool_enabled = enabled
+
+
+def file_trigrams(data: bytes) -> set[bytes]:
+    # Lowercased so one index serves case-sensitive and -insensitive queries.
+    # Trigrams are taken within runs of word or punctuation bytes only: code
+    # repeats the same identifiers constantly, so deduplicating runs first is
+    # several times cheaper than sliding over every byte.
+    grams: set[bytes] = set()
+    for token in set(_TOKEN.findall(data.lower())):
+        grams.update(token[i : i + 3] for i in range(len(token) - 2))
+    return grams
+
+
+def literal_trigrams(literal: str) -> set[bytes]:
+    # Split exactly like file contents, so a literal's trigrams are always a
+    # subset of any file that contains it.
+    return file_trigrams(literal.encode("utf-8"))
+
+
+def _index_file(path: str) -> IndexedFile | None:
+    try:
+        stat = os.stat(path)
+        if stat.st_size > GrepConstants.INDEX_MAX_FILE_SIZE:
+            return path, stat.st_mtime_ns, stat.st_size, None, False
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    if b"\0" in data[: GrepConstants.BINARY_SNIFF_BYTES]:
+        return path, stat.st_mtime_ns, stat.st_size, None, True
+
+    # One sorted blob pickles far cheaper than a set of tiny bytes objects.
+    return path, stat.st_mtime_ns, stat.st_size, b"".join(sorted(file_trigrams(data))), False
+
+
+def _index_files(paths: list[str]) -> list[IndexedFile]:
+    return [result for result in map(_index_file, paths) if result is not None]
+
+
+def required_literals(pattern: str, flags: int = 0) -> list[str]:
+    # Literal substrings every match of pattern must contain (only those of 3+ bytes).
+    if sre_parser is None:
+        return []
+    try:
+        parsed = sre_parser.parse(pattern, flags)
+        ignore_case = bool((flags | parsed.state.flags) & re.IGNORECASE)
+        literals: list[str] = []
+        _collect_literals(parsed, literals, ignore_case)
+    except Exception:
+        # Any surprise from the private parser means no pruning, never a wrong answer.
+        return []
+    return [literal for literal in literals if len(literal.encode("utf-8")) >= 3]
+
+
+def _collect_literals(items: Iterable, out: list[str], ignore_case: bool) -> None:
+    run: list[str] = []
+
+    def flush() -> None:
+        if run:
+            out.append("".join(run))
+            run.clear()
+
+    for op, arg in items:
+        if op is sre_constants.LITERAL:
+            char = chr(arg)
+            # bytes.lower() only folds ASCII, so non-ASCII can't be trusted case-insensitively.
+            if char == "\n" or (ignore_case and not char.isascii()):
+                flush()
+            else:
+                run.append(char)
+        elif op is sre_constants.AT:
+            # Anchors are zero-width; the literals around them are still adjacent.
+            continue
+        elif op is sre_constants.SUBPATTERN:
+            flush()
+            _, add_flags, _, sub = arg
+            _collect_literals(sub, out, ignore_case or bool(add_flags & re.IGNORECASE))
+        elif op in _REPEATS:
+            flush()
+            minimum, _, sub = arg
+            if minimum >= 1:
+                _collect_literals(sub, out, ignore_case)
+        else:
+            flush()
+    flush()
+
+
+@dataclass(slots=True)
+class _FileEntry:
+    path: str
+    mtime_ns: int
+    size: int
+    trigrams: tuple[bytes, ...] | None
+    binary: bool
+
+
+class TrigramIndex:
+    # In-memory trigram index over the text files under a root directory. The first
+    # build and later refreshes run on a background thread (reading files on a process
+    # pool once enable_process_pool() has been called). Queries never wait for it:
+    # until the first build finishes, candidates() returns None and callers scan.
+    def __init__(self, root: str | Path, workers: int | None = None) -> None:
+        self.root = str(Path(root).resolve())
+        self._workers = workers or EnvH.get_env_variable(EnvC.GREP_INDEX_WORKERS, 0) or (
+            os.cpu_count() or 1
+        )
+        self._lock = threading.Lock()
+        self._files: dict[int, _FileEntry] = {}
+        self._ids: dict[str, int] = {}
+        self._postings: dict[bytes, set[int]] = {}
+        # Unindexed (too large) text files; always candidates.
+        self._unindexed: set[int] = set()
+        self._next_id = 0
+
+        self._ready = threading.Event()
+        self._refresh_lock = threading.Lock()
+        self._refresh_thread: threading.Thread | None = None
+        self._closed = False
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def file_count(self) -> int:
+        with self._lock:
+            return len(self._files)
+
+    def start(self) -> None:
+        if self._refresh_thread is None:
+            self._start_refresh()
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def close(self) -> None:
+        self._closed = True
+
+    def candidates(self, literals: list[str]) -> list[str] | None:
+        if not self._ready.is_set():
+            return None
+
+        # Postings can lag behind edits made outside the agent. Every file is
+        # stat'ed first; anything new or changed since it was indexed is
+        # returned as a candidate to scan directly, and re-indexed behind us.
+        stale, removed = self._changes(max_age=0)
+        if stale or removed:
+            self._start_refresh()
+
+        grams: set[bytes] = set()
+        for literal in literals:
+            grams |= literal_trigrams(literal)
+
+        with self._lock:
+            if not grams:
+                ids: set[int] = {
+                    file_id for file_id, entry in self._files.items() if not entry.binary
+                }
+            else:
+                postings = sorted(
+                    (self._postings.get(gram, set()) for gram in grams), key=len
+                )
+                ids = set(postings[0])
+                for posting in postings[1:]:
+                    if not ids:
+                        break
+                    ids &= posting
+                ids |= self._unindexed
+            paths = [self._files[file_id].path for file_id in ids]
+
+        if stale or removed:
+            skip = removed.union(stale)
+            paths = [path for path in paths if path not in skip]
+            paths.extend(stale)
+        return paths
+
+    def update_path(self, path: str | Path) -> None:
+        # Synchronous single-file refresh, for writes the agent itself just made.
+        path = str(path)
+        if not path.startswith(self.root + os.sep):
+            return
+        result = _index_file(path) if os.path.isfile(path) else None
+        with self._lock:
+            self._remove(path)
+            if result is not None:
+                self._add(result)
+
+    def refresh(self) -> None:
+        with self._refresh_lock:
+            started = time.perf_counter()
+            stale, removed = self._changes()
+
+            with self._lock:
+                for path in removed:
+                    self._remove(path)
+
+            for results in self._index_paths(stale):
+                with self._lock:
+                    for result in results:
+                        self._remove(result[0])
+                        self._add(result)
+
+            self._ready.set()
+            if stale:
+                logger.debug(
+                    f"Trigram index for {self.root}: {len(stale)} files indexed in "
+                    f"{time.perf_counter() - started:.2f}s"
+                )
+
+    def _changes(self, max_age: float | None = None) -> tuple[list[str], set[str]]:
+        # (new or modified paths, paths that no longer exist) relative to the index.
+        with self._lock:
+            known = {entry.path: (entry.mtime_ns, entry.size) for entry in self._files.values()}
+
+        # The shared workspace snapshot decides what exists (and honours
+        # .gitignore); file stats are taken here since the snapshot only
+        # tracks directory changes.
+        stale: list[str] = []
+        seen: set[str] = set()
+        for relative in get_workspace_tree(self.root).iter_files(max_age=max_age):
+            path = os.path.join(self.root, relative)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            seen.add(path)
+            if known.get(path) != (stat.st_mtime_ns, stat.st_size):
+                stale.append(path)
+        return stale, known.keys() - seen
+
+    def _start_refresh(self) -> None:
+        if self._closed:
+            return
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_safely, name="trigram-index", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def _refresh_safely(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            logger.exception(f"Trigram index refresh failed for {self.root}")
+
+    def _index_paths(self, paths: list[str]) -> Iterator[list[IndexedFile]]:
+        if (
+            not _process_pool_enabled
+            or len(paths) < GrepConstants.INDEX_POOL_MIN_FILES
+            or self._workers <= 1
+        ):
+            yield _index_files(paths)
+            return
+
+        batches = [
+            paths[i : i + GrepConstants.INDEX_BATCH_SIZE]
+            for i in range(0, len(paths), GrepConstants.INDEX_BATCH_SIZE)
+        ]
+        done = 0
+        try:
+            # spawn: this runs on a background thread, where forking is unsafe.
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=self._workers, mp_context=context) as pool:
+                # A bounded window keeps interpreter exit from waiting on a long queue.
+                pending: deque[Future] = deque()
+                for batch in batches:
+                    if self._closed:
+                        break
+                    pending.append(pool.submit(_index_files, batch))
+                    if len(pending) >= self._workers * 2:
+                        results = pending.popleft().result()
+                        done += 1
+                        yield results
+                while pending:
+                    future = pending.popleft()
+                    if self._closed:
+                        future.cancel()
+                        continue
+                    results = future.result()
+                    done += 1
+                    yield results
+        except (BrokenProcessPool, RuntimeError, OSError) as e:
+            # Workers that die at startup (or a sandbox without process support)
+            # break the pool; finish in-process rather than leave the index unbuilt.
+            logger.debug(f"Trigram index pool unavailable ({e}); indexing in-process")
+            for batch in batches[done:]:
+                if self._closed:
+                    return
+                yield _index_files(batch)
+
+    def _add(self, result: IndexedFile) -> None:
+        path, mtime_ns, size, blob, binary = result
+        file_id = self._next_id
+        self._next_id += 1
+
+        trigrams = None
+        if blob is not None:
+            trigrams = tuple(blob[i : i + 3] for i in range(0, len(blob), 3))
+            for gram in trigrams:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    self._postings[gram] = {file_id}
+                else:
+                    posting.add(file_id)
+        elif not binary:
+            self._unindexed.add(file_id)
+
+        self._files[file_id] = _FileEntry(path, mtime_ns, size, trigrams, binary)
+        self._ids[path] = file_id
+
+    def _remove(self, path: str) -> None:
+        file_id = self._ids.pop(path, None)
+        if file_id is None:
+            return
+        entry = self._files.pop(file_id)
+        self._unindexed.discard(file_id)
+        for gram in entry.trigrams or ():
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(file_id)
+                if not posting:
+                    del self._postings[gram]
+
+
+_indexes: dict[str, TrigramIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_trigram_index(root: str | Path) -> TrigramIndex:
+    key = str(Path(root).resolve())
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = TrigramIndex(key)
+        return index
+
+
+def notify_path_changed(path: str | Path) -> None:
+    with _indexes_lock:
+        indexes = list(_indexes.values())
+    for index in indexes:
+        if index.ready:
+            index.update_path(path)
@@ -0,0 +1,494 @@
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+from common.helpers.environment_helper import EnvironmentHelper as EnvH
+from common.constants.environment_constants import EnvironmentConstants as EnvC
+from common.constants.workspace_constants import WorkspaceConstants
+
+logger = logging.getLogger(__name__)
+
+
+def glob_to_regex(pattern: str) -> re.Pattern:
+    # Compiles a gitignore/glob-style pattern; ** spans directories, * does not.
+    return re.compile(_glob_source(pattern) + r"\Z")
+
+
+def _glob_source(pattern: str) -> str:
+    i, n = 0, len(pattern)
+    parts: list[str] = []
+    while i < n:
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif char == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif char == "?":
+            parts.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = pattern.find("]", i + 2 if pattern[i + 1 : i + 2] in ("!", "^") else i + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+                i += 1
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                parts.append(f"[{body}]")
+                i = end + 1
+        else:
+            parts.append(re.escape(char))
+            i += 1
+    return "".join(parts)
+
+
+@dataclass(frozen=True, slots=True)
+class IgnoreRule:
+    regex: re.Pattern
+    negated: bool
+    dir_only: bool
+    # Anchored rules match the path relative to the .gitignore; others match the name.
+    anchored: bool
+    source: str
+
+    @classmethod
+    def parse(cls, line: str) -> "IgnoreRule | None":
+        line = line.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            return None
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            return None
+
+        anchored = "/" in line
+        line = line.lstrip("/")
+        return cls(glob_to_regex(line), negated, dir_only, anchored, _glob_source(line))
+
+    def matches(self, relative: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        return self.regex.match(relative if self.anchored else name) is not None
+
+
+# (directory the .gitignore lives in, relative to the root; its rules)
+RuleChain = tuple[tuple[str, tuple[IgnoreRule, ...]], ...]
+
+
+def is_ignored(chain: RuleChain, relative: str, is_dir: bool) -> bool:
+    directory, _, name = relative.rpartition("/")
+    return not unignored(chain, f"{directory}/" if directory else "", [name], is_dir)
+
+
+def unignored(chain: RuleChain, prefix: str, names: list[str], is_dir: bool) -> list[str]:
+    # Filters one directory's entry names down to those the chain keeps; prefix
+    # is the directory's root-relative path plus '/'.
+    always = WorkspaceConstants.ALWAYS_IGNORED
+    names = [name for name in names if name not in always]
+    if not chain or not names:
+        return names
+
+    combined = _combined_rules(chain)
+    if combined is not None:
+        name_regex, path_regex = combined[2:] if is_dir else combined[:2]
+        if name_regex is not None:
+            match = name_regex.match
+            names = [name for name in names if match(name) is None]
+        if path_regex is not None:
+            match = path_regex.match
+            names = [name for name in names if match(prefix + name) is None]
+        return names
+
+    def ignored(name: str) -> bool:
+        relative = prefix + name
+        # Git semantics: the last matching rule wins, deeper .gitignore files last.
+        result = False
+        for base, rules in chain:
+            local = relative[len(base) + 1 :] if base else relative
+            for rule in rules:
+                if rule.matches(local, name, is_dir):
+                    result = not rule.negated
+        return result
+
+    return [name for name in names if not ignored(name)]
+
+
+# (file name regex, file path regex, dir name regex, dir path regex)
+CombinedRules = tuple[re.Pattern | None, re.Pattern | None, re.Pattern | None, re.Pattern | None]
+
+
+@lru_cache(maxsize=1024)
+def _combined_rules(chain: RuleChain) -> CombinedRules | None:
+    # Without negations rule order is irrelevant, so the whole chain folds into
+    # alternations: rules without a slash over the bare name, anchored ones over
+    # the root-relative path. None when order matters.
+    file_names: list[str] = []
+    file_paths: list[str] = []
+    dir_names: list[str] = []
+    dir_paths: list[str] = []
+    for base, rules in chain:
+        prefix = re.escape(f"{base}/") if base else ""
+        for rule in rules:
+            if rule.negated:
+                return None
+            # The chain only holds ancestors' rules, so every entry is under base.
+            if rule.anchored:
+                part, dirs, files = f"{prefix}(?:{rule.source})", dir_paths, file_paths
+            else:
+                part, dirs, files = f"(?:{rule.source})", dir_names, file_names
+            dirs.append(part)
+            if not rule.dir_only:
+                files.append(part)
+
+    def compile_parts(parts: list[str]) -> re.Pattern | None:
+        return re.compile(f"(?:{'|'.join(parts)})\\Z") if parts else None
+
+    return (
+        compile_parts(file_names),
+        compile_parts(file_paths),
+        compile_parts(dir_names),
+        compile_parts(dir_paths),
+    )
+
+
+@dataclass(slots=True)
+class _DirNode:
+    mtime_ns: int
+    gitignore_mtime_ns: int
+    dirs: tuple[str, ...]
+    files: tuple[str, ...]
+    # Rules that apply to this directory's entries, including its own .gitignore.
+    chain: RuleChain
+
+
+class WorkspaceTree:
+    # Snapshot of the non-ignored directories and files under a root. A directory's
+    # mtime changes whenever an entry is added, removed or renamed in it, so a refresh
+    # only re-lists directories whose mtime (or .gitignore) moved. File contents are not
+    # tracked; callers that care about edits stat files themselves. The first build
+    # costs about 1.5x a bare os.walk (it also applies .gitignore); the saving is in
+    # refreshes, which cost a stat per directory.
+    def __init__(self, root: str | Path, workers: int | None = None) -> None:
+        self.root = str(Path(root).resolve())
+        self._workers = workers or EnvH.get_env_variable(
+            EnvC.WORKSPACE_SCAN_WORKERS, WorkspaceConstants.SCAN_WORKERS
+        )
+        self._dirs: dict[str, _DirNode] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshed_at = 0.0
+        self.last_refresh_seconds = 0.0
+        self.last_rescanned_dirs = 0
+
+    @property
+    def dir_count(self) -> int:
+        return len(self._dirs)
+
+    @property
+    def file_count(self) -> int:
+        with self._lock:
+            return sum(len(node.files) for node in self._dirs.values())
+
+    def ensure_fresh(self, max_age: float | None = None) -> None:
+        if max_age is None:
+            max_age = WorkspaceConstants.REFRESH_INTERVAL_SECONDS
+        if not self._dirs or time.monotonic() - self._refreshed_at >= max_age:
+            self.refresh()
+
+    def refresh(self) -> None:
+        with self._refresh_lock:
+            started = time.perf_counter()
+            if not self._dirs:
+                self._walk([("", ())])
+                rescanned = len(self._dirs)
+            else:
+                rescanned = self._refresh_changed()
+            self._refreshed_at = time.monotonic()
+            self.last_refresh_seconds = time.perf_counter() - started
+            self.last_rescanned_dirs = rescanned
+
+    def relative(self, path: str | Path) -> str | None:
+        path = os.path.realpath(path)
+        if path == self.root:
+            return ""
+        if path.startswith(self.root + os.sep):
+            return path[len(self.root) + 1 :].replace(os.sep, "/")
+        return None
+
+    def has_dir(self, relative: str) -> bool:
+        self.ensure_fresh()
+        with self._lock:
+            return relative in self._dirs
+
+    def list_dir(self, relative: str = "") -> tuple[list[str], list[str]] | None:
+        self.ensure_fresh()
+        with self._lock:
+            node = self._dirs.get(relative)
+            if node is None:
+                return None
+            return sorted(node.dirs), sorted(node.files)
+
+    def iter_files(self, relative: str = "", max_age: float | None = None) -> Iterator[str]:
+        # Relative paths of every non-ignored file at or below a directory. Pass
+        # max_age=0 when a just-created file must not be missed (e.g. search).
+        self.ensure_fresh(max_age)
+        prefix = f"{relative}/" if relative else ""
+        with self._lock:
+            nodes = [
+                (directory, node.files)
+                for directory, node in self._dirs.items()
+                if not relative or directory == relative or directory.startswith(prefix)
+            ]
+        for directory, files in nodes:
+            base = f"{directory}/" if directory else ""
+            for name in files:
+                yield base + name
+
+    def _refresh_changed(self) -> int:
+        with self._lock:
+            known = list(self._dirs.items())
+
+        with self._pool() as pool:
+            stats = list(pool.map(self._dir_stamp, [directory for directory, _ in known]))
+
+        # Parents first, so a rescanned parent that drops a subtree wins over it.
+        changed = sorted(
+            (
+                (directory, node, stamp)
+                for (directory, node), stamp in zip(known, stats)
+                if stamp != (node.mtime_ns, node.gitignore_mtime_ns)
+            ),
+            key=lambda item: item[0].count("/") if item[0] else -1,
+        )
+
+        rescanned = 0
+        for directory, node, stamp in changed:
+            with self._lock:
+                if self._dirs.get(directory) is not node:
+                    continue
+            if stamp is None:
+                self._drop_subtree(directory)
+                continue
+
+            rules_changed = stamp[1] != node.gitignore_mtime_ns
+            parent_chain = node.chain
+            if node.chain and node.chain[-1][0] == directory:
+                parent_chain = node.chain[:-1]
+
+            if rules_changed:
+                # Inherited rules changed for the whole subtree; re-list all of it.
+                self._drop_subtree(directory)
+                rescanned += self._walk([(directory, parent_chain)])
+                continue
+
+            new_node, children = self._scan_dir(directory, parent_chain)
+            if new_node is None:
+                self._drop_subtree(directory)
+                continue
+            rescanned += 1
+            old_dirs = set(node.dirs)
+            with self._lock:
+                self._dirs[directory] = new_node
+            for name in old_dirs - set(new_node.dirs):
+                self._drop_subtree(self._join(directory, name))
+            added = [
+                (child, chain) for child, chain in children if child.rpartition("/")[2] not in old_dirs
+            ]
+            if added:
+                rescanned += self._walk(added)
+        return rescanned
+
+    def _walk(self, roots: list[tuple[str, RuleChain]]) -> int:
+        # Level by level, so a pool (if any) gets one map() per depth rather
+        # than a hand-off per directory.
+        scanned = 0
+        level = roots
+        with self._pool() as pool:
+            while level:
+                results = pool.map(lambda item: self._scan_dir(*item), level)
+                next_level: list[tuple[str, RuleChain]] = []
+                for (directory, _), (node, children) in zip(level, results):
+                    if node is None:
+                        continue
+                    scanned += 1
+                    with self._lock:
+                        self._dirs[directory] = node
+                    next_level.extend(children)
+                level = next_level
+        return scanned
+
+    def _pool(self) -> "ThreadPoolExecutor | _InlinePool":
+        # scandir releases the GIL, so extra threads overlap listings that block on I/O.
+        return ThreadPoolExecutor(max_workers=self._workers) if self._workers > 1 else _InlinePool()
+
+    def _scan_dir(
+        self, directory: str, parent_chain: RuleChain
+    ) -> tuple[_DirNode | None, list[tuple[str, RuleChain]]]:
+        absolute = self._absolute(directory)
+        try:
+            with os.scandir(absolute) as iterator:
+                entries = list(iterator)
+            dir_stat = os.stat(absolute)
+        except OSError:
+            return None, []
+
+        chain = parent_chain
+        gitignore_mtime = 0
+        for entry in entries:
+            if entry.name == ".gitignore":
+                try:
+                    gitignore_mtime = entry.stat().st_mtime_ns
+                    chain = parent_chain + ((directory, self._read_rules(entry.path)),)
+                except OSError:
+                    pass
+                break
+
+        # Follows symlinks: a link to a directory is listed as one...
+        dir_entries: list[os.DirEntry] = []
+        file_names: list[str] = []
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    dir_entries.append(entry)
+                else:
+                    file_names.append(entry.name)
+            except OSError:
+                continue
+
+        # ...but never descended into, like git: links can form cycles and would
+        # list the same files under two paths.
+        links = {entry.name for entry in dir_entries if entry.is_symlink()}
+        prefix = f"{directory}/" if directory else ""
+        dirs = unignored(chain, prefix, [entry.name for entry in dir_entries], True)
+        files = unignored(chain, prefix, file_names, False)
+        children = [(prefix + name, chain) for name in dirs if name not in links]
+
+        node = _DirNode(dir_stat.st_mtime_ns, gitignore_mtime, tuple(dirs), tuple(files), chain)
+        return node, children
+
+    def _dir_stamp(self, directory: str) -> tuple[int, int] | None:
+        absolute = self._absolute(directory)
+        try:
+            mtime = os.stat(absolute).st_mtime_ns
+        except OSError:
+            return None
+        try:
+            gitignore_mtime = os.stat(os.path.join(absolute, ".gitignore")).st_mtime_ns
+        except OSError:
+            gitignore_mtime = 0
+        return mtime, gitignore_mtime
+
+    def _drop_subtree(self, directory: str) -> None:
+        prefix = f"{directory}/" if directory else ""
+        with self._lock:
+            for key in [k for k in self._dirs if k == directory or k.startswith(prefix)]:
+                del self._dirs[key]
+
+    def _absolute(self, directory: str) -> str:
+        return os.path.join(self.root, directory) if directory else self.root
+
+    @staticmethod
+    def _join(directory: str, name: str) -> str:
+        return f"{directory}/{name}" if directory else name
+
+    @staticmethod
+    def _read_rules(path: str) -> tuple[IgnoreRule, ...]:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return tuple(rule for rule in map(IgnoreRule.parse, f) if rule is not None)
+
+
+class _InlinePool:
+    # Stands in for a ThreadPoolExecutor when scanning on the calling thread.
+    def __enter__(self) -> "_InlinePool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+    @staticmethod
+    def map(fn: Callable, items: Iterable) -> Iterator:
+        return map(fn, items)
+
+
+class UncachedWalk:
+    # Bounded, one-off walk of a directory that has no snapshot. Iterating yields
+    # root-relative file paths, breadth first, honouring the .gitignore files found
+    # inside root. It stops after max_depth levels or max_entries entries and sets
+    # capped.
+    def __init__(
+        self,
+        root: str | Path,
+        max_depth: int = WorkspaceConstants.UNCACHED_WALK_MAX_DEPTH,
+        max_entries: int = WorkspaceConstants.UNCACHED_WALK_MAX_ENTRIES,
+    ) -> None:
+        # A throwaway tree lends its directory scanner; nothing is stored in it.
+        self._tree = WorkspaceTree(root, workers=1)
+        self.root = self._tree.root
+        self._max_depth = max_depth
+        self._max_entries = max_entries
+        self.capped = False
+
+    def list_dir(self) -> tuple[list[str], list[str]] | None:
+        node, _ = self._tree._scan_dir("", ())
+        if node is None:
+            return None
+        return sorted(node.dirs), sorted(node.files)
+
+    def __iter__(self) -> Iterator[str]:
+        entries = 0
+        level: list[tuple[str, RuleChain]] = [("", ())]
+        for depth in range(self._max_depth + 1):
+            next_level: list[tuple[str, RuleChain]] = []
+            for directory, chain in level:
+                node, children = self._tree._scan_dir(directory, chain)
+                if node is None:
+                    continue
+                entries += len(node.dirs) + len(node.files)
+                base = f"{directory}/" if directory else ""
+                for name in node.files:
+                    yield base + name
+                if entries >= self._max_entries:
+                    self.capped = True
+                    return
+                next_level.extend(children)
+            if next_level and depth == self._max_depth:
+                self.capped = True
+            level = next_level
+
+
+_trees: OrderedDict[str, WorkspaceTree] = OrderedDict()
+_trees_lock = threading.Lock()
+
+
+def get_workspace_tree(root: str | Path) -> WorkspaceTree:
+    key = str(Path(root).resolve())
+    with _trees_lock:
+        tree = _trees.get(key)
+        if tree is None:
+            tree = _trees[key] = WorkspaceTree(key)
+            # Least recently used snapshots go first.
+            while len(_trees) > WorkspaceConstants.MAX_CACHED_TREES:
+                _trees.popitem(last=False)
+        else:
+            _trees.move_to_end(key)
+        return tree